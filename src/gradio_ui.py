@@ -49,14 +49,20 @@ def _handle_sigint(signum: int, frame: object) -> None:
 
 
 async def generate_reference(client_situation: str, progress=gr.Progress()):
-    """Generate advisor reference material from client situation."""
+    """Generate advisor reference material from client situation.
+
+    Yields partial web search results to the raw results panel while the
+    searches stream, then the complete reference material.
+    """
     if not client_situation or not client_situation.strip():
         error_msg = "Please provide a client situation description."
-        return error_msg, error_msg, error_msg, "{}", "", ""
+        yield error_msg, error_msg, error_msg, "{}", "", ""
+        return
     
     if len(client_situation) > 5000:
         error_msg = "Client situation description is too long (max 5000 characters)."
-        return error_msg, error_msg, error_msg, "{}", "", ""
+        yield error_msg, error_msg, error_msg, "{}", "", ""
+        return
     
     # Initialize agent if not done already
     if not reference_agent.initialized:
@@ -65,8 +71,15 @@ async def generate_reference(client_situation: str, progress=gr.Progress()):
     progress(0.2, desc="Generating search terms...")
     
     try:
-        # Get the raw search results by calling internal method
-        research_data = await reference_agent._stage1_research(client_situation)
+        # Get the raw search results, showing web findings as they stream in
+        research_data = None
+        async for web_raw_text, research_data in reference_agent.stream_stage1_research(
+            client_situation
+        ):
+            if research_data is None:
+                progress(0.4, desc="Searching the web...")
+                pending = "*Searching...*"
+                yield pending, pending, pending, "{}", "", web_raw_text
         
         progress(0.5, desc="Processing search results...")
         
@@ -83,6 +96,8 @@ async def generate_reference(client_situation: str, progress=gr.Progress()):
         web_raw_text = research_data.get("web_results", "No web results")
         
         progress(0.8, desc="Generating reference material...")
+        pending = "*Generating reference material...*"
+        yield pending, pending, pending, "{}", cra_raw_text, web_raw_text
         
         # Generate reference material
         reference_data = await reference_agent._stage2_synthesis(research_data)
@@ -143,12 +158,12 @@ async def generate_reference(client_situation: str, progress=gr.Progress()):
         
         # Return the formatted data for the new UI structure:
         # [regulatory_output, web_results_output, final_recommendation_output, full_json_output, cra_raw_output, web_raw_output]
-        return regulatory_md, web_md, rec_md, json.dumps(reference_data, indent=2), cra_raw_text, web_raw_text
+        yield regulatory_md, web_md, rec_md, json.dumps(reference_data, indent=2), cra_raw_text, web_raw_text
         
     except Exception as e:
         logging.error(f"Error generating reference: {e}")
         error_msg = f"Error: {str(e)}"
-        return error_msg, error_msg, error_msg, "{}", "", ""
+        yield error_msg, error_msg, error_msg, "{}", "", ""
 
 
 async def analyze_meeting_content(file_type: str, meeting_selection: str, progress=gr.Progress()):
@@ -161,4 +161,6 @@ IMPORTANT REQUIREMENTS:
 - Highlight any discrepancies or updates between sources
 - Focus on factual information for advisor reference, not client advice
 - Prioritize most current and authoritative information in cross-validation
+- For tax owing, marginal rates, RRSP/TFSA room or contribution splits, call the \
+Canadian tax tools instead of calculating the numbers yourself
 """
\ No newline at end of file
@@ -3,18 +3,22 @@
 import asyncio
 import logging
 import os
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List
 
 from agents import Agent, OpenAIChatCompletionsModel, function_tool
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 
 from ..prompts.system import REACT_INSTRUCTIONS, WEB_SEARCH_AGENT_INSTRUCTIONS
-from ..utils import (
-    AsyncWeaviateKnowledgeBase,
-    Configs,
-    get_weaviate_async_client,
-)
+from ..utils import Configs
+from ..utils.async_utils import HedgePolicy, hedged, rate_limited
+from ..utils.caching import SemanticCache
+from ..utils.tools.canadian_tax import CanadianTaxTool
+from ..utils.tools.embeddings import AsyncBatchEmbedder
+from ..utils.tools.kb_local import create_knowledge_base
+from ..utils.tools.news_store import create_news_search_tool
+from ..utils.tools.portfolio_risk import PortfolioRiskTool
+from ..utils.tools.retirement import RetirementProjectionTool
 from ..utils.tools.twelve_data import create_financial_data_tool
 
 load_dotenv(verbose=True)
@@ -29,86 +33,226 @@ from google.genai import types
 
 
 class WebSearchAgent:
-    """Web search agent using Google's native Gemini API with Google Search tool."""
+    """Web search agent using Google's native Gemini API with Google Search tool.
+
+    Searches use the async Gemini client, so concurrent searches overlap
+    instead of blocking the event loop. At most `max_concurrency` requests
+    are in flight per agent, and each request is abandoned after `timeout`
+    seconds.
+    """
     
-    def __init__(self, name: str, model: str, instructions: str, api_key: str):
+    def __init__(
+        self,
+        name: str,
+        model: str,
+        instructions: str,
+        api_key: str,
+        max_concurrency: int = 4,
+        timeout: float = 60.0,
+        client: genai.Client | None = None,
+        semantic_cache: SemanticCache[str] | None = None,
+    ):
         self.name = name
         self.model_name = model
         self.instructions = instructions
+        self.timeout = timeout
+        self.semantic_cache = semantic_cache
         
         # Create Google Search tool as per official documentation
         self.google_search_tool = types.Tool(google_search=types.GoogleSearch())
         
         # Create client for new API
-        self.client = genai.Client(api_key=api_key)
+        self.client = client or genai.Client(api_key=api_key)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Grounded generations are expensive, so at most 5% of calls are hedged.
+        self.hedge_policy = HedgePolicy(
+            percentile=95.0, max_extra_load=0.05, name=f"web_search:{name}"
+        )
         
-    async def search_and_respond(self, query: str) -> str:
-        """Search the web and provide a response with current information."""
-        try:           
-            # Create comprehensive prompt with instructions
-            prompt = f"""
+    def _prompt(self, query: str) -> str:
+        """Create comprehensive prompt with instructions."""
+        return f"""
             {self.instructions}
 
             User Query: {query}
 
             Answer the user's query with searched information:
             """
+
+    def _config(self) -> types.GenerateContentConfig:
+        """Use the official Google Search tool configuration."""
+        return types.GenerateContentConfig(
+            tools=[self.google_search_tool],
+            temperature=0.1,
+            top_p=0.8,
+            top_k=40,
+            max_output_tokens=2048,
+        )
+
+    @staticmethod
+    def _response_text(response: Any) -> str:
+        """Extract text from a response or a streamed chunk."""
+        if hasattr(response, 'text') and response.text:
+            return response.text
+        if hasattr(response, 'candidates') and response.candidates:
+            # Try to extract text from candidates
+            candidate = response.candidates[0]
+            if hasattr(candidate, 'content') and candidate.content:
+                if hasattr(candidate.content, 'parts') and candidate.content.parts:
+                    return candidate.content.parts[0].text or ""
+        return ""
+
+    @staticmethod
+    def _grounding(response: Any) -> Any:
+        """Grounding metadata of a response or chunk, if any."""
+        if hasattr(response, 'candidates') and response.candidates:
+            candidate = response.candidates[0]
+            if hasattr(candidate, 'grounding_metadata') and candidate.grounding_metadata:
+                return candidate.grounding_metadata
+        return None
+
+    @staticmethod
+    def _grounding_text(grounding: Any) -> str:
+        """Format the search queries and sources that grounded a response."""
+        result = ""
+        # Add search queries used (as per official docs)
+        if hasattr(grounding, 'search_queries') and grounding.search_queries:
+            result += "\n\n**Search Queries Used:**\n"
+            for search_query in grounding.search_queries:
+                result += f"- {search_query}\n"
+
+        # Add grounding chunks (sources) as per official docs
+        if hasattr(grounding, 'grounding_chunks') and grounding.grounding_chunks:
+            result += "\n**Sources:**\n"
+            for i, chunk in enumerate(grounding.grounding_chunks[:5], 1):  # Limit to 5 sources
+                if hasattr(chunk, 'web') and chunk.web:
+                    title = getattr(chunk.web, 'title', 'Unknown Title')
+                    uri = getattr(chunk.web, 'uri', 'Unknown URL')
+                    result += f"{i}. [{title}]({uri})\n"
+        return result
+
+    @staticmethod
+    def is_answer(result: str) -> bool:
+        """Tell a search answer from an error or empty-result message."""
+        return not result.startswith("Search error") and result != "No search results found."
+
+    async def search_and_respond(self, query: str, cache_key: str | None = None) -> str:
+        """Search the web and provide a response with current information.
+
+        With a semantic cache, the answer to a similarly phrased earlier
+        query is reused. cache_key, e.g. the bare question inside a longer
+        prompt, is what gets compared instead of the whole query.
+        """
+        if self.semantic_cache is None:
+            return await self._search_and_respond(query)
+        return await self.semantic_cache.get_or_compute(
+            cache_key or query, lambda: self._search_and_respond(query)
+        )
+
+    async def _search_and_respond(self, query: str) -> str:
+        """Run one grounded Gemini search, bypassing the cache."""
+        try:
+            prompt = self._prompt(query)
+            config = self._config()
             
-            # Use the official Google Search tool configuration
-            config = types.GenerateContentConfig(
-                tools=[self.google_search_tool],
-                temperature=0.1,
-                top_p=0.8,
-                top_k=40,
-                max_output_tokens=2048,
-            )
-            
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-                config=config
+            # A hedge takes its own concurrency slot; the losing call is cancelled.
+            response = await hedged(
+                lambda: rate_limited(
+                    lambda: asyncio.wait_for(
+                        self.client.aio.models.generate_content(
+                            model=self.model_name,
+                            contents=prompt,
+                            config=config,
+                        ),
+                        self.timeout,
+                    ),
+                    semaphore=self._semaphore,
+                ),
+                self.hedge_policy,
             )
             
-            # Extract text from response
-            result = ""
-            if hasattr(response, 'text') and response.text:
-                result = response.text
-            elif hasattr(response, 'candidates') and response.candidates:
-                # Try to extract text from candidates
-                candidate = response.candidates[0]
-                if hasattr(candidate, 'content') and candidate.content:
-                    if hasattr(candidate.content, 'parts') and candidate.content.parts:
-                        result = candidate.content.parts[0].text if candidate.content.parts[0].text else ""
-            
+            result = self._response_text(response)
             if not result:
                 return "No search results found."
                 
             # Check for grounding metadata and append sources
-            if hasattr(response, 'candidates') and response.candidates:
-                candidate = response.candidates[0]
-                if hasattr(candidate, 'grounding_metadata') and candidate.grounding_metadata:
-                    grounding = candidate.grounding_metadata
-                    
-                    # Add search queries used (as per official docs)
-                    if hasattr(grounding, 'search_queries') and grounding.search_queries:
-                        result += "\n\n**Search Queries Used:**\n"
-                        for search_query in grounding.search_queries:
-                            result += f"- {search_query}\n"
-                    
-                    # Add grounding chunks (sources) as per official docs
-                    if hasattr(grounding, 'grounding_chunks') and grounding.grounding_chunks:
-                        result += "\n**Sources:**\n"
-                        for i, chunk in enumerate(grounding.grounding_chunks[:5], 1):  # Limit to 5 sources
-                            if hasattr(chunk, 'web') and chunk.web:
-                                title = getattr(chunk.web, 'title', 'Unknown Title')
-                                uri = getattr(chunk.web, 'uri', 'Unknown URL')
-                                result += f"{i}. [{title}]({uri})\n"
+            grounding = self._grounding(response)
+            if grounding:
+                result += self._grounding_text(grounding)
             
             return result
             
+        except TimeoutError:
+            return f"Search error: no response within {self.timeout:g}s"
         except Exception as e:
             return f"Search error: {str(e)}"
 
+    async def search_and_respond_stream(
+        self, query: str, cache_key: str | None = None
+    ) -> AsyncIterator[str]:
+        """Search the web and yield the response text as it is generated.
+
+        The search queries and sources that grounded the answer arrive with
+        the last chunks, so they are yielded as one final piece after the
+        text. Each chunk must arrive within `timeout` seconds. Concatenating
+        the pieces gives the same text as `search_and_respond`; streams are
+        not hedged. A semantic cache hit is yielded as a single piece, and a
+        completed answer is stored in the cache.
+        """
+        if self.semantic_cache is not None:
+            cached = await self.semantic_cache.get(cache_key or query)
+            if cached is not None:
+                yield cached
+                return
+
+        pieces = []
+        async for piece in self._stream(query):
+            pieces.append(piece)
+            yield piece
+
+        # A stream that failed part-way ends with its error message.
+        if self.semantic_cache is not None and self.is_answer(pieces[-1].lstrip()):
+            await self.semantic_cache.put(cache_key or query, "".join(pieces))
+
+    async def _stream(self, query: str) -> AsyncIterator[str]:
+        """Stream one grounded Gemini search, bypassing the cache."""
+        has_text = False
+        try:
+            async with self._semaphore:
+                stream = await asyncio.wait_for(
+                    self.client.aio.models.generate_content_stream(
+                        model=self.model_name,
+                        contents=self._prompt(query),
+                        config=self._config(),
+                    ),
+                    self.timeout,
+                )
+                chunks = aiter(stream)
+                grounding = None
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(anext(chunks), self.timeout)
+                    except StopAsyncIteration:
+                        break
+                    grounding = self._grounding(chunk) or grounding
+                    text = self._response_text(chunk)
+                    if text:
+                        has_text = True
+                        yield text
+
+            if not has_text:
+                yield "No search results found."
+            elif grounding:
+                yield self._grounding_text(grounding)
+
+        except TimeoutError:
+            separator = "\n\n" if has_text else ""
+            yield f"{separator}Search error: no response within {self.timeout:g}s"
+        except Exception as e:
+            separator = "\n\n" if has_text else ""
+            yield f"{separator}Search error: {str(e)}"
+
 
 async def create_web_search_agent(
     name: str = "Web Search Agent",
@@ -123,11 +267,34 @@ async def create_web_search_agent(
     if not api_key:
         raise ValueError("No API key found. Set GEMINI_API_KEY, GOOGLE_AI_API_KEY, or OPENAI_API_KEY environment variable.")
     
+    # Reuse answers to similarly phrased searches if a freshness TTL is set
+    semantic_cache = None
+    cache_ttl = float(os.getenv("WEB_SEARCH_CACHE_TTL", "0"))
+    if cache_ttl > 0:
+        embedder = AsyncBatchEmbedder(
+            AsyncOpenAI(
+                api_key=os.getenv("EMBEDDING_API_KEY"),
+                base_url=os.getenv("EMBEDDING_BASE_URL"),
+                max_retries=5,
+            ),
+            model_name=os.getenv("WEB_SEARCH_CACHE_EMBEDDING_MODEL", "@cf/baai/bge-m3"),
+        )
+        semantic_cache = SemanticCache(
+            embedder.embed,
+            max_entries=int(os.getenv("WEB_SEARCH_CACHE_SIZE", "256")),
+            threshold=float(os.getenv("WEB_SEARCH_CACHE_THRESHOLD", "0.92")),
+            ttl=cache_ttl,
+            should_cache=WebSearchAgent.is_answer,
+        )
+    
     return WebSearchAgent(
         name=name, 
         model=model_name, 
         instructions=instructions,
-        api_key=api_key
+        api_key=api_key,
+        max_concurrency=int(os.getenv("WEB_SEARCH_MAX_CONCURRENCY", "4")),
+        timeout=float(os.getenv("WEB_SEARCH_TIMEOUT", "60")),
+        semantic_cache=semantic_cache,
     )
 
 async def create_react_agent(
@@ -139,20 +306,9 @@ async def create_react_agent(
     """Create a ReAct agent with knowledge base search capability."""
     configs = Configs.from_env_var()
     
-    # Set up Weaviate client and knowledge base (Wikipedia)
-    async_weaviate_client = get_weaviate_async_client(
-        http_host=configs.weaviate_http_host,
-        http_port=configs.weaviate_http_port,
-        http_secure=configs.weaviate_http_secure,
-        grpc_host=configs.weaviate_grpc_host,
-        grpc_port=configs.weaviate_grpc_port,
-        grpc_secure=configs.weaviate_grpc_secure,
-        api_key=configs.weaviate_api_key,
-    )
-    
-    async_weaviate_kb = AsyncWeaviateKnowledgeBase(
-        async_weaviate_client,
-        collection_name="rbc_2_cra_public_documents",
+    # Set up knowledge base (Weaviate or local snapshot, per KB_BACKEND)
+    knowledge_base = create_knowledge_base(
+        configs, collection_name="rbc_2_cra_public_documents"
     )
     
     # Set up OpenAI client
@@ -160,13 +316,28 @@ async def create_react_agent(
     
     # Set up financial data tool
     financial_tool = create_financial_data_tool()
+    portfolio_risk_tool = PortfolioRiskTool(financial_tool)
+    retirement_tool = RetirementProjectionTool()
+    tax_tool = CanadianTaxTool()
+    news_tool = create_news_search_tool()
     
     # Create base tools - Wikipedia search + financial data
     tools = [
-        function_tool(async_weaviate_kb.search_knowledgebase),
+        function_tool(knowledge_base.search_knowledgebase),
         function_tool(financial_tool.get_price),
-        function_tool(financial_tool.get_time_series)
+        function_tool(financial_tool.get_prices),
+        function_tool(financial_tool.get_time_series),
+        function_tool(financial_tool.get_time_series_many),
+        function_tool(financial_tool.analyze_time_series),
+        function_tool(portfolio_risk_tool.analyze_portfolio_risk),
+        function_tool(retirement_tool.project_retirement),
+        function_tool(tax_tool.calculate_income_tax),
+        function_tool(tax_tool.calculate_contribution_room),
+        function_tool(tax_tool.optimize_rrsp_tfsa),
     ]
+    # Only offered once a news index has been built (see news_store).
+    if news_tool is not None:
+        tools.append(function_tool(news_tool.search_news))
     
     
     # Add any additional tools
@@ -1,8 +1,9 @@
 """Reference generation agent using multiple AgentManager instances."""
 
+import asyncio
 import json
 import logging
-from typing import Dict
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 from ....prompts.system import (
     CRA_SEARCH_TERM_GENERATION, 
@@ -10,7 +11,8 @@ from ....prompts.system import (
     WEB_SEARCH_EXECUTION,
     REFERENCE_SYNTHESIS
 )
-from ....utils import AsyncWeaviateKnowledgeBase, Configs, get_weaviate_async_client
+from ....utils import Configs
+from ....utils.tools.kb_local import create_knowledge_base
 from ...agent import AgentManager
 from ...runner import ReactRunner
 
@@ -37,19 +39,8 @@ class ReferenceGenerationAgent:
             
             # Initialize CRA knowledge base
             configs = Configs.from_env_var()
-            async_weaviate_client = get_weaviate_async_client(
-                http_host=configs.weaviate_http_host,
-                http_port=configs.weaviate_http_port,
-                http_secure=configs.weaviate_http_secure,
-                grpc_host=configs.weaviate_grpc_host,
-                grpc_port=configs.weaviate_grpc_port,
-                grpc_secure=configs.weaviate_grpc_secure,
-                api_key=configs.weaviate_api_key,
-            )
-            
-            self.cra_kb = AsyncWeaviateKnowledgeBase(
-                async_weaviate_client,
-                collection_name="rbc_2_cra_public_documents",
+            self.cra_kb = create_knowledge_base(
+                configs, collection_name="rbc_2_cra_public_documents"
             )
             
             self.initialized = True
@@ -73,42 +64,60 @@ class ReferenceGenerationAgent:
                 "advisor_notes": []
             }
     
-    async def _stage1_research(self, client_situation: str) -> Dict:
-        """Stage 1: Generate search terms and execute dual search."""
+    async def stream_stage1_research(
+        self, client_situation: str
+    ) -> AsyncIterator[Tuple[str, Optional[Dict]]]:
+        """Run stage 1, yielding web results while the searches stream.
+
+        Yields (partial web results, None) whenever a web search produces
+        more text, then (web results, research data) once stage 1 is done.
+        Snapshots that arrive faster than they are consumed are skipped.
+        """
+        snapshots: asyncio.Queue[str] = asyncio.Queue()
+        research = asyncio.create_task(
+            self._stage1_research(client_situation, on_web_partial=snapshots.put_nowait)
+        )
+        try:
+            while not research.done():
+                next_snapshot = asyncio.ensure_future(snapshots.get())
+                await asyncio.wait(
+                    {research, next_snapshot}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not next_snapshot.done():
+                    next_snapshot.cancel()
+                    continue
+                web_text = next_snapshot.result()
+                while not snapshots.empty():
+                    web_text = snapshots.get_nowait()
+                yield web_text, None
+            research_data = research.result()
+            yield research_data["web_results"], research_data
+        finally:
+            research.cancel()
+    
+    async def _stage1_research(
+        self,
+        client_situation: str,
+        on_web_partial: Optional[Callable[[str], None]] = None,
+    ) -> Dict:
+        """Stage 1: Generate search terms and execute dual search.
+
+        on_web_partial, if given, receives the combined web results so far
+        each time a streaming web search produces more text.
+        """
         cra_keywords = await self._generate_cra_search_terms(client_situation)
         
         # Split CRA keywords into multiple queries (one per line)
         cra_queries = [q.strip() for q in cra_keywords.split('\n') if q.strip()]
         
-        # Execute CRA searches sequentially to avoid connection issues
-        cra_search_results = []
-        for query in cra_queries:
-            try:
-                kb_results = await self.cra_kb.search_knowledgebase(query)
-                # Format the structured results into text
-                if kb_results:
-                    formatted_results = []
-                    for i, result in enumerate(kb_results[:5], 1):  # Return 5 results per pattern
-                        text = result.highlight.text[0] if result.highlight.text else ""
-                        title = result.source.title or "CRA Document"
-                        formatted_results.append(f"{i}. {title}:\n{text[:800]}")
-                    result_text = "\n\n".join(formatted_results)
-                else:
-                    result_text = f"No CRA results found for: {query}"
-                    
-                cra_search_results.append({
-                    "query": query,
-                    "result": result_text
-                })
-            except Exception as e:
-                logger.error(f"Error searching CRA for '{query}': {e}")
-                cra_search_results.append({
-                    "query": query,
-                    "result": f"Search error for: {query}"
-                })
+        # Execute all CRA searches as one batch (single embedding call,
+        # concurrent hybrid queries, chunks deduplicated across queries)
+        cra_search_results = await self._search_cra(cra_queries)
         
         # Execute web search
-        web_search_data = await self._execute_web_search(client_situation)
+        web_search_data = await self._execute_web_search(
+            client_situation, on_partial=on_web_partial
+        )
         logger.info(f"Web search data: {web_search_data}")
         
         return {
@@ -119,6 +128,50 @@ class ReferenceGenerationAgent:
             "cra_keywords": cra_keywords
         }
     
+    async def _search_cra(self, queries: List[str]) -> List[Dict[str, str]]:
+        """Search the CRA knowledge base for all queries and format hits as text."""
+        try:
+            kb_results = await self.cra_kb.search_knowledgebase_many(queries)
+        except Exception as e:
+            logger.error(f"Error searching CRA for {queries}: {e}")
+            return [
+                {"query": query, "result": f"Search error for: {query}"}
+                for query in queries
+            ]
+        
+        # Show each chunk only under the first query that returned it
+        seen_chunks = set()
+        cra_search_results = []
+        for query, hits in zip(kb_results.queries, kb_results.per_query):
+            if query in kb_results.failed_queries:
+                result_text = f"Search error for: {query}"
+            elif not hits:
+                result_text = f"No CRA results found for: {query}"
+            else:
+                formatted_results = []
+                for result in hits[:5]:  # Return 5 results per pattern
+                    text = result.highlight.text[0] if result.highlight.text else ""
+                    title = result.source.title or "CRA Document"
+                    chunk_key = (title, result.source.section, text)
+                    if chunk_key in seen_chunks:
+                        continue
+                    seen_chunks.add(chunk_key)
+                    formatted_results.append(
+                        f"{len(formatted_results) + 1}. {title}:\n{text[:800]}"
+                    )
+                result_text = (
+                    "\n\n".join(formatted_results)
+                    if formatted_results
+                    else f"Results for '{query}' already listed under earlier searches."
+                )
+            
+            cra_search_results.append({
+                "query": query,
+                "result": result_text
+            })
+        
+        return cra_search_results
+    
     async def _generate_cra_search_terms(self, client_situation: str) -> str:
         """Generate CRA search terms using react agent."""
         prompt = CRA_SEARCH_TERM_GENERATION.format(client_situation=client_situation)
@@ -129,8 +182,24 @@ class ReferenceGenerationAgent:
         )
         return result["final_output"].strip() if result["success"] else "tax regulations"
     
-    async def _execute_web_search(self, client_situation: str) -> Dict[str, str]:
-        """Execute web search using dedicated web search agent."""
+    @staticmethod
+    def _combine_web_results(queries: List[str], results: List[str]) -> str:
+        """Format per-query web results as one text."""
+        combined_results = []
+        for i, (query, result) in enumerate(zip(queries, results), 1):
+            combined_results.append(f"Web Search {i} ('{query}'):\n{result}")
+        return "\n\n---\n\n".join(combined_results)
+    
+    async def _execute_web_search(
+        self,
+        client_situation: str,
+        on_partial: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, str]:
+        """Execute web search using dedicated web search agent.
+
+        Searches stream their answers; on_partial, if given, receives the
+        combined results so far after every chunk.
+        """
         try:
             # Step 1: Generate web search query using react agent
             web_query_prompt = WEB_SEARCH_QUERY_GENERATION.format(client_situation=client_situation)
@@ -154,8 +223,9 @@ class ReferenceGenerationAgent:
                 logger.info(f"Individual web queries: {web_queries}")
                 
                 # Step 2: Execute web searches using WebSearchAgent directly (not via ReactRunner)
-                import asyncio
-                async def search_web_single(query):
+                partial_results = ["Searching..."] * len(web_queries)
+                
+                async def search_web_single(index, query):
                     try:
                         # Get the WebSearchAgent directly from AgentManager
                         web_agent = self.web_agent_manager.get_agent()
@@ -163,8 +233,19 @@ class ReferenceGenerationAgent:
                         # Format the search prompt with WEB_SEARCH_EXECUTION instructions
                         search_prompt = WEB_SEARCH_EXECUTION.format(query=query)
                         
-                        # Use WebSearchAgent's search_and_respond method with formatted prompt
-                        search_result = await web_agent.search_and_respond(search_prompt)
+                        # Stream the answer, publishing partial findings as they arrive
+                        chunks = []
+                        # Similar queries share cached answers, so compare the bare query
+                        async for chunk in web_agent.search_and_respond_stream(
+                            search_prompt, cache_key=query
+                        ):
+                            chunks.append(chunk)
+                            if on_partial is not None:
+                                partial_results[index] = "".join(chunks)
+                                on_partial(
+                                    self._combine_web_results(web_queries, partial_results)
+                                )
+                        search_result = "".join(chunks)
                         
                         logger.info(f"Web search successful for: {query}")
                         return {
@@ -180,16 +261,15 @@ class ReferenceGenerationAgent:
                         }
                 
                 # Run all web searches in parallel
-                web_search_results = await asyncio.gather(*[search_web_single(q) for q in web_queries])
+                web_search_results = await asyncio.gather(
+                    *[search_web_single(i, q) for i, q in enumerate(web_queries)]
+                )
                 
                 # Combine all web search results
-                combined_results = []
-                for i, search_result in enumerate(web_search_results, 1):
-                    query = search_result["query"]
-                    result = search_result["result"]
-                    combined_results.append(f"Web Search {i} ('{query}'):\n{result}")
-                
-                combined_results_text = "\n\n---\n\n".join(combined_results)
+                combined_results_text = self._combine_web_results(
+                    [r["query"] for r in web_search_results],
+                    [r["result"] for r in web_search_results],
+                )
                 
                 return {
                     "query": web_queries_text,  # All queries combined
@@ -1,6 +1,10 @@
 """Shared toolings for reference implementations."""
 
-from .async_utils import gather_with_progress, rate_limited
+from .async_utils import (
+    AdaptiveConcurrencyLimiter,
+    gather_with_progress,
+    rate_limited,
+)
 from .env_vars import Configs
 from .gradio.messages import (
     gradio_messages_to_oai_chat,
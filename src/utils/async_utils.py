@@ -1,9 +1,15 @@
 """Utils for async workflows."""
 
 import asyncio
+import collections
+import logging
+import math
+import time
 import types
 from typing import Any, Awaitable, Callable, Coroutine, Sequence, TypeVar
 
+import numpy as np
+import pydantic
 from rich.progress import Progress
 
 
@@ -15,14 +21,357 @@ async def indexed(index: int, coro: Coroutine[None, None, T]) -> tuple[int, T]:
     return index, (await coro)
 
 
+class ConcurrencyLimiterStats(pydantic.BaseModel):
+    """Gauges and counters of an adaptive concurrency limiter."""
+
+    limit: int
+    in_flight: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    successes: int = 0
+    errors: int = 0
+    latency_spikes: int = 0
+    increases: int = 0
+    decreases: int = 0
+    # Smoothed latency (seconds) of successful calls that were not spikes.
+    baseline_latency: float | None = None
+
+
+class AdaptiveConcurrencyLimiter:
+    """Concurrency limit that adapts to the backend with AIMD.
+
+    The limit grows by one after `limit` consecutive successful calls within
+    the latency target, but only while callers are actually waiting for a
+    slot. It is multiplied by `backoff_ratio` when a call fails with an
+    overload error or takes longer than the target; calls that started before
+    the previous decrease do not decrease it again.
+
+    Use it in place of an `asyncio.Semaphore` with `rate_limited`, or call
+    `run` directly.
+
+    Parameters
+    ----------
+    initial_limit : int, optional, default=3
+        Concurrency before any feedback.
+    min_limit : int, optional, default=1
+        Lower bound of the limit.
+    max_limit : int, optional, default=32
+        Upper bound of the limit.
+    latency_target : float, optional, default=None
+        Latency in seconds above which a call counts as a spike. By default a
+        call is a spike if it takes `latency_tolerance` times the smoothed
+        latency of previous calls.
+    latency_tolerance : float, optional, default=2.0
+        Multiple of the smoothed latency tolerated when no target is given.
+    backoff_ratio : float, optional, default=0.5
+        Factor applied to the limit on overload.
+    is_overload : Callable[[BaseException], bool], optional, default=None
+        Whether an exception signals overload (e.g. HTTP 429). By default
+        every exception does.
+    name : str, optional, default="limiter"
+        Name used in log messages.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 3,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        latency_target: float | None = None,
+        latency_tolerance: float = 2.0,
+        backoff_ratio: float = 0.5,
+        is_overload: Callable[[BaseException], bool] | None = None,
+        name: str = "limiter",
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit.")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.is_overload = is_overload or (lambda _: True)
+        self.name = name
+        self.stats = ConcurrencyLimiterStats(limit=initial_limit)
+        self.logger = logging.getLogger(__name__)
+
+        self._waiters: collections.deque[asyncio.Future[None]] = collections.deque()
+        self._successes_since_change = 0
+        self._last_decrease = -math.inf
+
+    @property
+    def limit(self) -> int:
+        """Current maximum number of concurrent calls."""
+        return self.stats.limit
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently running."""
+        return self.stats.in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a slot."""
+        return self.stats.queue_depth
+
+    async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn once a slot is free and adjust the limit from the outcome."""
+        saturated = await self._acquire()
+        started_at = time.monotonic()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if self.is_overload(e):
+                self.stats.errors += 1
+                self._decrease(started_at, reason=f"{type(e).__name__}")
+            raise
+        else:
+            self._on_success(time.monotonic() - started_at, started_at, saturated)
+            return result
+        finally:
+            self._release()
+
+    async def _acquire(self) -> bool:
+        """Wait for a slot; return whether the limit was reached on the way."""
+        if self.stats.in_flight < self.stats.limit and not self._waiters:
+            self.stats.in_flight += 1
+            return self.stats.in_flight >= self.stats.limit
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats.queue_depth = len(self._waiters)
+        self.stats.max_queue_depth = max(
+            self.stats.max_queue_depth, self.stats.queue_depth
+        )
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just before the cancellation.
+                self._release()
+            else:
+                self._waiters.remove(waiter)
+                self.stats.queue_depth = len(self._waiters)
+            raise
+        return True
+
+    def _release(self) -> None:
+        """Free a slot and hand free slots to waiters."""
+        self.stats.in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        """Start waiters while there is room under the limit."""
+        while self._waiters and self.stats.in_flight < self.stats.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.stats.in_flight += 1
+                waiter.set_result(None)
+        self.stats.queue_depth = len(self._waiters)
+
+    def _on_success(self, latency: float, started_at: float, saturated: bool) -> None:
+        """Record a successful call and grow the limit if warranted."""
+        self.stats.successes += 1
+        baseline = self.stats.baseline_latency
+        if self.latency_target is not None:
+            is_spike = latency > self.latency_target
+        else:
+            is_spike = baseline is not None and (
+                latency > self.latency_tolerance * baseline
+            )
+
+        if is_spike:
+            self.stats.latency_spikes += 1
+            self._decrease(started_at, reason=f"latency {latency * 1000:.0f} ms")
+            return
+
+        self.stats.baseline_latency = (
+            latency if baseline is None else 0.9 * baseline + 0.1 * latency
+        )
+        self._successes_since_change += 1
+        if (
+            saturated
+            and self._successes_since_change >= self.stats.limit
+            and self.stats.limit < self.max_limit
+        ):
+            self.stats.limit += 1
+            self.stats.increases += 1
+            self._successes_since_change = 0
+            self.logger.debug(f"{self.name}: concurrency limit -> {self.stats.limit}")
+            self._wake_waiters()
+
+    def _decrease(self, started_at: float, reason: str) -> None:
+        """Shrink the limit, once per batch of calls started at the old limit."""
+        self._successes_since_change = 0
+        if started_at < self._last_decrease:
+            return
+
+        self._last_decrease = time.monotonic()
+        new_limit = max(self.min_limit, int(self.stats.limit * self.backoff_ratio))
+        if new_limit < self.stats.limit:
+            self.stats.limit = new_limit
+            self.stats.decreases += 1
+            self.logger.warning(
+                f"{self.name}: concurrency limit -> {new_limit} ({reason})"
+            )
+
+
 async def rate_limited(
-    _fn: Callable[[], Awaitable[T]], semaphore: asyncio.Semaphore
+    _fn: Callable[[], Awaitable[T]],
+    semaphore: asyncio.Semaphore | AdaptiveConcurrencyLimiter,
 ) -> T:
-    """Run _fn with semaphore rate limit."""
+    """Run _fn under a semaphore or an adaptive concurrency limiter."""
+    if isinstance(semaphore, AdaptiveConcurrencyLimiter):
+        return await semaphore.run(_fn)
+
     async with semaphore:
         return await _fn()
 
 
+class HedgeStats(pydantic.BaseModel):
+    """Counters of a hedged call site."""
+
+    calls: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    budget_exhausted: int = 0
+    # Current hedging delay in seconds; None until enough latencies are seen.
+    threshold: float | None = None
+
+    @property
+    def hedge_rate(self) -> float:
+        """Fraction of calls that sent a duplicate request."""
+        return self.hedged / self.calls if self.calls else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        """Fraction of duplicate requests that finished first."""
+        return self.hedge_wins / self.hedged if self.hedged else 0.0
+
+
+class HedgePolicy:
+    """When to send a duplicate request, and how many duplicates to allow.
+
+    A duplicate is sent once the primary request has been running longer than
+    the `percentile` of recently observed latencies. Every call earns
+    `max_extra_load` of a hedge credit and every duplicate spends one, so
+    duplicates never exceed that fraction of calls over time.
+
+    Parameters
+    ----------
+    percentile : float, optional, default=95.0
+        Latency percentile after which a duplicate is sent.
+    max_extra_load : float, optional, default=0.05
+        Maximum ratio of duplicates to calls.
+    min_delay : float, optional, default=0.01
+        Lower bound of the hedging delay in seconds.
+    window : int, optional, default=256
+        Number of recent latencies the percentile is computed over.
+    min_samples : int, optional, default=20
+        Calls observed before hedging starts.
+    max_burst : float, optional, default=2.0
+        Maximum number of unspent hedge credits.
+    name : str, optional, default="hedge"
+        Name used in log messages.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_extra_load: float = 0.05,
+        min_delay: float = 0.01,
+        window: int = 256,
+        min_samples: int = 20,
+        max_burst: float = 2.0,
+        name: str = "hedge",
+    ) -> None:
+        self.percentile = percentile
+        self.max_extra_load = max_extra_load
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.max_burst = max_burst
+        self.name = name
+        self.stats = HedgeStats()
+        self.logger = logging.getLogger(__name__)
+
+        self._latencies: collections.deque[float] = collections.deque(maxlen=window)
+        self._credits = 0.0
+
+    def delay(self) -> float | None:
+        """Seconds to wait before hedging, or None while still warming up."""
+        if len(self._latencies) < self.min_samples:
+            return None
+        threshold = float(np.percentile(self._latencies, self.percentile))
+        self.stats.threshold = max(self.min_delay, threshold)
+        return self.stats.threshold
+
+    def record(self, latency: float) -> None:
+        """Add an observed latency in seconds."""
+        self._latencies.append(latency)
+
+    def _earn(self) -> None:
+        """Credit one call towards the hedging budget."""
+        self._credits = min(self.max_burst, self._credits + self.max_extra_load)
+
+    def _try_spend(self) -> bool:
+        """Spend a hedge credit if one is available."""
+        if self._credits < 1.0:
+            return False
+        self._credits -= 1.0
+        return True
+
+
+async def hedged(fn: Callable[[], Awaitable[T]], policy: HedgePolicy) -> T:
+    """Run fn, sending a duplicate call if it is slower than usual.
+
+    Whichever call succeeds first wins and the other is cancelled. fn must be
+    safe to call twice, e.g. a read-only request. If both calls fail, the
+    primary call's exception is raised.
+    """
+    policy.stats.calls += 1
+    policy._earn()
+    delay = policy.delay()
+    started_at = time.monotonic()
+    primary = asyncio.ensure_future(fn())
+    hedge: asyncio.Future[T] | None = None
+
+    try:
+        if delay is not None:
+            await asyncio.wait({primary}, timeout=delay)
+        if delay is None or primary.done() or not policy._try_spend():
+            if delay is not None and not primary.done():
+                policy.stats.budget_exhausted += 1
+            result = await primary
+            policy.record(time.monotonic() - started_at)
+            return result
+
+        policy.stats.hedged += 1
+        hedge = asyncio.ensure_future(fn())
+        pending: set[asyncio.Future[T]] = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        policy.stats.hedge_wins += 1
+                    # A lower bound of the primary's latency if the hedge won.
+                    policy.record(time.monotonic() - started_at)
+                    return task.result()
+
+        # Both calls failed.
+        hedge.exception()  # Mark the hedge's exception as retrieved.
+        return primary.result()
+    finally:
+        for task in (primary, hedge):
+            if task is not None and not task.done():
+                task.cancel()
+
+
 async def gather_with_progress(
     coros: "list[types.CoroutineType[Any, Any, T]]",
     description: str = "Running tasks",
@@ -0,0 +1,444 @@
+"""In-process caches shared by the tool implementations."""
+
+import asyncio
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, Iterator, TypeVar
+
+import numpy as np
+import pydantic
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheStats(pydantic.BaseModel):
+    """Hit/miss counters for a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCacheStats(CacheStats):
+    """Counters for a TTL cache with request coalescing."""
+
+    expirations: int = 0
+    coalesced: int = 0
+    invalidations: int = 0
+    stale_hits: int = 0
+    refreshes: int = 0
+    failed_refreshes: int = 0
+    # Age in seconds of the values served from the cache.
+    max_served_age: float = 0.0
+    total_served_age: float = 0.0
+
+    @property
+    def mean_served_age(self) -> float:
+        """Average age in seconds of the values served from the cache."""
+        return self.total_served_age / self.hits if self.hits else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """Dict-backed cache that evicts the least recently used entry when full."""
+
+    def __init__(self, max_entries: int) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._data: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value and mark it as recently used, or None."""
+        if key not in self._data:
+            self.stats.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return self._data[key]
+
+    def put(self, key: K, value: V) -> None:
+        """Insert or replace a value, evicting the oldest entries if needed."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def peek(self, key: K) -> V | None:
+        """Return the cached value without touching recency or counters."""
+        return self._data.get(key)
+
+    def pop(self, key: K) -> V | None:
+        """Remove and return a value, or None if it is not cached."""
+        return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
+
+    def __iter__(self) -> Iterator[K]:
+        """Iterate over a snapshot of the keys, least recently used first."""
+        return iter(list(self._data))
+
+    def __contains__(self, key: object) -> bool:
+        """Check membership without touching recency or counters."""
+        return key in self._data
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._data)
+
+
+class AsyncTTLCache(Generic[K, V]):
+    """LRU cache whose entries expire after `ttl` seconds.
+
+    `get_or_compute` coalesces concurrent misses for the same key so that only
+    one computation runs; the other callers await its result. Failed
+    computations are not cached.
+
+    With `stale_ttl`, an entry older than `ttl` but younger than
+    `ttl + stale_ttl` is still returned immediately while a single background
+    computation refreshes it (stale-while-revalidate). If the refresh fails,
+    the stale value keeps being served until it expires for good.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, stale_ttl: float = 0.0) -> None:
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stats = TTLCacheStats()
+        self.logger = logging.getLogger(__name__)
+        # Values are stored with the monotonic time they were computed at.
+        self._entries: LRUCache[K, tuple[float, V]] = LRUCache(max_entries)
+        self._in_flight: dict[K, asyncio.Future[V]] = {}
+        self._refresh_tasks: set[asyncio.Task[None]] = set()
+        self._generation = 0
+
+    async def get_or_compute(self, key: K, compute: Callable[[], Awaitable[V]]) -> V:
+        """Return the cached value for key, computing it at most once on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            if age < self.ttl + self.stale_ttl:
+                self.stats.hits += 1
+                self.stats.total_served_age += age
+                self.stats.max_served_age = max(self.stats.max_served_age, age)
+                if age >= self.ttl:
+                    self.stats.stale_hits += 1
+                    if key not in self._in_flight:
+                        self._start_refresh(key, compute)
+                return value
+            self._entries.pop(key)
+            self.stats.expirations += 1
+
+        while (in_flight := self._in_flight.get(key)) is not None:
+            self.stats.coalesced += 1
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # Retry if the leader was cancelled rather than this caller.
+                current_task = asyncio.current_task()
+                if not in_flight.cancelled() or (
+                    current_task is not None and current_task.cancelling()
+                ):
+                    raise
+
+        self.stats.misses += 1
+        return await self._compute(key, compute)
+
+    def age(self, key: K) -> float | None:
+        """Seconds since the cached value for key was computed, if cached."""
+        entry = self._entries.peek(key)
+        return None if entry is None else time.monotonic() - entry[0]
+
+    async def _compute(self, key: K, compute: Callable[[], Awaitable[V]]) -> V:
+        """Compute and store a value, letting concurrent callers join in."""
+        future: asyncio.Future[V] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        generation = self._generation
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting.
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+        future.set_result(value)
+        # Results that raced with an invalidation may be stale; do not keep them.
+        if generation == self._generation:
+            self._put(key, value)
+        return value
+
+    def _start_refresh(self, key: K, compute: Callable[[], Awaitable[V]]) -> None:
+        """Recompute a stale entry in the background."""
+
+        async def refresh() -> None:
+            self.stats.refreshes += 1
+            try:
+                await self._compute(key, compute)
+            except Exception as e:
+                self.stats.failed_refreshes += 1
+                self.logger.warning(f"Background refresh of {key!r} failed: {e}")
+
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    def __contains__(self, key: object) -> bool:
+        """Check for an unexpired entry without touching recency or counters."""
+        entry = self._entries.peek(key)  # type: ignore
+        return entry is not None and time.monotonic() < entry[0] + self.ttl
+
+    def invalidate(
+        self,
+        predicate: Callable[[K], bool] | None = None,
+        value_predicate: Callable[[V], bool] | None = None,
+    ) -> int:
+        """Drop cached entries matching the predicates (all entries if not given).
+
+        Computations already in flight when this is called are not cached.
+
+        Parameters
+        ----------
+        predicate : Callable[[K], bool], optional, default=None
+            Selects entries by key.
+        value_predicate : Callable[[V], bool], optional, default=None
+            Selects entries by cached value. When both predicates are given, an
+            entry is dropped only if it matches both.
+
+        Returns
+        -------
+        int
+            The number of entries dropped.
+        """
+        self._generation += 1
+        self.stats.invalidations += 1
+        if predicate is None and value_predicate is None:
+            num_dropped = len(self._entries)
+            self._entries.clear()
+            return num_dropped
+
+        keys = []
+        for key in self._entries:
+            if predicate is not None and not predicate(key):
+                continue
+            if value_predicate is not None:
+                _, value = self._entries.peek(key)  # type: ignore[misc]
+                if not value_predicate(value):
+                    continue
+            keys.append(key)
+        for key in keys:
+            self._entries.pop(key)
+        return len(keys)
+
+    def _put(self, key: K, value: V) -> None:
+        """Store value with the current time."""
+        evictions_before = self._entries.stats.evictions
+        self._entries.put(key, (time.monotonic(), value))
+        self.stats.evictions += self._entries.stats.evictions - evictions_before
+
+    def __len__(self) -> int:
+        """Return the number of cached entries, including expired ones."""
+        return len(self._entries)
+
+
+class SemanticCacheStats(CacheStats):
+    """Counters for a semantic cache, for tuning its similarity threshold."""
+
+    expirations: int = 0
+    near_misses: int = 0
+    embedding_failures: int = 0
+    # Best similarity found by each lookup into a non-empty cache, rounded to
+    # 0.01; hits are the counts at or above the threshold.
+    similarity_counts: Counter[float] = pydantic.Field(default_factory=Counter)
+
+
+class SemanticCache(Generic[V]):
+    """Cache keyed by meaning rather than by exact text.
+
+    Queries are embedded, and a lookup is served by the most similar cached
+    query if their cosine similarity is at least `threshold` and the entry is
+    younger than `ttl` seconds. The unit-normalized embeddings of all entries
+    live in one matrix, so a lookup is a single matrix-vector product. When
+    full, the least recently used entry is evicted.
+
+    Parameters
+    ----------
+    embed : Callable[[str], Awaitable[list[float]]]
+        Returns the embedding of a query.
+    max_entries : int, optional
+        Most cached queries, by default 256.
+    threshold : float, optional
+        Smallest cosine similarity served from the cache, by default 0.92.
+    ttl : float, optional
+        Seconds an entry stays fresh, by default one hour.
+    near_miss_margin : float, optional
+        Misses within this margin below the threshold are counted as near
+        misses, by default 0.05.
+    should_cache : Callable[[V], bool], optional
+        Values it rejects, e.g. error messages, are not stored.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], Awaitable[list[float]]],
+        max_entries: int = 256,
+        threshold: float = 0.92,
+        ttl: float = 3600.0,
+        near_miss_margin: float = 0.05,
+        should_cache: Callable[[V], bool] | None = None,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+
+        self.embed = embed
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self.near_miss_margin = near_miss_margin
+        self.should_cache = should_cache
+        self.stats = SemanticCacheStats()
+        self.logger = logging.getLogger(__name__)
+
+        # Allocated on the first insert, once the embedding size is known.
+        self._vectors: np.ndarray | None = None
+        self._stored_at = np.zeros(max_entries)
+        self._occupied = np.zeros(max_entries, dtype=bool)
+        self._queries: list[str | None] = [None] * max_entries
+        self._values: list[V | None] = [None] * max_entries
+        # Occupied slots, least recently used first.
+        self._recency: OrderedDict[int, None] = OrderedDict()
+        # A miss is usually followed by a put of the same query.
+        self._embeddings: LRUCache[str, np.ndarray] = LRUCache(max_entries=16)
+
+    async def get(self, query: str) -> V | None:
+        """Return the value of the most similar fresh query, or None."""
+        vector = await self._embed(query)
+        if vector is None:
+            self.stats.misses += 1
+            return None
+
+        slot, similarity = self._nearest(vector)
+        if slot is not None:
+            self.stats.similarity_counts[round(similarity, 2)] += 1
+            if similarity >= self.threshold:
+                self.stats.hits += 1
+                self._recency.move_to_end(slot)
+                self.logger.debug(
+                    f"Semantic cache hit ({similarity:.3f}): {query!r} -> "
+                    f"{self._queries[slot]!r}"
+                )
+                return self._values[slot]
+            if similarity >= self.threshold - self.near_miss_margin:
+                self.stats.near_misses += 1
+                self.logger.debug(
+                    f"Semantic cache near miss ({similarity:.3f}): {query!r} ~ "
+                    f"{self._queries[slot]!r}"
+                )
+        self.stats.misses += 1
+        return None
+
+    async def put(self, query: str, value: V) -> None:
+        """Store a value for query, evicting the least recently used if full."""
+        if self.should_cache is not None and not self.should_cache(value):
+            return
+        vector = await self._embed(query)
+        if vector is None:
+            return
+
+        if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+            self.clear()
+            self._vectors = np.zeros((self.max_entries, vector.shape[0]), np.float32)
+
+        self._expire()
+        free = np.flatnonzero(~self._occupied)
+        if free.size:
+            slot = int(free[0])
+        else:
+            slot, _ = self._recency.popitem(last=False)
+            self.stats.evictions += 1
+
+        self._vectors[slot] = vector
+        self._stored_at[slot] = time.monotonic()
+        self._occupied[slot] = True
+        self._queries[slot] = query
+        self._values[slot] = value
+        self._recency[slot] = None
+
+    async def get_or_compute(
+        self, query: str, compute: Callable[[], Awaitable[V]]
+    ) -> V:
+        """Return a cached value for a similar query, or compute and store one."""
+        value = await self.get(query)
+        if value is not None:
+            return value
+        value = await compute()
+        await self.put(query, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._occupied[:] = False
+        self._queries = [None] * self.max_entries
+        self._values = [None] * self.max_entries
+        self._recency.clear()
+
+    async def _embed(self, query: str) -> np.ndarray | None:
+        """Return the unit-normalized embedding of query, or None on failure."""
+        vector = self._embeddings.get(query)
+        if vector is not None:
+            return vector
+        try:
+            vector = np.asarray(await self.embed(query), dtype=np.float32)
+        except Exception as e:
+            self.stats.embedding_failures += 1
+            self.logger.warning(f"Could not embed {query!r} for the cache: {e}")
+            return None
+        norm = float(np.linalg.norm(vector))
+        vector = vector / norm if norm > 0 else vector
+        self._embeddings.put(query, vector)
+        return vector
+
+    def _nearest(self, vector: np.ndarray) -> tuple[int | None, float]:
+        """Find the fresh entry most similar to a unit vector."""
+        self._expire()
+        if self._vectors is None or not self._recency:
+            return None, 0.0
+        if self._vectors.shape[1] != vector.shape[0]:
+            return None, 0.0
+        similarities = self._vectors @ vector
+        similarities[~self._occupied] = -np.inf
+        slot = int(np.argmax(similarities))
+        return slot, float(similarities[slot])
+
+    def _expire(self) -> None:
+        """Free the slots of entries older than the TTL."""
+        expired = self._occupied & (self._stored_at <= time.monotonic() - self.ttl)
+        for slot in np.flatnonzero(expired).tolist():
+            self._occupied[slot] = False
+            self._queries[slot] = None
+            self._values[slot] = None
+            self._recency.pop(slot, None)
+            self.stats.expirations += 1
+
+    def __len__(self) -> int:
+        """Return the number of cached entries, including expired ones."""
+        return len(self._recency)
@@ -1,4 +1,15 @@
+from .client_profiles import (
+    ClientProfile,
+    get_client_profile,
+    load_client_profiles,
+)
 from .load_dataset import get_dataset, get_dataset_url_hash
 
 
-__all__ = ["get_dataset", "get_dataset_url_hash"]
\ No newline at end of file
+__all__ = [
+    "ClientProfile",
+    "get_client_profile",
+    "get_dataset",
+    "get_dataset_url_hash",
+    "load_client_profiles",
+]
@@ -0,0 +1,145 @@
+"""Client profiles of the advisory meetings in `data/profile/client_profile.jsonl`."""
+
+import functools
+import json
+import os
+from typing import Literal
+
+import pydantic
+
+
+DEFAULT_PROFILES_PATH = os.path.join("data", "profile", "client_profile.jsonl")
+
+
+class ClientProfile(pydantic.BaseModel):
+    """One client, as recorded for a meeting transcript.
+
+    Balance fields follow the source file: `t_bal` tax-free savings,
+    `i_bal_reg` registered and `i_bal_non_reg` non-registered investments,
+    `b_bal` other account balances and `c_bal` cash. Missing balances are None.
+    """
+
+    mt_transcript: str
+    first_name: str
+    last_name: str
+    age: int
+    gender: str | None = None
+    citizenship: str | None = None
+    residency: str | None = None
+    state_province: str | None = None
+    household_num: int | None = None
+    new_immigrant: Literal["y", "n"] | None = None
+    occupation: str | None = None
+    tenure: int | None = None
+    t_bal: float | None = None
+    i_bal_reg: float | None = None
+    i_bal_non_reg: float | None = None
+    b_bal: float | None = None
+    c_bal: float | None = None
+    ext_asset_value: float | None = None
+    crossborder_ind: Literal["y", "n"] | None = None
+    donation_ind: Literal["y", "n"] | None = None
+    re_ind: Literal["y", "n"] | None = None
+    tax_complexity: int | None = None
+    risk_tolerance: int | None = None
+    risk_capacity: int | None = None
+    investment_exp: int | None = None
+    primary_goal: str | None = None
+    time_horizon: int | None = None
+    annual_income: float | None = None
+    income_stability: str | None = None
+    savings_rate: float | None = None
+    liquidity_needs: str | None = None
+    investment_style: str | None = None
+    asset_alloc_pref: str | None = None
+    sector_pref: str | None = None
+    esg_interest: Literal["y", "n"] | None = None
+    retirement_age: int | None = None
+    estate_planning: str | None = None
+    education_fund: Literal["y", "n"] | None = None
+    insurance_review: str | None = None
+
+    @property
+    def client_id(self) -> str:
+        """Transcript file name without extension, e.g. "meeting_01_..."."""
+        return os.path.splitext(self.mt_transcript)[0]
+
+    @property
+    def full_name(self) -> str:
+        """First and last name."""
+        return f"{self.first_name} {self.last_name}"
+
+    @property
+    def investable_assets(self) -> float:
+        """Sum of the account and cash balances, excluding external assets."""
+        balances = (self.t_bal, self.i_bal_reg, self.i_bal_non_reg, self.b_bal)
+        return sum(b for b in (*balances, self.c_bal) if b is not None)
+
+    @property
+    def equity_fraction(self) -> float | None:
+        """Equity share of the preferred allocation, e.g. 0.72 for "72/28"."""
+        if not self.asset_alloc_pref:
+            return None
+        equity, _, fixed_income = self.asset_alloc_pref.partition("/")
+        total = float(equity) + float(fixed_income or 100 - float(equity))
+        return float(equity) / total
+
+    @property
+    def sectors(self) -> list[str]:
+        """Preferred sectors, lower-cased; empty if none are recorded."""
+        if not self.sector_pref:
+            return []
+        return [s.strip().lower() for s in self.sector_pref.split(",") if s.strip()]
+
+
+@functools.lru_cache(maxsize=8)
+def _load(path: str) -> tuple[ClientProfile, ...]:
+    """Parse the JSONL file once per path."""
+    with open(path) as file:
+        return tuple(
+            ClientProfile.model_validate(json.loads(line))
+            for line in file
+            if line.strip()
+        )
+
+
+def load_client_profiles(path: str = DEFAULT_PROFILES_PATH) -> list[ClientProfile]:
+    """Load every client profile from a JSONL file."""
+    return list(_load(os.path.abspath(path)))
+
+
+def get_client_profile(
+    client: str, profiles: list[ClientProfile] | None = None
+) -> ClientProfile:
+    """Find a profile by full name, transcript name or meeting number.
+
+    Parameters
+    ----------
+    client : str
+        E.g. "Sarah Mitchell", "meeting_01_investment_strategies" or "01".
+    profiles : list[ClientProfile], optional
+        Profiles to search. Defaults to `load_client_profiles()`.
+
+    Raises
+    ------
+    ValueError
+        If no profile, or more than one, matches.
+    """
+    profiles = profiles if profiles is not None else load_client_profiles()
+    key = client.strip().casefold()
+    matches = [
+        p
+        for p in profiles
+        if key
+        in (
+            p.full_name.casefold(),
+            p.client_id.casefold(),
+            p.mt_transcript.casefold(),
+            p.client_id.split("_")[1],
+        )
+    ]
+    if len(matches) != 1:
+        known = ", ".join(p.full_name for p in profiles)
+        problem = "No client" if not matches else "More than one client"
+        raise ValueError(f"{problem} matches {client!r}. Known clients: {known}.")
+    return matches[0]
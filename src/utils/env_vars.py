@@ -21,6 +21,10 @@ class Configs(pydantic.BaseModel):
     weaviate_http_secure: bool = True
     weaviate_grpc_secure: bool = True
 
+    # Knowledge base backend: "weaviate" or "local" (snapshot in kb_snapshot_dir)
+    kb_backend: str = "weaviate"
+    kb_snapshot_dir: str | None = None
+
     # Langfuse
     langfuse_public_key: str
     langfuse_secret_key: str
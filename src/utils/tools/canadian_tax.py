@@ -0,0 +1,550 @@
+"""Canadian personal income tax, RRSP/TFSA room and contribution optimizer.
+
+Tax is computed from 2025 federal and provincial (ON, BC, AB) brackets as
+array operations, so one call prices any number of incomes. The optimizer
+uses this to evaluate a grid of RRSP / spousal RRSP / TFSA splits in a single
+pass and returns the split with the highest after-tax value at retirement.
+
+Only the basic personal amounts are claimed as credits; CPP/EI, employment
+and other credits, and low-income provincial reductions, are not modelled.
+"""
+
+import logging
+import time
+
+import numpy as np
+import pydantic
+
+from ..data.client_profiles import ClientProfile, get_client_profile
+
+
+TAX_YEAR = 2025
+
+RRSP_DOLLAR_LIMITS = {2023: 30_780, 2024: 31_560, 2025: 32_490, 2026: 33_810}
+RRSP_EARNED_INCOME_RATE = 0.18
+
+TFSA_ANNUAL_LIMITS = {
+    **dict.fromkeys(range(2009, 2013), 5_000),
+    2013: 5_500,
+    2014: 5_500,
+    2015: 10_000,
+    **dict.fromkeys(range(2016, 2019), 5_500),
+    **dict.fromkeys(range(2019, 2023), 6_000),
+    2023: 6_500,
+    2024: 7_000,
+    2025: 7_000,
+}
+
+# Years after a spousal RRSP contribution during which a withdrawal by the
+# annuitant spouse is taxed in the contributor's hands (ITA s. 146(8.3)).
+SPOUSAL_ATTRIBUTION_YEARS = 3
+
+
+class TaxSchedule(pydantic.BaseModel):
+    """Brackets and basic personal amount of one jurisdiction."""
+
+    name: str
+    thresholds: tuple[float, ...]
+    rates: tuple[float, ...]
+    basic_personal_amount: float
+    credit_rate: float
+
+    def bracket_tax(self, income: np.ndarray) -> np.ndarray:
+        """Tax before credits, for an array of taxable incomes."""
+        lower = np.array((0.0, *self.thresholds))
+        width = np.array((*self.thresholds, np.inf)) - lower
+        taxed = np.clip(
+            np.asarray(income, dtype=np.float64)[..., None] - lower, 0, width
+        )
+        return taxed @ np.array(self.rates)
+
+    def basic_tax(self, income: np.ndarray) -> np.ndarray:
+        """Tax after the basic personal amount credit, floored at zero."""
+        credit = self.credit_rate * self.basic_personal_amount
+        return np.maximum(self.bracket_tax(income) - credit, 0.0)
+
+
+# The lowest federal rate falls from 15% to 14% on July 1, 2025; 14.5% is the
+# rate applied to the whole 2025 year, including credits.
+FEDERAL = TaxSchedule(
+    name="Federal",
+    thresholds=(57_375, 114_750, 177_882, 253_414),
+    rates=(0.145, 0.205, 0.26, 0.29, 0.33),
+    basic_personal_amount=16_129,
+    credit_rate=0.145,
+)
+# The federal basic personal amount is reduced to this floor between the
+# fourth and fifth bracket thresholds.
+FEDERAL_MIN_BPA = 14_538
+
+PROVINCES = {
+    "ON": TaxSchedule(
+        name="Ontario",
+        thresholds=(52_886, 105_775, 150_000, 220_000),
+        rates=(0.0505, 0.0915, 0.1116, 0.1216, 0.1316),
+        basic_personal_amount=12_747,
+        credit_rate=0.0505,
+    ),
+    "BC": TaxSchedule(
+        name="British Columbia",
+        thresholds=(49_279, 98_560, 113_158, 137_407, 186_306, 259_829),
+        rates=(0.0506, 0.077, 0.105, 0.1229, 0.147, 0.168, 0.205),
+        basic_personal_amount=12_932,
+        credit_rate=0.0506,
+    ),
+    "AB": TaxSchedule(
+        name="Alberta",
+        thresholds=(60_000, 151_234, 181_481, 241_974, 362_961),
+        rates=(0.08, 0.10, 0.12, 0.13, 0.14, 0.15),
+        basic_personal_amount=22_323,
+        credit_rate=0.08,
+    ),
+}
+
+PROVINCE_ALIASES = {
+    "ontario": "ON",
+    "british columbia": "BC",
+    "british_columbia": "BC",
+    "alberta": "AB",
+}
+
+# Ontario surtax: rate applied to basic Ontario tax above each threshold.
+ONTARIO_SURTAX = ((5_710, 0.20), (7_307, 0.36))
+# Ontario Health Premium is piecewise linear in taxable income.
+ONTARIO_HEALTH_PREMIUM = (
+    (20_000, 25_000, 36_000, 38_500, 48_000, 48_600, 72_000, 72_600, 200_000, 200_600),
+    (0, 300, 300, 450, 450, 600, 600, 750, 750, 900),
+)
+
+
+def normalize_province(province: str) -> str:
+    """Map "Ontario", "on" etc. to a supported two-letter code.
+
+    Raises
+    ------
+    ValueError
+        If the province is not supported.
+    """
+    key = province.strip()
+    code = PROVINCE_ALIASES.get(key.lower(), key.upper())
+    if code not in PROVINCES:
+        raise ValueError(
+            f"Unsupported province {province!r}; supported: {', '.join(PROVINCES)}."
+        )
+    return code
+
+
+def federal_tax(income: np.ndarray) -> np.ndarray:
+    """Federal tax on taxable income, with the phased-out basic personal amount."""
+    income = np.asarray(income, dtype=np.float64)
+    start, end = FEDERAL.thresholds[2], FEDERAL.thresholds[3]
+    phase_out = np.clip((income - start) / (end - start), 0.0, 1.0)
+    bpa = FEDERAL.basic_personal_amount - phase_out * (
+        FEDERAL.basic_personal_amount - FEDERAL_MIN_BPA
+    )
+    return np.maximum(FEDERAL.bracket_tax(income) - FEDERAL.credit_rate * bpa, 0.0)
+
+
+def provincial_tax(income: np.ndarray, province: str) -> np.ndarray:
+    """Provincial tax on taxable income, including Ontario surtax and premium."""
+    code = normalize_province(province)
+    tax = PROVINCES[code].basic_tax(income)
+    if code == "ON":
+        basic = tax
+        tax = basic + sum(
+            rate * np.maximum(basic - t, 0.0) for t, rate in ONTARIO_SURTAX
+        )
+        tax = tax + np.interp(income, *ONTARIO_HEALTH_PREMIUM)
+    return tax
+
+
+def total_tax(income: np.ndarray, province: str) -> np.ndarray:
+    """Compute combined federal and provincial tax on taxable income."""
+    return federal_tax(income) + provincial_tax(income, province)
+
+
+def marginal_rate(income: np.ndarray, province: str) -> np.ndarray:
+    """Compute the combined tax on the next dollar of income."""
+    income = np.asarray(income, dtype=np.float64)
+    return total_tax(income + 1.0, province) - total_tax(income, province)
+
+
+def rrsp_deduction_limit(
+    earned_income: float,
+    pension_adjustment: float = 0.0,
+    unused_room: float = 0.0,
+    year: int = TAX_YEAR,
+) -> float:
+    """RRSP room for `year` from the previous year's earned income."""
+    new_room = min(RRSP_EARNED_INCOME_RATE * earned_income, RRSP_DOLLAR_LIMITS[year])
+    return max(new_room - pension_adjustment, 0.0) + unused_room
+
+
+def tfsa_room(
+    age: int,
+    contributions: float = 0.0,
+    withdrawals: float = 0.0,
+    resident_since: int | None = None,
+    year: int = TAX_YEAR,
+) -> float:
+    """Unused TFSA room for `year`.
+
+    Room accrues from 2009, the year the holder turned 18 or the year they
+    became resident, whichever is latest. `contributions` and `withdrawals`
+    are lifetime totals up to the end of the previous year.
+    """
+    first_year = max(2009, year - age + 18, resident_since or 0)
+    accrued = sum(TFSA_ANNUAL_LIMITS[y] for y in range(first_year, year + 1))
+    return max(accrued - contributions + withdrawals, 0.0)
+
+
+def spousal_attribution(
+    withdrawal: float, withdrawal_year: int, spousal_contributions: dict[int, float]
+) -> float:
+    """Part of a spousal RRSP withdrawal taxed in the contributor's hands.
+
+    A withdrawal is attributed up to the spousal contributions made in the
+    year of the withdrawal and the two preceding years.
+    """
+    recent = sum(
+        amount
+        for contribution_year, amount in spousal_contributions.items()
+        if withdrawal_year - SPOUSAL_ATTRIBUTION_YEARS
+        < contribution_year
+        <= withdrawal_year
+    )
+    return min(withdrawal, recent)
+
+
+class TaxBreakdown(pydantic.BaseModel):
+    """Tax on one taxable income."""
+
+    tax_year: int = TAX_YEAR
+    province: str
+    taxable_income: float
+    federal_tax: float
+    provincial_tax: float
+    total_tax: float
+    average_rate: float
+    marginal_rate: float
+    rrsp_deduction: float = 0.0
+    rrsp_tax_savings: float = pydantic.Field(
+        default=0.0, description="Tax saved by the RRSP deduction."
+    )
+
+
+def tax_breakdown(
+    income: float, province: str, rrsp_deduction: float = 0.0
+) -> TaxBreakdown:
+    """Tax, average and marginal rates on income after an RRSP deduction."""
+    code = normalize_province(province)
+    taxable = max(income - rrsp_deduction, 0.0)
+    federal = float(federal_tax(taxable))
+    provincial = float(provincial_tax(taxable, code))
+    total = federal + provincial
+    return TaxBreakdown(
+        province=code,
+        taxable_income=round(taxable, 2),
+        federal_tax=round(federal, 2),
+        provincial_tax=round(provincial, 2),
+        total_tax=round(total, 2),
+        average_rate=round(total / taxable, 4) if taxable else 0.0,
+        marginal_rate=round(float(marginal_rate(taxable, code)), 4),
+        rrsp_deduction=rrsp_deduction,
+        rrsp_tax_savings=round(float(total_tax(income, code)) - total, 2),
+    )
+
+
+class ContributionPlan(pydantic.BaseModel):
+    """Best split of one year's savings, and the alternatives it beat."""
+
+    province: str
+    annual_savings: float
+    rrsp_contribution: float
+    spousal_rrsp_contribution: float
+    tfsa_contribution: float = pydantic.Field(
+        description="Includes the reinvested RRSP tax refund, up to TFSA room."
+    )
+    non_registered: float
+    tax_refund: float
+    marginal_rate_now: float
+    marginal_rate_retirement: float
+    spouse_marginal_rate_retirement: float | None = None
+    after_tax_value: float = pydantic.Field(
+        description="After-tax value at retirement, in today's dollars."
+    )
+    all_tfsa_value: float
+    all_rrsp_value: float
+    scenarios_evaluated: int
+    notes: list[str]
+    elapsed_ms: float
+
+
+def _withdrawal_tax(
+    balance: np.ndarray, base_income: float, years: int, province: str
+) -> np.ndarray:
+    """Extra tax from drawing a balance down evenly on top of other income."""
+    base_tax = total_tax(base_income, province)
+    return years * (total_tax(base_income + balance / years, province) - base_tax)
+
+
+def optimize_contributions(
+    income: float,
+    province: str,
+    annual_savings: float,
+    rrsp_room: float,
+    tfsa_room: float,
+    years_to_retirement: int,
+    retirement_income: float,
+    spouse_retirement_income: float | None = None,
+    real_return: float = 0.04,
+    withdrawal_years: int = 25,
+    grid_size: int = 101,
+) -> ContributionPlan:
+    """Search RRSP / spousal RRSP / TFSA splits for the best after-tax outcome.
+
+    Every scenario gives a share of savings to the RRSP (capped by room), and
+    a share of that to a spousal RRSP when `spouse_retirement_income` is set.
+    The rest goes to the TFSA, then to a non-registered account whose returns
+    are taxed yearly at the current marginal rate. The RRSP refund is
+    reinvested the same way. At retirement, RRSPs are drawn down evenly over
+    `withdrawal_years` on top of each spouse's other income. All scenarios are
+    evaluated together as arrays.
+    """
+    started = time.perf_counter()
+    code = normalize_province(province)
+    shares = np.linspace(0.0, 1.0, grid_size)
+    spousal_shares = shares if spouse_retirement_income is not None else np.zeros(1)
+    rrsp_share, spousal_share = (
+        a.ravel() for a in np.meshgrid(shares, spousal_shares, indexing="ij")
+    )
+
+    rrsp = np.minimum(rrsp_share * annual_savings, rrsp_room)
+    refund = total_tax(income, code) - total_tax(income - rrsp, code)
+    tfsa = np.minimum(annual_savings - rrsp + refund, tfsa_room)
+    non_registered = annual_savings - rrsp + refund - tfsa
+
+    growth = (1.0 + real_return) ** years_to_retirement
+    taxable_growth = (
+        1.0 + real_return * (1.0 - marginal_rate(income - rrsp, code))
+    ) ** years_to_retirement
+    own = rrsp * (1.0 - spousal_share) * growth
+    spousal = rrsp * spousal_share * growth
+    value = (
+        tfsa * growth
+        + own
+        + spousal
+        + non_registered * taxable_growth
+        - _withdrawal_tax(own, retirement_income, withdrawal_years, code)
+    )
+    if spouse_retirement_income is not None:
+        value -= _withdrawal_tax(
+            spousal, spouse_retirement_income, withdrawal_years, code
+        )
+
+    best = int(np.argmax(value))
+    all_tfsa = int(np.argmin(rrsp_share + spousal_share))
+    all_rrsp = int(np.argmax(rrsp_share - spousal_share))
+
+    notes = []
+    if spousal[best] > 0:
+        notes.append(
+            f"Spousal RRSP contributions made in {TAX_YEAR} are taxed in the "
+            f"contributor's hands if withdrawn before January 1, "
+            f"{TAX_YEAR + SPOUSAL_ATTRIBUTION_YEARS}."
+        )
+    if non_registered[best] > 0:
+        notes.append("Savings exceed the available RRSP and TFSA room.")
+
+    return ContributionPlan(
+        province=code,
+        annual_savings=annual_savings,
+        rrsp_contribution=round(float(rrsp[best] * (1 - spousal_share[best])), 2),
+        spousal_rrsp_contribution=round(float(rrsp[best] * spousal_share[best]), 2),
+        tfsa_contribution=round(float(tfsa[best]), 2),
+        non_registered=round(float(non_registered[best]), 2),
+        tax_refund=round(float(refund[best]), 2),
+        marginal_rate_now=round(float(marginal_rate(income, code)), 4),
+        marginal_rate_retirement=round(
+            float(marginal_rate(retirement_income, code)), 4
+        ),
+        spouse_marginal_rate_retirement=(
+            round(float(marginal_rate(spouse_retirement_income, code)), 4)
+            if spouse_retirement_income is not None
+            else None
+        ),
+        after_tax_value=round(float(value[best]), 2),
+        all_tfsa_value=round(float(value[all_tfsa]), 2),
+        all_rrsp_value=round(float(value[all_rrsp]), 2),
+        scenarios_evaluated=len(value),
+        notes=notes,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+    )
+
+
+class CanadianTaxTool:
+    """Exact Canadian tax figures for the agent, instead of LLM arithmetic.
+
+    Parameters
+    ----------
+    profiles : list[ClientProfile], optional
+        Profiles searched by client name. Defaults to the bundled profiles.
+    """
+
+    def __init__(self, profiles: list[ClientProfile] | None = None) -> None:
+        self.profiles = profiles
+        self.logger = logging.getLogger(__name__)
+
+    async def calculate_income_tax(
+        self, income: float, province: str = "ON", rrsp_deduction: float = 0.0
+    ) -> TaxBreakdown | str:
+        """Calculate 2025 federal and provincial income tax and marginal rate.
+
+        Use this for tax owing, average or marginal rates, and the tax saved
+        by an RRSP contribution, instead of computing them yourself.
+
+        Parameters
+        ----------
+        income : float
+            Total taxable income before the RRSP deduction.
+        province : str, optional
+            ON, BC or AB, by default ON.
+        rrsp_deduction : float, optional
+            RRSP contribution deducted this year, by default 0.
+
+        Returns
+        -------
+        TaxBreakdown | str
+            Federal, provincial and total tax with average and marginal rates,
+            or an explanation if the province is not supported.
+        """
+        try:
+            return tax_breakdown(income, province, rrsp_deduction)
+        except ValueError as e:
+            return str(e)
+
+    async def calculate_contribution_room(
+        self,
+        age: int,
+        previous_year_earned_income: float,
+        pension_adjustment: float = 0.0,
+        unused_rrsp_room: float = 0.0,
+        tfsa_contributions_to_date: float = 0.0,
+        tfsa_withdrawals_to_date: float = 0.0,
+        resident_since: int | None = None,
+    ) -> dict[str, float]:
+        """Calculate 2025 RRSP deduction limit and TFSA contribution room.
+
+        Parameters
+        ----------
+        age : int
+            Age at the end of 2025.
+        previous_year_earned_income : float
+            Earned income in 2024, which sets new RRSP room (18%, capped).
+        pension_adjustment : float, optional
+            2024 pension adjustment from employer plans.
+        unused_rrsp_room : float, optional
+            Unused RRSP room carried forward.
+        tfsa_contributions_to_date : float, optional
+            Lifetime TFSA contributions up to the end of 2024.
+        tfsa_withdrawals_to_date : float, optional
+            Lifetime TFSA withdrawals up to the end of 2024.
+        resident_since : int, optional
+            Year the client became a Canadian resident, if after 2009.
+
+        Returns
+        -------
+        dict[str, float]
+            "rrsp_room" and "tfsa_room" for 2025.
+        """
+        return {
+            "rrsp_room": rrsp_deduction_limit(
+                previous_year_earned_income, pension_adjustment, unused_rrsp_room
+            ),
+            "tfsa_room": tfsa_room(
+                age,
+                tfsa_contributions_to_date,
+                tfsa_withdrawals_to_date,
+                resident_since,
+            ),
+        }
+
+    async def optimize_rrsp_tfsa(
+        self,
+        annual_savings: float,
+        rrsp_room: float,
+        tfsa_room: float,
+        income: float | None = None,
+        province: str | None = None,
+        years_to_retirement: int | None = None,
+        retirement_income: float | None = None,
+        spouse_retirement_income: float | None = None,
+        client_name: str | None = None,
+    ) -> ContributionPlan | str:
+        """Find the RRSP / spousal RRSP / TFSA split that maximizes after-tax wealth.
+
+        Thousands of splits are evaluated with exact 2025 tax brackets.
+        Values not given are taken from the client's profile.
+
+        Parameters
+        ----------
+        annual_savings : float
+            Amount to invest this year.
+        rrsp_room : float
+            Available RRSP deduction room.
+        tfsa_room : float
+            Available TFSA contribution room.
+        income : float, optional
+            Contributor's taxable income this year.
+        province : str, optional
+            ON, BC or AB.
+        years_to_retirement : int, optional
+            Years until withdrawals start.
+        retirement_income : float, optional
+            Contributor's other taxable income in retirement (pensions, CPP,
+            OAS). Defaults to 40% of current income.
+        spouse_retirement_income : float, optional
+            Spouse's other taxable income in retirement. Set it to consider
+            spousal RRSP contributions.
+        client_name : str, optional
+            Client name (e.g., "Michael Chen") whose profile supplies defaults.
+
+        Returns
+        -------
+        ContributionPlan | str
+            The best split compared with all-TFSA and all-RRSP, or an
+            explanation if inputs are missing.
+        """
+        if client_name:
+            try:
+                profile = get_client_profile(client_name, self.profiles)
+            except ValueError as e:
+                return str(e)
+            income = income if income is not None else profile.annual_income
+            province = province or profile.state_province
+            if years_to_retirement is None and profile.retirement_age:
+                years_to_retirement = max(profile.retirement_age - profile.age, 0)
+
+        if income is None or province is None or years_to_retirement is None:
+            return "Provide income, province and years_to_retirement, or a client name."
+        try:
+            plan = optimize_contributions(
+                income=income,
+                province=province,
+                annual_savings=annual_savings,
+                rrsp_room=rrsp_room,
+                tfsa_room=tfsa_room,
+                years_to_retirement=years_to_retirement,
+                retirement_income=(
+                    retirement_income if retirement_income is not None else 0.4 * income
+                ),
+                spouse_retirement_income=spouse_retirement_income,
+            )
+        except ValueError as e:
+            return str(e)
+
+        self.logger.info(
+            f"Contribution optimizer: {plan.scenarios_evaluated} scenarios; "
+            f"{plan.elapsed_ms:.1f}ms"
+        )
+        return plan
@@ -0,0 +1,194 @@
+"""Token bucket of API credits shared by every process on a host.
+
+The bucket state lives in a single SQLite row. Each acquisition is one short
+`BEGIN IMMEDIATE` transaction that refills the bucket for the elapsed time and
+reserves the requested credits, letting the balance go negative. A negative
+balance is the queue: the caller sleeps until its credits have been earned,
+so requests from all processes are spaced out in arrival order without any
+polling.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import pydantic
+
+
+class CreditTimeoutError(TimeoutError):
+    """Credits would not become available before the caller's deadline."""
+
+
+class CreditBucketStats(pydantic.BaseModel):
+    """Counters of one bucket instance (i.e. of this process)."""
+
+    acquisitions: int = 0
+    credits: float = 0.0
+    waits: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    deadline_exceeded: int = 0
+
+    @property
+    def mean_wait(self) -> float:
+        """Average time spent queued per acquisition."""
+        return self.total_wait / self.acquisitions if self.acquisitions else 0.0
+
+
+class CreditBucket:
+    """Credit-aware token bucket backed by SQLite.
+
+    Parameters
+    ----------
+    credits_per_minute : float
+        Sustained refill rate, e.g. the plan's per-minute credit limit.
+    capacity : float, optional
+        Largest burst, by default `credits_per_minute`.
+    path : str, optional
+        SQLite file shared by the processes that draw from the bucket. Defaults
+        to an in-memory database, which only limits this process.
+    name : str, optional
+        Row name, so that one file can hold buckets for several APIs.
+    """
+
+    def __init__(
+        self,
+        credits_per_minute: float,
+        capacity: float | None = None,
+        path: str | None = None,
+        name: str = "default",
+    ) -> None:
+        if credits_per_minute <= 0:
+            raise ValueError("credits_per_minute must be positive.")
+        self.rate = credits_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else credits_per_minute
+        self.path = path or ":memory:"
+        self.name = name
+        self.stats = CreditBucketStats()
+        self.logger = logging.getLogger(__name__)
+
+        # Autocommit mode; transactions are opened explicitly below.
+        self._db = sqlite3.connect(
+            self.path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS buckets "
+            "(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "INSERT OR IGNORE INTO buckets VALUES (?, ?, ?)",
+            (self.name, self.capacity, time.time()),
+        )
+
+    def reserve(self, cost: float, max_wait: float | None = None) -> float | None:
+        """Reserve credits and return how long to wait before spending them.
+
+        Parameters
+        ----------
+        cost : float
+            Credits the request will consume.
+        max_wait : float, optional
+            Reserve nothing and return None if the wait would be longer.
+
+        Raises
+        ------
+        ValueError
+            If `cost` exceeds the bucket capacity and could never be served.
+        """
+        if cost > self.capacity:
+            raise ValueError(
+                f"A request costing {cost} credits exceeds the bucket "
+                f"capacity of {self.capacity}."
+            )
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, serializing processes.
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                tokens, updated_at = self._db.execute(
+                    "SELECT tokens, updated_at FROM buckets WHERE name = ?",
+                    (self.name,),
+                ).fetchone()
+                now = time.time()
+                tokens = min(
+                    self.capacity, tokens + max(0.0, now - updated_at) * self.rate
+                )
+                wait = max(0.0, (cost - tokens) / self.rate)
+                if max_wait is not None and wait > max_wait:
+                    self._db.execute("ROLLBACK")
+                    return None
+                self._db.execute(
+                    "UPDATE buckets SET tokens = ?, updated_at = ? WHERE name = ?",
+                    (tokens - cost, now, self.name),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return wait
+
+    def refund(self, cost: float) -> None:
+        """Return reserved credits that were not spent."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE buckets SET tokens = MIN(tokens + ?, ?) WHERE name = ?",
+                (cost, self.capacity, self.name),
+            )
+
+    async def acquire(self, cost: float = 1.0, timeout: float | None = None) -> float:
+        """Wait until `cost` credits are available and consume them.
+
+        Parameters
+        ----------
+        cost : float, optional
+            Credits to consume, by default 1.
+        timeout : float, optional
+            Longest acceptable wait in seconds. Waits forever if None.
+
+        Returns
+        -------
+        float
+            Seconds spent waiting for credits.
+
+        Raises
+        ------
+        CreditTimeoutError
+            If the credits would not be available within `timeout`. Nothing is
+            consumed in that case.
+        """
+        wait = await asyncio.to_thread(self.reserve, cost, timeout)
+        if wait is None:
+            self.stats.deadline_exceeded += 1
+            raise CreditTimeoutError(
+                f"{cost} credits from bucket {self.name!r} not available "
+                f"within {timeout:.1f}s."
+            )
+
+        self.stats.acquisitions += 1
+        self.stats.credits += cost
+        if wait > 0:
+            self.stats.waits += 1
+            self.stats.total_wait += wait
+            self.stats.max_wait = max(self.stats.max_wait, wait)
+            self.logger.debug(f"Waiting {wait:.2f}s for {cost} {self.name} credits")
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.refund(cost)
+                raise
+        return wait
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+
+def default_credit_bucket_path() -> str:
+    """Location shared by every worker on this host unless overridden."""
+    return os.getenv("TWELVEDATA_CREDIT_DB") or os.path.join(
+        tempfile.gettempdir(), "twelve_data_credits.sqlite"
+    )
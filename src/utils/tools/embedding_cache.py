@@ -0,0 +1,355 @@
+"""Two-tier (memory + disk) cache for query embedding vectors.
+
+The disk tier keeps vectors as float16 rows of a memory-mapped file and tracks
+which row belongs to which key in a SQLite index. SQLite's file locking makes
+the store safe to share between several worker processes on one host. The
+async methods of `EmbeddingCache` run disk lookups in a worker thread, since
+SQLite may block while another process holds the lock.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pydantic
+
+from ..caching import LRUCache
+
+
+class EmbeddingCacheStats(pydantic.BaseModel):
+    """Hit/miss counters for the two cache tiers."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    disk_evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served by either tier."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return hits / lookups if lookups else 0.0
+
+
+def embedding_cache_key(model_name: str, text: str) -> str:
+    """Key a text by model and by its whitespace- and case-normalized form."""
+    normalized = " ".join(text.split()).casefold()
+    return hashlib.sha256(f"{model_name}\0{normalized}".encode()).hexdigest()
+
+
+class DiskEmbeddingStore:
+    """Size-bounded on-disk store of float16 vectors shared across processes.
+
+    Rows of `vectors.f16` are allocated as slots; `index.sqlite` maps keys to
+    slots and records last access times so that the least recently used slot
+    is reused once the store is full.
+
+    The number of slots is fixed by the process that creates the store, so
+    that every process sharing it agrees on the file layout. A process
+    configured with other limits uses the recorded capacity and logs a
+    warning; delete the directory to change the capacity.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_entries: int | None = 50_000,
+        max_bytes: int | None = None,
+    ) -> None:
+        if max_entries is None and max_bytes is None:
+            raise ValueError("Set at least one of max_entries or max_bytes.")
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+
+        # Autocommit mode; transactions are opened explicitly below.
+        self._db = sqlite3.connect(
+            os.path.join(cache_dir, "index.sqlite"),
+            timeout=30.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                slot INTEGER UNIQUE NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_access
+                ON entries (last_access);
+            """
+        )
+        self._vectors: np.memmap | None = None
+        self._capacity = 0
+        # The connection is shared by worker threads; each transaction holds it.
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> list[float] | None:
+        """Return the stored vector for key, or None."""
+        with self._lock:
+            if self._open_vectors() is None:
+                return None
+
+            # Hold a shared lock while copying the row so no writer can reuse
+            # the slot.
+            self._db.execute("BEGIN")
+            try:
+                row = self._db.execute(
+                    "SELECT slot FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                vector = (
+                    self._vectors[row[0]].astype(np.float32)
+                    if row is not None and row[0] < self._capacity
+                    else None
+                )
+            finally:
+                self._db.execute("COMMIT")
+
+            if vector is None:
+                return None
+
+            self._db.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            return vector.tolist()
+
+    def put(self, key: str, vector: list[float]) -> bool:
+        """Store a vector, reusing the least recently used slot when full.
+
+        Returns
+        -------
+        bool
+            True if an existing entry was evicted to make room.
+        """
+        with self._lock:
+            vectors = self._open_vectors(dim=len(vector))
+            if vectors is None or vectors.shape[1] != len(vector):
+                self.logger.warning(
+                    f"Not caching vector of dimension {len(vector)} "
+                    f"in {self.cache_dir}."
+                )
+                return False
+
+            evicted = False
+            self._db.execute("BEGIN EXCLUSIVE")
+            try:
+                row = self._db.execute(
+                    "SELECT slot FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    slot = row[0]
+                else:
+                    # Slots are handed out densely, so the next free one follows
+                    # the highest slot in use until the store is full.
+                    (slot,) = self._db.execute(
+                        "SELECT COALESCE(MAX(slot) + 1, 0) FROM entries"
+                    ).fetchone()
+                    if slot >= self._capacity:
+                        (slot,) = self._db.execute(
+                            "SELECT slot FROM entries ORDER BY last_access LIMIT 1"
+                        ).fetchone()
+                        self._db.execute("DELETE FROM entries WHERE slot = ?", (slot,))
+                        evicted = True
+
+                vectors[slot] = np.asarray(vector, dtype=np.float16)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (key, slot, last_access) "
+                    "VALUES (?, ?, ?)",
+                    (key, slot, time.time()),
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+            return evicted
+
+    def __len__(self) -> int:
+        """Return the number of stored vectors."""
+        with self._lock:
+            (num_entries,) = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()
+            return num_entries
+
+    def close(self) -> None:
+        """Flush vectors and close the index."""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+            self._db.close()
+
+    def _open_vectors(self, dim: int | None = None) -> np.memmap | None:
+        """Map the vector file, creating it on first write once dim is known."""
+        if self._vectors is not None:
+            return self._vectors
+
+        path = os.path.join(self.cache_dir, "vectors.f16")
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        if row is None:
+            if dim is None:
+                return None
+            self._db.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('dim', ?)", (dim,)
+            )
+            row = self._db.execute(
+                "SELECT value FROM meta WHERE key = 'dim'"
+            ).fetchone()
+
+        stored_dim = int(row[0])
+        capacity = self._stored_capacity(path, stored_dim)
+        if (
+            not os.path.exists(path)
+            or os.path.getsize(path) < capacity * stored_dim * 2
+        ):
+            # Extending with zeros leaves existing rows untouched.
+            with open(path, "ab") as f:
+                f.truncate(capacity * stored_dim * 2)
+
+        self._capacity = capacity
+        self._vectors = np.memmap(
+            path, dtype=np.float16, mode="r+", shape=(capacity, stored_dim)
+        )
+        return self._vectors
+
+    def _stored_capacity(self, path: str, dim: int) -> int:
+        """Return the slot count of the store, recording it on first use.
+
+        Other processes may hold rows in any slot, so a store is never shrunk
+        or grown to match this process's limits.
+        """
+        configured = self._capacity_for(dim)
+        # Stores created before the capacity was recorded span the whole file.
+        existing = os.path.getsize(path) // (dim * 2) if os.path.exists(path) else 0
+        self._db.execute(
+            "INSERT OR IGNORE INTO meta (key, value) VALUES ('capacity', ?)",
+            (existing or configured,),
+        )
+        (value,) = self._db.execute(
+            "SELECT value FROM meta WHERE key = 'capacity'"
+        ).fetchone()
+        capacity = int(value)
+        if capacity != configured:
+            self.logger.warning(
+                f"{self.cache_dir} holds {capacity} vectors, not the configured "
+                f"{configured}; using the existing capacity."
+            )
+        return capacity
+
+    def _capacity_for(self, dim: int) -> int:
+        """Return the number of slots allowed by the entry and byte limits."""
+        limits = []
+        if self.max_entries is not None:
+            limits.append(self.max_entries)
+        if self.max_bytes is not None:
+            limits.append(self.max_bytes // (dim * 2))
+        return max(1, min(limits))
+
+
+class EmbeddingCache:
+    """In-process LRU in front of an optional shared on-disk store.
+
+    Parameters
+    ----------
+    cache_dir : str, optional, default=None
+        Directory for the on-disk tier. Only the memory tier is used if not set.
+    memory_max_entries : int, optional, default=4096
+        Number of vectors kept in the in-process LRU.
+    disk_max_entries : int, optional, default=50_000
+        Maximum number of vectors in the on-disk tier.
+    disk_max_bytes : int, optional, default=None
+        Maximum size of the on-disk vector file in bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        memory_max_entries: int = 4096,
+        disk_max_entries: int | None = 50_000,
+        disk_max_bytes: int | None = None,
+    ) -> None:
+        self.stats = EmbeddingCacheStats()
+        self._memory: LRUCache[str, list[float]] = LRUCache(memory_max_entries)
+        self._disk = (
+            DiskEmbeddingStore(
+                cache_dir, max_entries=disk_max_entries, max_bytes=disk_max_bytes
+            )
+            if cache_dir
+            else None
+        )
+
+    def get(self, model_name: str, text: str) -> list[float] | None:
+        """Look up the vector of text, promoting disk hits into memory."""
+        key = embedding_cache_key(model_name, text)
+        vector = self._memory.get(key)
+        if vector is not None:
+            self.stats.memory_hits += 1
+            return vector
+
+        if self._disk is not None:
+            vector = self._disk.get(key)
+            if vector is not None:
+                self.stats.disk_hits += 1
+                self._memory.put(key, vector)
+                return vector
+
+        self.stats.misses += 1
+        return None
+
+    def put(self, model_name: str, text: str, vector: list[float]) -> None:
+        """Store the vector of text in both tiers."""
+        key = embedding_cache_key(model_name, text)
+        self._memory.put(key, vector)
+        if self._disk is not None and self._disk.put(key, vector):
+            self.stats.disk_evictions += 1
+
+    async def get_many(
+        self, model_name: str, texts: list[str]
+    ) -> list[list[float] | None]:
+        """Look up several texts; disk lookups run together in a worker thread."""
+        keys = [embedding_cache_key(model_name, text) for text in texts]
+        vectors = [self._memory.get(key) for key in keys]
+        self.stats.memory_hits += sum(v is not None for v in vectors)
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing and self._disk is not None:
+            disk = self._disk
+            found = await asyncio.to_thread(
+                lambda: [disk.get(keys[i]) for i in missing]
+            )
+            for i, vector in zip(missing, found):
+                if vector is not None:
+                    self.stats.disk_hits += 1
+                    self._memory.put(keys[i], vector)
+                    vectors[i] = vector
+
+        self.stats.misses += sum(v is None for v in vectors)
+        return vectors
+
+    async def put_many(
+        self, model_name: str, texts: list[str], vectors: list[list[float]]
+    ) -> None:
+        """Store several vectors; disk writes run in a worker thread."""
+        keys = [embedding_cache_key(model_name, text) for text in texts]
+        for key, vector in zip(keys, vectors):
+            self._memory.put(key, vector)
+        if self._disk is not None:
+            disk = self._disk
+            evicted = await asyncio.to_thread(
+                lambda: [disk.put(key, vector) for key, vector in zip(keys, vectors)]
+            )
+            self.stats.disk_evictions += sum(evicted)
+
+    def close(self) -> None:
+        """Close the on-disk tier."""
+        if self._disk is not None:
+            self._disk.close()
@@ -0,0 +1,167 @@
+"""Async embedding client that micro-batches concurrent requests."""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+
+import openai
+import pydantic
+
+
+class EmbeddingBatchStats(pydantic.BaseModel):
+    """Counters describing how embedding requests were batched."""
+
+    num_requests: int = 0
+    num_batches: int = 0
+    num_failed_batches: int = 0
+    batch_size_counts: Counter[int] = pydantic.Field(default_factory=Counter)
+    total_queue_wait: float = 0.0
+    max_queue_wait: float = 0.0
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Average number of texts per upstream call."""
+        return self.num_requests / self.num_batches if self.num_batches else 0.0
+
+    @property
+    def mean_queue_wait(self) -> float:
+        """Average seconds a request waited before its batch was sent."""
+        return self.total_queue_wait / self.num_requests if self.num_requests else 0.0
+
+
+class _PendingEmbedding:
+    """A text waiting to be embedded and the future to resolve with its vector."""
+
+    __slots__ = ("enqueued_at", "future", "text")
+
+    def __init__(self, text: str, future: "asyncio.Future[list[float]]") -> None:
+        self.text = text
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class AsyncBatchEmbedder:
+    """Gather concurrent embedding requests into batched `embeddings.create` calls.
+
+    Requests arriving within `max_wait_time` seconds of the first pending request
+    are sent upstream together, up to `max_batch_size` texts per call. A batch is
+    flushed early as soon as it is full.
+    """
+
+    def __init__(
+        self,
+        client: openai.AsyncOpenAI,
+        model_name: str,
+        max_batch_size: int = 32,
+        max_wait_time: float = 0.005,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+
+        self.client = client
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_wait_time = max_wait_time
+        self.stats = EmbeddingBatchStats()
+        self.logger = logging.getLogger(__name__)
+
+        self._pending: list[_PendingEmbedding] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task[None]] = set()
+
+    async def embed(self, text: str) -> list[float]:
+        """Embed a single text, sharing the upstream call with concurrent requests.
+
+        Parameters
+        ----------
+        text : str
+            The text to be vectorized.
+
+        Returns
+        -------
+        list[float]
+            The embedding vector for `text`.
+        """
+        return await self._enqueue(text)
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Embed several texts; they are split into batches of `max_batch_size`.
+
+        Parameters
+        ----------
+        texts : list[str]
+            The texts to be vectorized.
+
+        Returns
+        -------
+        list[list[float]]
+            One embedding vector per input text, in input order.
+        """
+        futures = [self._enqueue(text) for text in texts]
+        return list(await asyncio.gather(*futures))
+
+    def _enqueue(self, text: str) -> "asyncio.Future[list[float]]":
+        """Add text to the pending batch and schedule a flush."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[float]] = loop.create_future()
+        self._pending.append(_PendingEmbedding(text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_time, self._flush)
+
+        return future
+
+    def _flush(self) -> None:
+        """Send up to `max_batch_size` pending texts upstream as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size :]
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: list[_PendingEmbedding]) -> None:
+        """Embed one batch and fan the vectors back out to the waiting callers."""
+        sent_at = time.perf_counter()
+        waits = [sent_at - item.enqueued_at for item in batch]
+        self.stats.num_requests += len(batch)
+        self.stats.num_batches += 1
+        self.stats.batch_size_counts[len(batch)] += 1
+        self.stats.total_queue_wait += sum(waits)
+        self.stats.max_queue_wait = max(self.stats.max_queue_wait, *waits)
+
+        try:
+            response = await self.client.embeddings.create(
+                input=[item.text for item in batch], model=self.model_name
+            )
+        except Exception as e:
+            self.stats.num_failed_batches += 1
+            self.logger.error(f"Embedding batch of {len(batch)} failed: {e}")
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        # The API reports each vector's position in the input list.
+        for data in response.data:
+            item = batch[data.index]
+            if not item.future.done():
+                item.future.set_result(data.embedding)
+
+        for item in batch:
+            if not item.future.done():
+                item.future.set_exception(
+                    RuntimeError("Embedding response is missing a vector.")
+                )
+
+        self.logger.debug(
+            f"Embedded batch of {len(batch)}; "
+            f"upstream {time.perf_counter() - sent_at:.3f}s"
+        )
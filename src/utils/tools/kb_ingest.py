@@ -0,0 +1,842 @@
+"""Bulk ingestion of CRA documents into the Weaviate knowledge base.
+
+PDF and HTML files are parsed in a process pool, split into section-aware
+chunks, embedded in large batches and written with Weaviate's batch insert.
+The three stages run concurrently, so embedding starts as soon as the first
+documents are parsed.
+
+With a manifest, a run is incremental: files whose bytes are unchanged are
+not parsed, only new or changed chunks are embedded and written, and chunks
+that no longer exist are deleted. The resulting `ChangeSet` drives targeted
+invalidation of downstream caches.
+
+Usage::
+
+    uv run --env-file .env -m src.utils.tools.kb_ingest --source-dir data/cra \
+        --manifest data/cra/.kb_manifest.json --changes-out changes.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import openai
+import pydantic
+from bs4 import BeautifulSoup
+from dotenv import load_dotenv
+from PyPDF2 import PdfReader
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    ProgressColumn,
+    Task,
+    TextColumn,
+    TimeElapsedColumn,
+)
+from rich.text import Text
+from weaviate import WeaviateAsyncClient
+from weaviate.classes.data import DataObject
+from weaviate.classes.query import Filter
+from weaviate.util import generate_uuid5
+
+from ..env_vars import Configs
+from .embeddings import AsyncBatchEmbedder
+from .kb_schema import TUNING_PROFILES, TuningProfile, ensure_collection
+from .kb_weaviate import get_weaviate_async_client, invalidate_search_cache
+
+
+SUPPORTED_EXTENSIONS = (".pdf", ".html", ".htm")
+
+_WHITESPACE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+class ExtractedDocument(pydantic.BaseModel):
+    """Plain text of one source file, split into titled sections."""
+
+    source: str
+    title: str
+    sections: list[tuple[str | None, str]]
+
+
+class Chunk(pydantic.BaseModel):
+    """A unit of text stored as one Weaviate object."""
+
+    source: str
+    title: str
+    section: str | None
+    section_occurrence: int = pydantic.Field(
+        default=0,
+        description="How many earlier sections of the document share this heading.",
+    )
+    chunk_index: int
+    text: str
+
+    @property
+    def uuid(self) -> str:
+        """Deterministic object ID, so re-ingesting a chunk overwrites it."""
+        return generate_uuid5(
+            f"{self.source}\0{self.section}\0{self.section_occurrence}"
+            f"\0{self.chunk_index}"
+        )
+
+    def properties(self) -> dict[str, Any]:
+        """Return the Weaviate object properties of this chunk."""
+        return {
+            "title": self.title,
+            "section": self.section,
+            "text": self.text,
+            "source": self.source,
+        }
+
+    @property
+    def content_hash(self) -> str:
+        """Hash of everything that is embedded or stored for this chunk."""
+        content = f"{self.title}\0{self.section}\0{self.text}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ChunkRecord(pydantic.BaseModel):
+    """Manifest entry of one stored chunk."""
+
+    content_hash: str
+    title: str
+    section: str | None
+
+
+class DocumentRecord(pydantic.BaseModel):
+    """Manifest entry of one source file, with its chunks keyed by object UUID."""
+
+    file_hash: str
+    chunks: dict[str, ChunkRecord] = pydantic.Field(default_factory=dict)
+
+
+class IngestionManifest(pydantic.BaseModel):
+    """What was last written to a collection, per source file and chunk."""
+
+    collection_name: str
+    embedding_model_name: str
+    max_chunk_chars: int
+    documents: dict[str, DocumentRecord] = pydantic.Field(default_factory=dict)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        collection_name: str,
+        embedding_model_name: str,
+        max_chunk_chars: int,
+    ) -> "IngestionManifest":
+        """Load the manifest at path.
+
+        An empty manifest is returned if the file does not exist or was written
+        for a different collection, embedding model or chunk size, in which
+        case every chunk is re-embedded.
+        """
+        empty = cls(
+            collection_name=collection_name,
+            embedding_model_name=embedding_model_name,
+            max_chunk_chars=max_chunk_chars,
+        )
+        if not os.path.exists(path):
+            return empty
+
+        with open(path, encoding="utf-8") as f:
+            manifest = cls.model_validate_json(f.read())
+        if (
+            manifest.collection_name,
+            manifest.embedding_model_name,
+            manifest.max_chunk_chars,
+        ) != (collection_name, embedding_model_name, max_chunk_chars):
+            logging.getLogger(__name__).warning(
+                f"Manifest {path} was built with different settings; "
+                "re-ingesting everything."
+            )
+            return empty
+        return manifest
+
+    def save(self, path: str) -> None:
+        """Write the manifest atomically."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.model_dump_json(indent=2))
+        os.replace(tmp_path, path)
+
+
+class ChangeSet(pydantic.BaseModel):
+    """Objects and sources changed by an ingestion run."""
+
+    collection_name: str
+    added: list[str] = pydantic.Field(default_factory=list)
+    updated: list[str] = pydantic.Field(default_factory=list)
+    deleted: list[str] = pydantic.Field(default_factory=list)
+    added_sources: list[str] = pydantic.Field(default_factory=list)
+    removed_sources: list[str] = pydantic.Field(default_factory=list)
+    # (title, section) of every updated or deleted chunk.
+    stale_sections: list[tuple[str, str | None]] = pydantic.Field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the run left the collection unchanged."""
+        return not (self.added or self.updated or self.deleted)
+
+    @property
+    def stale_titles(self) -> list[str]:
+        """Titles of documents whose previously stored text changed."""
+        return sorted({title for title, _ in self.stale_sections})
+
+
+class IngestionStats(pydantic.BaseModel):
+    """Throughput of an ingestion run."""
+
+    documents: int = 0
+    unchanged_documents: int = 0
+    failed_documents: int = 0
+    chunks: int = 0
+    unchanged_chunks: int = 0
+    embeddings: int = 0
+    objects_written: int = 0
+    objects_deleted: int = 0
+    failed_objects: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def documents_per_second(self) -> float:
+        """Parsed documents per second of wall time."""
+        return self.documents / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        """Written chunks per second of wall time."""
+        return self.objects_written / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def embeddings_per_second(self) -> float:
+        """Computed embeddings per second of wall time."""
+        return self.embeddings / self.elapsed if self.elapsed else 0.0
+
+
+def _clean(text: str) -> str:
+    """Collapse runs of spaces and blank lines."""
+    text = _WHITESPACE.sub(" ", text)
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def _extract_pdf(path: str) -> ExtractedDocument:
+    """Extract page text, grouping pages under top-level outline entries."""
+    reader = PdfReader(path)
+    metadata_title = reader.metadata.title if reader.metadata else None
+    title = metadata_title or os.path.splitext(os.path.basename(path))[0]
+
+    # Map the first page of each top-level bookmark to its heading.
+    section_starts: dict[int, str] = {}
+    try:
+        for entry in reader.outline:
+            if isinstance(entry, list):
+                continue
+            page_number = reader.get_destination_page_number(entry)
+            section_starts.setdefault(page_number, str(entry.title).strip())
+    except Exception:
+        section_starts = {}
+
+    sections: list[tuple[str | None, str]] = []
+    current_section: str | None = None
+    current_pages: list[str] = []
+    for page_number, page in enumerate(reader.pages):
+        if page_number in section_starts:
+            if current_pages:
+                sections.append((current_section, _clean("\n".join(current_pages))))
+            current_section, current_pages = section_starts[page_number], []
+        current_pages.append(page.extract_text() or "")
+    if current_pages:
+        sections.append((current_section, _clean("\n".join(current_pages))))
+
+    return ExtractedDocument(source=path, title=title, sections=sections)
+
+
+def _extract_html(path: str) -> ExtractedDocument:
+    """Extract text, starting a new section at every h2/h3 heading."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        soup = BeautifulSoup(f.read(), "lxml")
+
+    for tag in soup(["script", "style", "nav", "header", "footer"]):
+        tag.decompose()
+
+    heading = soup.find("h1") or soup.find("title")
+    title = (
+        heading.get_text(strip=True)
+        if heading
+        else os.path.splitext(os.path.basename(path))[0]
+    )
+
+    sections: list[tuple[str | None, str]] = []
+    current_section: str | None = None
+    current_text: list[str] = []
+    body = soup.find("main") or soup.body or soup
+    for element in body.find_all(["h2", "h3", "p", "li", "td"]):
+        if element.name in {"h2", "h3"}:
+            if current_text:
+                sections.append((current_section, _clean("\n\n".join(current_text))))
+            current_section, current_text = element.get_text(" ", strip=True), []
+        elif element.find_parent(["li", "td"]) is None:
+            current_text.append(element.get_text(" ", strip=True))
+    if current_text:
+        sections.append((current_section, _clean("\n\n".join(current_text))))
+
+    return ExtractedDocument(source=path, title=title, sections=sections)
+
+
+def extract_document(path: str) -> ExtractedDocument:
+    """Extract sectioned text from a PDF or HTML file.
+
+    Runs in worker processes, so it only takes and returns picklable values.
+    """
+    if path.lower().endswith(".pdf"):
+        return _extract_pdf(path)
+    return _extract_html(path)
+
+
+def chunk_document(
+    document: ExtractedDocument, max_chars: int = 2000, overlap_chars: int = 200
+) -> list[Chunk]:
+    """Split each section on paragraph boundaries into chunks of <= max_chars.
+
+    Consecutive chunks of a section share up to `overlap_chars` of trailing
+    text so that sentences cut at a boundary remain searchable. Paragraphs
+    longer than `max_chars` are hard-wrapped.
+    """
+    chunks: list[Chunk] = []
+    occurrences: dict[str | None, int] = {}
+    for section, text in document.sections:
+        # Numbered within the section, so that edits elsewhere in the document
+        # leave the chunk's UUID unchanged. Repeated (or missing) headings are
+        # told apart by their occurrence.
+        section_start = len(chunks)
+        occurrence = occurrences.get(section, 0)
+        occurrences[section] = occurrence + 1
+        paragraphs: list[str] = []
+        for raw_paragraph in text.split("\n\n"):
+            paragraph = raw_paragraph.strip()
+            start = 0
+            while len(paragraph) - start > max_chars:
+                paragraphs.append(paragraph[start : start + max_chars])
+                start += max_chars - overlap_chars
+            if paragraph[start:]:
+                paragraphs.append(paragraph[start:])
+
+        current = ""
+        for paragraph in paragraphs:
+            if current and len(current) + len(paragraph) + 2 > max_chars:
+                chunks.append(
+                    Chunk(
+                        source=document.source,
+                        title=document.title,
+                        section=section,
+                        section_occurrence=occurrence,
+                        chunk_index=len(chunks) - section_start,
+                        text=current,
+                    )
+                )
+                tail = current[-overlap_chars:] if overlap_chars else ""
+                current = f"{tail}\n\n{paragraph}" if tail else paragraph
+            else:
+                current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current:
+            chunks.append(
+                Chunk(
+                    source=document.source,
+                    title=document.title,
+                    section=section,
+                    section_occurrence=occurrence,
+                    chunk_index=len(chunks) - section_start,
+                    text=current,
+                )
+            )
+    return chunks
+
+
+def file_hash(path: str) -> str:
+    """Return the SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def find_documents(source_dir: str) -> list[str]:
+    """List supported files under source_dir, recursively and sorted."""
+    paths = []
+    for root, _, files in os.walk(source_dir):
+        paths.extend(
+            os.path.join(root, name)
+            for name in files
+            if name.lower().endswith(SUPPORTED_EXTENSIONS)
+        )
+    return sorted(paths)
+
+
+class _RateColumn(ProgressColumn):
+    """Render the completion rate of a progress task as items per second."""
+
+    def render(self, task: Task) -> Text:
+        """Render the current speed."""
+        speed = task.finished_speed or task.speed
+        return Text(f"{speed:,.1f}/s" if speed else "-/s", style="progress.data.speed")
+
+
+class CRAIngestionPipeline:
+    """Parse, chunk, embed and write documents into a Weaviate collection."""
+
+    def __init__(
+        self,
+        async_client: WeaviateAsyncClient,
+        collection_name: str = "rbc_2_cra_public_documents",
+        embedding_model_name: str = "@cf/baai/bge-m3",
+        embedding_api_key: str | None = None,
+        embedding_base_url: str | None = None,
+        embedding_batch_size: int = 128,
+        max_parse_workers: int | None = None,
+        max_concurrent_batches: int = 4,
+        max_chunk_chars: int = 2000,
+        delete_batch_size: int = 500,
+        profile: str | TuningProfile = "hnsw",
+    ) -> None:
+        self.async_client = async_client
+        self.collection_name = collection_name
+        self.embedding_model_name = embedding_model_name
+        self.embedding_batch_size = embedding_batch_size
+        self.max_parse_workers = max_parse_workers
+        self.max_concurrent_batches = max_concurrent_batches
+        self.max_chunk_chars = max_chunk_chars
+        self.delete_batch_size = delete_batch_size
+        self.profile = profile
+        self.stats = IngestionStats()
+        self.logger = logging.getLogger(__name__)
+
+        self._embedder = AsyncBatchEmbedder(
+            openai.AsyncOpenAI(
+                api_key=embedding_api_key or os.getenv("EMBEDDING_API_KEY"),
+                base_url=embedding_base_url or os.getenv("EMBEDDING_BASE_URL"),
+                max_retries=5,
+            ),
+            model_name=embedding_model_name,
+            max_batch_size=embedding_batch_size,
+        )
+
+    async def run(
+        self, paths: list[str], manifest_path: str | None = None
+    ) -> ChangeSet:
+        """Ingest the given files and report what changed.
+
+        Parameters
+        ----------
+        paths : list[str]
+            Every source file of the collection. With a manifest, sources that
+            were ingested before but are missing from `paths` are deleted.
+        manifest_path : str, optional, default=None
+            Where the manifest of the previous run is read from and the updated
+            manifest is written to. Without it, every chunk is embedded and
+            written, and nothing is deleted.
+
+        Returns
+        -------
+        ChangeSet
+            Added, updated and deleted objects. Throughput is in `self.stats`.
+        """
+        stats = self.stats = IngestionStats()
+        started_at = time.perf_counter()
+        manifest = self._load_manifest(manifest_path)
+        changes = ChangeSet(collection_name=self.collection_name)
+
+        file_hashes = await asyncio.to_thread(
+            lambda: {path: file_hash(path) for path in paths}
+        )
+        to_parse = [
+            path
+            for path in paths
+            if path not in manifest.documents
+            or manifest.documents[path].file_hash != file_hashes[path]
+        ]
+        stats.unchanged_documents = len(paths) - len(to_parse)
+
+        orphans: list[str] = []
+        for source in [s for s in manifest.documents if s not in file_hashes]:
+            changes.removed_sources.append(source)
+            for uuid, record in manifest.documents[source].chunks.items():
+                orphans.append(uuid)
+                changes.stale_sections.append((record.title, record.section))
+
+        # Records of parsed documents; committed to the manifest after writing.
+        parsed: dict[str, DocumentRecord] = {}
+        failed_uuids: set[str] = set()
+        chunk_queue: asyncio.Queue[Chunk | None] = asyncio.Queue(
+            maxsize=self.embedding_batch_size * self.max_concurrent_batches * 2
+        )
+
+        async with self.async_client:
+            collection = await ensure_collection(
+                self.async_client, self.collection_name, self.profile
+            )
+            with Progress(
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                _RateColumn(),
+                TimeElapsedColumn(),
+            ) as progress:
+                parse_task = progress.add_task("Parsing documents", total=len(to_parse))
+                embed_task = progress.add_task("Embedding chunks", total=None)
+                write_task = progress.add_task("Writing objects", total=None)
+
+                writer = asyncio.create_task(
+                    self._write_batches(
+                        collection,
+                        chunk_queue,
+                        failed_uuids=failed_uuids,
+                        progress=progress,
+                        embed_task=embed_task,
+                        write_task=write_task,
+                    )
+                )
+                async for document in self._parse(to_parse):
+                    progress.advance(parse_task)
+                    record, to_write, removed = self._diff_document(
+                        document,
+                        manifest.documents.get(document.source),
+                        file_hashes[document.source],
+                        changes,
+                    )
+                    orphans.extend(removed)
+                    stats.chunks += len(to_write)
+                    progress.update(embed_task, total=stats.chunks)
+                    progress.update(write_task, total=stats.chunks)
+                    for chunk in to_write:
+                        await chunk_queue.put(chunk)
+                    parsed[document.source] = record
+
+                await chunk_queue.put(None)
+                await writer
+
+            changes.deleted = orphans
+            await self._delete(collection, orphans)
+
+        stats.elapsed = time.perf_counter() - started_at
+        if manifest_path is not None:
+            self._update_manifest(
+                manifest, parsed, changes.removed_sources, failed_uuids
+            )
+            manifest.save(manifest_path)
+
+        changes.stale_sections = sorted(
+            set(changes.stale_sections), key=lambda pair: (pair[0], pair[1] or "")
+        )
+        self._invalidate_caches(changes)
+        self.logger.info(
+            f"Ingested {stats.documents} documents / {stats.objects_written} chunks "
+            f"in {stats.elapsed:.1f}s ({stats.documents_per_second:.2f} docs/s, "
+            f"{stats.chunks_per_second:.1f} chunks/s, "
+            f"{stats.embeddings_per_second:.1f} embeddings/s); "
+            f"{stats.unchanged_documents} documents and {stats.unchanged_chunks} "
+            f"chunks unchanged, {stats.objects_deleted} objects deleted"
+        )
+        return changes
+
+    def _load_manifest(self, manifest_path: str | None) -> IngestionManifest:
+        """Load the previous manifest, or start an empty one."""
+        if manifest_path is not None:
+            return IngestionManifest.load(
+                manifest_path,
+                self.collection_name,
+                self.embedding_model_name,
+                self.max_chunk_chars,
+            )
+        return IngestionManifest(
+            collection_name=self.collection_name,
+            embedding_model_name=self.embedding_model_name,
+            max_chunk_chars=self.max_chunk_chars,
+        )
+
+    def _diff_document(
+        self,
+        document: ExtractedDocument,
+        previous: DocumentRecord | None,
+        document_hash: str,
+        changes: ChangeSet,
+    ) -> tuple[DocumentRecord, list[Chunk], list[str]]:
+        """Compare a parsed document with its manifest entry.
+
+        Returns
+        -------
+        tuple[DocumentRecord, list[Chunk], list[str]]
+            The new manifest entry, the chunks to embed and write, and the
+            UUIDs of previously stored chunks that no longer exist.
+        """
+        if previous is None:
+            changes.added_sources.append(document.source)
+        previous_chunks = previous.chunks if previous else {}
+
+        record = DocumentRecord(file_hash=document_hash)
+        to_write: list[Chunk] = []
+        for chunk in chunk_document(document, self.max_chunk_chars):
+            uuid = chunk.uuid
+            record.chunks[uuid] = ChunkRecord(
+                content_hash=chunk.content_hash,
+                title=chunk.title,
+                section=chunk.section,
+            )
+            old = previous_chunks.get(uuid)
+            if old is not None and old.content_hash == chunk.content_hash:
+                self.stats.unchanged_chunks += 1
+                continue
+            if old is None:
+                changes.added.append(uuid)
+            else:
+                changes.updated.append(uuid)
+                changes.stale_sections.append((old.title, old.section))
+            to_write.append(chunk)
+
+        removed = []
+        for uuid, old in previous_chunks.items():
+            if uuid not in record.chunks:
+                removed.append(uuid)
+                changes.stale_sections.append((old.title, old.section))
+        return record, to_write, removed
+
+    def _update_manifest(
+        self,
+        manifest: IngestionManifest,
+        parsed: dict[str, DocumentRecord],
+        removed_sources: list[str],
+        failed_uuids: set[str],
+    ) -> None:
+        """Record what was written, so that failed chunks are retried next run."""
+        for source in removed_sources:
+            manifest.documents.pop(source, None)
+
+        for source, record in parsed.items():
+            failed = failed_uuids.intersection(record.chunks)
+            if failed:
+                previous = manifest.documents.get(source)
+                previous_chunks = previous.chunks if previous else {}
+                for uuid in failed:
+                    if uuid in previous_chunks:
+                        record.chunks[uuid] = previous_chunks[uuid]
+                    else:
+                        del record.chunks[uuid]
+                # Forces the file to be parsed again on the next run.
+                record.file_hash = ""
+            manifest.documents[source] = record
+
+    def _invalidate_caches(self, changes: ChangeSet) -> None:
+        """Drop cached search results made stale by the change set.
+
+        New chunks may rank for any query, so additions clear every cached
+        result of the collection. Updates and deletions only drop results
+        that cite one of the affected sections.
+        """
+        if changes.is_empty:
+            return
+        if changes.added:
+            invalidate_search_cache(self.collection_name)
+        else:
+            invalidate_search_cache(
+                self.collection_name, sections=changes.stale_sections
+            )
+
+    async def _parse(self, paths: list[str]):
+        """Yield extracted documents as worker processes finish them."""
+        if not paths:
+            return
+
+        loop = asyncio.get_running_loop()
+        # Spawned workers avoid forking a process that already runs threads.
+        with ProcessPoolExecutor(
+            max_workers=self.max_parse_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+
+            async def parse_one(path: str) -> ExtractedDocument | None:
+                try:
+                    return await loop.run_in_executor(pool, extract_document, path)
+                except Exception as e:
+                    self.stats.failed_documents += 1
+                    self.logger.error(f"Failed to parse {path}: {e}")
+                    return None
+
+            for finished in asyncio.as_completed([parse_one(p) for p in paths]):
+                document = await finished
+                if document is not None:
+                    self.stats.documents += 1
+                    yield document
+
+    async def _write_batches(
+        self,
+        collection: Any,
+        chunk_queue: "asyncio.Queue[Chunk | None]",
+        **progress_kwargs: Any,
+    ) -> None:
+        """Group queued chunks into batches and write a few batches at a time.
+
+        A None item marks the end of the queue.
+        """
+        batch: list[Chunk] = []
+        pending: set[asyncio.Task[None]] = set()
+        while True:
+            chunk = await chunk_queue.get()
+            if chunk is not None:
+                batch.append(chunk)
+            if batch and (chunk is None or len(batch) >= self.embedding_batch_size):
+                if len(pending) >= self.max_concurrent_batches:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        task.result()
+                pending.add(
+                    asyncio.create_task(
+                        self._embed_and_write(collection, batch, **progress_kwargs)
+                    )
+                )
+                batch = []
+            if chunk is None:
+                break
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def _embed_and_write(
+        self,
+        collection: Any,
+        batch: list[Chunk],
+        *,
+        failed_uuids: set[str],
+        progress: Progress,
+        embed_task: Any,
+        write_task: Any,
+    ) -> None:
+        """Embed one batch of chunks and upsert it with a single batch request."""
+        stats = self.stats
+        try:
+            vectors = await self._embedder.embed_many([chunk.text for chunk in batch])
+        except Exception as e:
+            self.logger.error(f"Failed to embed {len(batch)} chunks: {e}")
+            stats.failed_objects += len(batch)
+            failed_uuids.update(chunk.uuid for chunk in batch)
+            progress.advance(embed_task, len(batch))
+            progress.advance(write_task, len(batch))
+            return
+        stats.embeddings += len(vectors)
+        progress.advance(embed_task, len(vectors))
+
+        # Objects with an existing UUID are replaced, which makes this an upsert.
+        try:
+            response = await collection.data.insert_many(
+                [
+                    DataObject(
+                        properties=chunk.properties(), uuid=chunk.uuid, vector=vector
+                    )
+                    for chunk, vector in zip(batch, vectors)
+                ]
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to write {len(batch)} chunks: {e}")
+            stats.failed_objects += len(batch)
+            failed_uuids.update(chunk.uuid for chunk in batch)
+            progress.advance(write_task, len(batch))
+            return
+        errors = response.errors or {}
+        if errors:
+            self.logger.error(
+                f"{len(errors)} objects failed to insert, e.g. "
+                f"{next(iter(errors.values()))}"
+            )
+            failed_uuids.update(batch[index].uuid for index in errors)
+        stats.failed_objects += len(errors)
+        stats.objects_written += len(batch) - len(errors)
+        progress.advance(write_task, len(batch))
+
+    async def _delete(self, collection: Any, uuids: list[str]) -> None:
+        """Delete objects by UUID in batches."""
+        for start in range(0, len(uuids), self.delete_batch_size):
+            batch = uuids[start : start + self.delete_batch_size]
+            result = await collection.data.delete_many(
+                where=Filter.by_id().contains_any(batch)
+            )
+            self.stats.objects_deleted += result.successful
+            if result.failed:
+                self.logger.error(f"Failed to delete {result.failed} objects.")
+
+
+async def main() -> None:
+    """Ingest a directory of CRA PDFs and HTML pages into Weaviate."""
+    parser = argparse.ArgumentParser(
+        description="Ingest CRA PDF/HTML documents into the Weaviate knowledge base."
+    )
+    parser.add_argument(
+        "--source-dir", required=True, help="Directory of PDF/HTML files"
+    )
+    parser.add_argument(
+        "--collection",
+        default="rbc_2_cra_public_documents",
+        help="Weaviate collection name",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=128, help="Chunks per embedding request"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Parser worker processes"
+    )
+    parser.add_argument(
+        "--profile",
+        default="hnsw",
+        choices=sorted(TUNING_PROFILES),
+        help="Tuning profile used if the collection has to be created",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        help="Manifest of the previous run; enables incremental refresh",
+    )
+    parser.add_argument(
+        "--changes-out", default=None, help="Write the change set to this JSON file"
+    )
+    args = parser.parse_args()
+
+    load_dotenv(verbose=True)
+    configs = Configs.from_env_var()
+    async_client = get_weaviate_async_client(
+        http_host=configs.weaviate_http_host,
+        http_port=configs.weaviate_http_port,
+        http_secure=configs.weaviate_http_secure,
+        grpc_host=configs.weaviate_grpc_host,
+        grpc_port=configs.weaviate_grpc_port,
+        grpc_secure=configs.weaviate_grpc_secure,
+        api_key=configs.weaviate_api_key,
+    )
+    pipeline = CRAIngestionPipeline(
+        async_client,
+        collection_name=args.collection,
+        embedding_batch_size=args.batch_size,
+        max_parse_workers=args.workers,
+        profile=args.profile,
+    )
+    changes = await pipeline.run(
+        find_documents(args.source_dir), manifest_path=args.manifest
+    )
+    print(pipeline.stats.model_dump_json(indent=2))
+    if args.changes_out:
+        with open(args.changes_out, "w", encoding="utf-8") as f:
+            f.write(changes.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,455 @@
+"""In-process hybrid search over a local snapshot of a Weaviate collection.
+
+A snapshot directory holds:
+
+- `vectors.npy`: float32 matrix of L2-normalized object vectors, loaded with
+  `mmap_mode="r"` so several processes share the pages;
+- `documents.jsonl`: one `{"title", "section", "text"}` object per row;
+- `manifest.json`: collection name, embedding model and matrix shape.
+
+Usage::
+
+    python -m src.utils.tools.kb_local --output data/kb_snapshot
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import math
+import os
+import re
+import time
+from collections import Counter
+from typing import Any
+
+import numpy as np
+import openai
+import pydantic
+from dotenv import load_dotenv
+from weaviate import WeaviateAsyncClient
+
+from ..env_vars import Configs
+from .embedding_cache import EmbeddingCache
+from .embeddings import AsyncBatchEmbedder
+from .kb_weaviate import (
+    AsyncWeaviateKnowledgeBase,
+    MultiSearchResults,
+    SearchResults,
+    _fuse_rankings,
+    _SearchResult,
+    get_weaviate_async_client,
+)
+from .weaviate_connection import WeaviateConnectionManager
+
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class SnapshotManifest(pydantic.BaseModel):
+    """Metadata stored alongside a collection snapshot."""
+
+    collection_name: str
+    embedding_model_name: str
+    num_objects: int
+    dim: int
+    created_at: float
+
+
+def _tokenize(text: str) -> list[str]:
+    """Lower-case word tokens, matching Weaviate's default `word` tokenization."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class _BM25Index:
+    """Inverted index scoring all documents for a query with vectorized BM25."""
+
+    def __init__(self, documents: list[str], k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.num_docs = len(documents)
+
+        postings: dict[str, tuple[list[int], list[int]]] = {}
+        lengths = np.zeros(self.num_docs, dtype=np.float32)
+        for doc_id, document in enumerate(documents):
+            tokens = _tokenize(document)
+            lengths[doc_id] = len(tokens)
+            for token, count in Counter(tokens).items():
+                doc_ids, counts = postings.setdefault(token, ([], []))
+                doc_ids.append(doc_id)
+                counts.append(count)
+
+        avg_length = float(lengths.mean()) if self.num_docs else 0.0
+        self._length_norm = k1 * (1 - b + b * lengths / max(avg_length, 1e-9))
+        self._postings = {
+            token: (np.asarray(doc_ids, dtype=np.int32), np.asarray(counts, np.float32))
+            for token, (doc_ids, counts) in postings.items()
+        }
+
+    def score(self, query: str) -> np.ndarray:
+        """Return the BM25 score of every document for query."""
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        for token in set(_tokenize(query)):
+            if token not in self._postings:
+                continue
+            doc_ids, counts = self._postings[token]
+            idf = math.log(
+                1 + (self.num_docs - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5)
+            )
+            scores[doc_ids] += (
+                idf * counts * (self.k1 + 1) / (counts + self._length_norm[doc_ids])
+            )
+        return scores
+
+
+def _min_max(scores: np.ndarray) -> np.ndarray:
+    """Scale scores to [0, 1], as Weaviate's relative score fusion does."""
+    low, high = float(scores.min()), float(scores.max())
+    if high - low < 1e-12:
+        return np.zeros_like(scores)
+    return (scores - low) / (high - low)
+
+
+class LocalVectorKnowledgeBase:
+    """Weaviate-free knowledge base answering hybrid queries in-process.
+
+    Exposes the same `search_knowledgebase` tool signature and `SearchResults`
+    type as `AsyncWeaviateKnowledgeBase`, so the two are interchangeable.
+    Scores fuse cosine similarity and BM25 with `alpha * vector + (1 - alpha) *
+    keyword` after min-max scaling, mirroring Weaviate's default hybrid fusion.
+    """
+
+    def __init__(
+        self,
+        snapshot_dir: str,
+        num_results: int = 5,
+        snippet_length: int = 1000,
+        alpha: float = 0.75,
+        embedding_api_key: str | None = None,
+        embedding_base_url: str | None = None,
+        embedder: AsyncBatchEmbedder | None = None,
+        embedding_cache: EmbeddingCache | None = None,
+    ) -> None:
+        self.snapshot_dir = snapshot_dir
+        self.num_results = num_results
+        self.snippet_length = snippet_length
+        self.alpha = alpha
+        self.logger = logging.getLogger(__name__)
+
+        with open(os.path.join(snapshot_dir, "manifest.json"), encoding="utf-8") as f:
+            self.manifest = SnapshotManifest.model_validate_json(f.read())
+        with open(os.path.join(snapshot_dir, "documents.jsonl"), encoding="utf-8") as f:
+            self.documents: list[dict[str, Any]] = [json.loads(line) for line in f]
+        self.vectors: np.ndarray = np.load(
+            os.path.join(snapshot_dir, "vectors.npy"), mmap_mode="r"
+        )
+        self._bm25 = _BM25Index(
+            [
+                " ".join(
+                    [doc.get("title") or "", doc.get("section") or "", doc["text"]]
+                )
+                for doc in self.documents
+            ]
+        )
+
+        self.embedding_model_name = self.manifest.embedding_model_name
+        self._embedder = (
+            embedder
+            if embedder is not None
+            else AsyncBatchEmbedder(
+                openai.AsyncOpenAI(
+                    api_key=embedding_api_key or os.getenv("EMBEDDING_API_KEY"),
+                    base_url=embedding_base_url or os.getenv("EMBEDDING_BASE_URL"),
+                    max_retries=5,
+                ),
+                model_name=self.embedding_model_name,
+            )
+        )
+        self.embedding_cache = (
+            embedding_cache
+            if embedding_cache is not None
+            else EmbeddingCache(cache_dir=os.getenv("EMBEDDING_CACHE_DIR"))
+        )
+
+    async def search_knowledgebase(self, keyword: str) -> SearchResults:
+        """Search knowledge base.
+
+        Parameters
+        ----------
+        keyword : str
+            The search keyword to query the knowledge base.
+
+        Returns
+        -------
+        SearchResults
+            A list of search results. Each result contains source and highlight.
+            If no results are found, returns an empty list.
+        """
+        (vector,) = await self._vectorize_many([keyword])
+        return self._search(keyword, vector)
+
+    async def search_knowledgebase_many(
+        self, keywords: list[str]
+    ) -> MultiSearchResults:
+        """Search knowledge base for several keywords with one embedding batch.
+
+        Parameters
+        ----------
+        keywords : list[str]
+            The search keywords to query the knowledge base.
+
+        Returns
+        -------
+        MultiSearchResults
+            Hits for each keyword, in input order, and the merged ranking.
+        """
+        vectors = await self._vectorize_many(keywords)
+        per_query = [
+            self._search(keyword, vector) for keyword, vector in zip(keywords, vectors)
+        ]
+        return MultiSearchResults(
+            queries=list(keywords),
+            per_query=per_query,
+            merged=_fuse_rankings(per_query),
+        )
+
+    def _search(self, keyword: str, vector: list[float]) -> SearchResults:
+        """Rank every document by fused vector and keyword score."""
+        if not self.documents:
+            return []
+
+        query = np.asarray(vector, dtype=np.float32)
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+        vector_scores = self.vectors @ query
+        keyword_scores = self._bm25.score(keyword)
+        fused = self.alpha * _min_max(vector_scores) + (1 - self.alpha) * _min_max(
+            keyword_scores
+        )
+
+        limit = min(self.num_results, len(fused))
+        top = np.argpartition(-fused, limit - 1)[:limit]
+        top = top[np.argsort(-fused[top], kind="stable")]
+        self.logger.info(f"Query: {keyword}; Returned matches: {len(top)}")
+
+        return [
+            _SearchResult.model_validate(
+                {
+                    "_source": {
+                        "title": self.documents[i].get("title") or "",
+                        "section": self.documents[i].get("section"),
+                    },
+                    "highlight": {
+                        "text": [self.documents[i]["text"][: self.snippet_length]]
+                    },
+                }
+            )
+            for i in top
+        ]
+
+    async def _vectorize_many(self, texts: list[str]) -> list[list[float]]:
+        """Vectorize texts through the embedding cache and batching client."""
+        vectors = await self.embedding_cache.get_many(self.embedding_model_name, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = await self._embedder.embed_many([texts[i] for i in missing])
+            await self.embedding_cache.put_many(
+                self.embedding_model_name, [texts[i] for i in missing], embedded
+            )
+            for i, vector in zip(missing, embedded):
+                vectors[i] = vector
+        return vectors  # type: ignore
+
+
+def write_snapshot(
+    snapshot_dir: str,
+    documents: list[dict[str, Any]],
+    vectors: np.ndarray,
+    collection_name: str,
+    embedding_model_name: str,
+) -> SnapshotManifest:
+    """Write documents and their vectors in the local snapshot layout.
+
+    Parameters
+    ----------
+    snapshot_dir : str
+        Output directory; created if missing.
+    documents : list[dict[str, Any]]
+        One `{"title", "section", "text"}` mapping per row of `vectors`.
+    vectors : np.ndarray
+        Matrix of shape (len(documents), dim). Rows are L2-normalized on write.
+    collection_name : str
+        Name of the source collection, recorded in the manifest.
+    embedding_model_name : str
+        Model that produced the vectors; queries are embedded with it too.
+
+    Returns
+    -------
+    SnapshotManifest
+        The manifest written to `manifest.json`.
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    matrix = np.asarray(vectors, dtype=np.float32).reshape(len(documents), -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.save(
+        os.path.join(snapshot_dir, "vectors.npy"), matrix / np.maximum(norms, 1e-12)
+    )
+
+    with open(
+        os.path.join(snapshot_dir, "documents.jsonl"), "w", encoding="utf-8"
+    ) as f:
+        for document in documents:
+            f.write(json.dumps(document, ensure_ascii=False) + "\n")
+
+    manifest = SnapshotManifest(
+        collection_name=collection_name,
+        embedding_model_name=embedding_model_name,
+        num_objects=len(documents),
+        dim=matrix.shape[1],
+        created_at=time.time(),
+    )
+    with open(os.path.join(snapshot_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        f.write(manifest.model_dump_json(indent=2))
+    return manifest
+
+
+async def snapshot_collection(
+    async_client: WeaviateAsyncClient,
+    collection_name: str,
+    snapshot_dir: str,
+    embedding_model_name: str = "@cf/baai/bge-m3",
+) -> SnapshotManifest:
+    """Copy text, title, section and vectors of a collection to a local snapshot.
+
+    Objects are read with Weaviate's cursor-based iterator, so the whole
+    collection is paged through without offset limits.
+    """
+    documents: list[dict[str, Any]] = []
+    rows: list[list[float]] = []
+    async with async_client:
+        collection = async_client.collections.get(collection_name)
+        async for obj in collection.iterator(
+            include_vector=True, return_properties=["title", "section", "text"]
+        ):
+            vector = obj.vector.get("default") if obj.vector else None
+            if not vector:
+                continue
+            documents.append(
+                {
+                    "title": obj.properties.get("title", ""),
+                    "section": obj.properties.get("section"),
+                    "text": obj.properties.get("text", ""),
+                }
+            )
+            rows.append(vector)  # type: ignore
+
+    return write_snapshot(
+        snapshot_dir,
+        documents,
+        np.asarray(rows, dtype=np.float32),
+        collection_name=collection_name,
+        embedding_model_name=embedding_model_name,
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _shared_weaviate_connection(
+    *,
+    http_host: str | None,
+    http_port: int | None,
+    http_secure: bool,
+    grpc_host: str | None,
+    grpc_port: int | None,
+    grpc_secure: bool,
+    api_key: str | None,
+) -> WeaviateConnectionManager:
+    """One connection, and health probe, per Weaviate instance for the process."""
+    return WeaviateConnectionManager(
+        get_weaviate_async_client(
+            http_host=http_host,
+            http_port=http_port,
+            http_secure=http_secure,
+            grpc_host=grpc_host,
+            grpc_port=grpc_port,
+            grpc_secure=grpc_secure,
+            api_key=api_key,
+        )
+    )
+
+
+def create_knowledge_base(
+    configs: Configs,
+    collection_name: str = "rbc_2_cra_public_documents",
+) -> AsyncWeaviateKnowledgeBase | LocalVectorKnowledgeBase:
+    """Create the knowledge base backend selected by `configs.kb_backend`.
+
+    Parameters
+    ----------
+    configs : Configs
+        Env var configs. `kb_backend` is "weaviate" (default) or "local"; the
+        local backend reads the snapshot in `kb_snapshot_dir`.
+    collection_name : str, optional, default="rbc_2_cra_public_documents"
+        The Weaviate collection to query.
+
+    Returns
+    -------
+    AsyncWeaviateKnowledgeBase | LocalVectorKnowledgeBase
+        A knowledge base exposing `search_knowledgebase`.
+    """
+    if configs.kb_backend == "local":
+        if not configs.kb_snapshot_dir:
+            raise ValueError("KB_SNAPSHOT_DIR is required when KB_BACKEND=local.")
+        return LocalVectorKnowledgeBase(configs.kb_snapshot_dir)
+
+    if configs.kb_backend != "weaviate":
+        raise ValueError(
+            f"Unknown KB_BACKEND: {configs.kb_backend}. Supported: weaviate, local"
+        )
+
+    # Agents are rebuilt often (e.g. per UI session); they share one connection.
+    connection = _shared_weaviate_connection(
+        http_host=configs.weaviate_http_host,
+        http_port=configs.weaviate_http_port,
+        http_secure=configs.weaviate_http_secure,
+        grpc_host=configs.weaviate_grpc_host,
+        grpc_port=configs.weaviate_grpc_port,
+        grpc_secure=configs.weaviate_grpc_secure,
+        api_key=configs.weaviate_api_key,
+    )
+    return AsyncWeaviateKnowledgeBase(
+        connection.async_client,
+        collection_name=collection_name,
+        connection=connection,
+    )
+
+
+async def main() -> None:
+    """Snapshot a Weaviate collection to a local directory."""
+    parser = argparse.ArgumentParser(
+        description="Snapshot a Weaviate collection for LocalVectorKnowledgeBase."
+    )
+    parser.add_argument("--output", "-o", required=True, help="Snapshot directory")
+    parser.add_argument(
+        "--collection",
+        default="rbc_2_cra_public_documents",
+        help="Weaviate collection name",
+    )
+    args = parser.parse_args()
+
+    load_dotenv(verbose=True)
+    configs = Configs.from_env_var()
+    async_client = get_weaviate_async_client(
+        http_host=configs.weaviate_http_host,
+        http_port=configs.weaviate_http_port,
+        http_secure=configs.weaviate_http_secure,
+        grpc_host=configs.weaviate_grpc_host,
+        grpc_port=configs.weaviate_grpc_port,
+        grpc_secure=configs.weaviate_grpc_secure,
+        api_key=configs.weaviate_api_key,
+    )
+    manifest = await snapshot_collection(async_client, args.collection, args.output)
+    print(manifest.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
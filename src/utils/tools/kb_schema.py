@@ -0,0 +1,450 @@
+"""Schema and vector index tuning profiles for the knowledge base collection.
+
+Each profile fixes the HNSW graph parameters and the vector compression used
+by a collection. Larger `ef`/`max_connections` trade memory and latency for
+recall; product (PQ) and binary (BQ) quantization shrink the in-memory vector
+cache at some cost in recall.
+
+Usage::
+
+    # Create an empty collection with a profile
+    uv run --env-file .env -m src.utils.tools.kb_schema create --profile pq
+
+    # Compare profiles on the stored query set
+    uv run --env-file .env -m src.utils.tools.kb_schema benchmark \
+        --queries data/benchmark/kb_queries.jsonl --profiles hnsw pq bq
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Literal
+
+import numpy as np
+import pydantic
+from dotenv import load_dotenv
+from weaviate import WeaviateAsyncClient
+from weaviate.classes.config import Configure, DataType, Property
+from weaviate.classes.data import DataObject
+
+from ..async_utils import HedgePolicy
+from ..caching import AsyncTTLCache
+from ..env_vars import Configs
+from .kb_weaviate import (
+    AsyncWeaviateKnowledgeBase,
+    SearchResults,
+    get_weaviate_async_client,
+)
+from .weaviate_connection import WeaviateConnectionManager
+
+
+logger = logging.getLogger(__name__)
+
+
+class TuningProfile(pydantic.BaseModel):
+    """Vector index configuration of a collection."""
+
+    name: str
+    description: str
+    index_type: Literal["hnsw", "flat"] = "hnsw"
+    ef: int | None = None
+    ef_construction: int | None = None
+    max_connections: int | None = None
+    quantizer: Literal["pq", "bq"] | None = None
+    # PQ only; None lets Weaviate derive segments from the vector dimension.
+    pq_segments: int | None = None
+    # BQ only; number of candidates re-scored with the uncompressed vectors.
+    rescore_limit: int | None = None
+
+
+TUNING_PROFILES: dict[str, TuningProfile] = {
+    profile.name: profile
+    for profile in [
+        TuningProfile(
+            name="exact",
+            description="Brute-force search; the recall reference. Small corpora only.",
+            index_type="flat",
+        ),
+        TuningProfile(
+            name="hnsw",
+            description="Uncompressed HNSW with Weaviate's default graph settings.",
+            ef_construction=128,
+            max_connections=32,
+        ),
+        TuningProfile(
+            name="high_recall",
+            description="Denser graph and wider search for recall-sensitive use.",
+            ef=256,
+            ef_construction=256,
+            max_connections=64,
+        ),
+        TuningProfile(
+            name="pq",
+            description="Product quantization; ~4-8x less vector memory.",
+            ef=128,
+            ef_construction=128,
+            max_connections=32,
+            quantizer="pq",
+        ),
+        TuningProfile(
+            name="bq",
+            description="Binary quantization with re-scoring; ~32x less vector memory.",
+            ef=128,
+            ef_construction=128,
+            max_connections=32,
+            quantizer="bq",
+            rescore_limit=200,
+        ),
+    ]
+}
+
+
+def get_tuning_profile(name: str) -> TuningProfile:
+    """Look up a tuning profile by name.
+
+    Raises
+    ------
+    ValueError
+        If no profile has this name.
+    """
+    try:
+        return TUNING_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown tuning profile {name!r}; "
+            f"expected one of {sorted(TUNING_PROFILES)}."
+        ) from None
+
+
+def vector_index_config(profile: TuningProfile):
+    """Translate a tuning profile into a Weaviate vector index config."""
+    if profile.quantizer == "pq":
+        quantizer = Configure.VectorIndex.Quantizer.pq(segments=profile.pq_segments)
+    elif profile.quantizer == "bq":
+        quantizer = Configure.VectorIndex.Quantizer.bq(
+            rescore_limit=profile.rescore_limit
+        )
+    else:
+        quantizer = None
+
+    if profile.index_type == "flat":
+        return Configure.VectorIndex.flat(quantizer=quantizer)
+    return Configure.VectorIndex.hnsw(
+        ef=profile.ef,
+        ef_construction=profile.ef_construction,
+        max_connections=profile.max_connections,
+        quantizer=quantizer,
+    )
+
+
+def collection_properties() -> list[Property]:
+    """Properties of a knowledge base collection."""
+    return [
+        Property(name="title", data_type=DataType.TEXT),
+        Property(name="section", data_type=DataType.TEXT),
+        Property(name="text", data_type=DataType.TEXT),
+        Property(name="source", data_type=DataType.TEXT, skip_vectorization=True),
+    ]
+
+
+async def create_collection(
+    async_client: WeaviateAsyncClient,
+    collection_name: str,
+    profile: str | TuningProfile = "hnsw",
+    overwrite: bool = False,
+):
+    """Create a knowledge base collection with self-provided vectors.
+
+    Parameters
+    ----------
+    async_client : WeaviateAsyncClient
+        A connected client.
+    collection_name : str
+        Name of the collection to create.
+    profile : str | TuningProfile, optional, default="hnsw"
+        Tuning profile, or the name of one in `TUNING_PROFILES`.
+    overwrite : bool, optional, default=False
+        Delete an existing collection of the same name first.
+    """
+    if isinstance(profile, str):
+        profile = get_tuning_profile(profile)
+
+    if overwrite and await async_client.collections.exists(collection_name):
+        await async_client.collections.delete(collection_name)
+
+    logger.info(f"Creating collection {collection_name} ({profile.name} profile).")
+    return await async_client.collections.create(
+        collection_name,
+        vectorizer_config=Configure.Vectorizer.none(),
+        vector_index_config=vector_index_config(profile),
+        properties=collection_properties(),
+    )
+
+
+async def ensure_collection(
+    async_client: WeaviateAsyncClient,
+    collection_name: str,
+    profile: str | TuningProfile = "hnsw",
+):
+    """Return the collection, creating it with the given profile if missing."""
+    if await async_client.collections.exists(collection_name):
+        return async_client.collections.get(collection_name)
+    return await create_collection(async_client, collection_name, profile)
+
+
+async def copy_collection(
+    async_client: WeaviateAsyncClient,
+    source_name: str,
+    target_name: str,
+    batch_size: int = 500,
+) -> int:
+    """Copy objects and their vectors between collections without re-embedding.
+
+    Returns
+    -------
+    int
+        The number of objects copied.
+
+    Raises
+    ------
+    RuntimeError
+        If any object fails to insert, since a partial copy would skew
+        benchmarks run against the target.
+    """
+    source = async_client.collections.get(source_name)
+    target = async_client.collections.get(target_name)
+
+    async def insert(batch: list[DataObject]) -> int:
+        response = await target.data.insert_many(batch)
+        if response.errors:
+            raise RuntimeError(
+                f"{len(response.errors)} of {len(batch)} objects failed to copy "
+                f"into {target_name}, e.g. {next(iter(response.errors.values()))}"
+            )
+        return len(batch)
+
+    batch: list[DataObject] = []
+    num_copied = 0
+    async for obj in source.iterator(include_vector=True):
+        batch.append(
+            DataObject(
+                properties=obj.properties,
+                uuid=obj.uuid,
+                vector=obj.vector.get("default") if obj.vector else None,
+            )
+        )
+        if len(batch) >= batch_size:
+            num_copied += await insert(batch)
+            batch = []
+    if batch:
+        num_copied += await insert(batch)
+    return num_copied
+
+
+class ProfileBenchmark(pydantic.BaseModel):
+    """Search quality and latency of one tuning profile."""
+
+    profile: str
+    collection_name: str
+    num_queries: int
+    k: int
+    recall_at_k: float
+    p50_latency_ms: float
+    p95_latency_ms: float
+    mean_latency_ms: float
+
+
+def load_queries(path: str) -> list[str]:
+    """Read the "query" field of every line of a JSONL file."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["query"] for line in f if line.strip()]
+
+
+def _result_key(hit) -> tuple[str, str | None, str]:
+    """Identify a search hit independently of the collection it came from."""
+    return (hit.source.title, hit.source.section, "".join(hit.highlight.text))
+
+
+def recall_at_k(results: SearchResults, reference: SearchResults, k: int) -> float:
+    """Fraction of the reference top-k that also appears in the top-k results."""
+    expected = {_result_key(hit) for hit in reference[:k]}
+    if not expected:
+        return 1.0
+    found = {_result_key(hit) for hit in results[:k]}
+    return len(expected & found) / len(expected)
+
+
+async def _run_queries(
+    knowledge_base: AsyncWeaviateKnowledgeBase, queries: list[str], repeats: int
+) -> tuple[list[SearchResults], list[float]]:
+    """Search every query; return the results and per-call latencies (ms)."""
+    # Warm-up pass: fills the embedding cache and the server's caches, so the
+    # measured latency is that of the vector/keyword search alone.
+    results = [await knowledge_base.search_knowledgebase(q) for q in queries]
+
+    latencies: list[float] = []
+    for _ in range(repeats):
+        for query in queries:
+            started_at = time.perf_counter()
+            await knowledge_base.search_knowledgebase(query)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+    return results, latencies
+
+
+async def benchmark_profiles(
+    async_client: WeaviateAsyncClient,
+    source_collection: str,
+    queries: list[str],
+    profiles: list[str],
+    reference_profile: str = "exact",
+    k: int = 5,
+    repeats: int = 3,
+    keep_collections: bool = False,
+) -> list[ProfileBenchmark]:
+    """Measure recall@k and latency of `search_knowledgebase` per profile.
+
+    The source collection is copied, vectors included, into one collection per
+    profile named `<source_collection>_bench_<profile>`. Recall is measured
+    against the results of `reference_profile`, by default exact search.
+    Result caching and request hedging are disabled so that every measured
+    call reaches Weaviate exactly once.
+    """
+    connection = WeaviateConnectionManager(async_client)
+    client = await connection.get_client()
+    profile_names = [reference_profile] + [
+        p for p in profiles if p != reference_profile
+    ]
+
+    collections: dict[str, str] = {}
+    for name in profile_names:
+        collection_name = f"{source_collection}_bench_{name}"
+        await create_collection(client, collection_name, name, overwrite=True)
+        num_copied = await copy_collection(client, source_collection, collection_name)
+        logger.info(f"Copied {num_copied} objects into {collection_name}.")
+        collections[name] = collection_name
+
+    benchmarks: list[ProfileBenchmark] = []
+    reference: list[SearchResults] = []
+    try:
+        for name in profile_names:
+            knowledge_base = AsyncWeaviateKnowledgeBase(
+                client,
+                collection_name=collections[name],
+                num_results=k,
+                result_cache=AsyncTTLCache(max_entries=1, ttl=0.0),
+                hedge_policy=HedgePolicy(max_extra_load=0.0),
+                connection=connection,
+            )
+            results, latencies = await _run_queries(knowledge_base, queries, repeats)
+            if name == reference_profile:
+                reference = results
+            benchmarks.append(
+                ProfileBenchmark(
+                    profile=name,
+                    collection_name=collections[name],
+                    num_queries=len(queries),
+                    k=k,
+                    recall_at_k=float(
+                        np.mean(
+                            [
+                                recall_at_k(r, ref, k)
+                                for r, ref in zip(results, reference)
+                            ]
+                        )
+                    ),
+                    p50_latency_ms=float(np.percentile(latencies, 50)),
+                    p95_latency_ms=float(np.percentile(latencies, 95)),
+                    mean_latency_ms=float(np.mean(latencies)),
+                )
+            )
+    finally:
+        if not keep_collections:
+            for collection_name in collections.values():
+                await client.collections.delete(collection_name)
+        await connection.close()
+
+    return benchmarks
+
+
+async def main() -> None:
+    """Create collections with tuning profiles or benchmark the profiles."""
+    parser = argparse.ArgumentParser(
+        description="Manage the knowledge base collection schema."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = subparsers.add_parser("create", help="Create a collection")
+    create_parser.add_argument("--collection", default="rbc_2_cra_public_documents")
+    create_parser.add_argument(
+        "--profile", default="hnsw", choices=sorted(TUNING_PROFILES)
+    )
+    create_parser.add_argument(
+        "--overwrite", action="store_true", help="Drop an existing collection first"
+    )
+
+    bench_parser = subparsers.add_parser(
+        "benchmark", help="Compare recall@k and latency of tuning profiles"
+    )
+    bench_parser.add_argument("--collection", default="rbc_2_cra_public_documents")
+    bench_parser.add_argument(
+        "--queries", default="data/benchmark/kb_queries.jsonl", help="JSONL query set"
+    )
+    bench_parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=["hnsw", "pq", "bq"],
+        choices=sorted(TUNING_PROFILES),
+    )
+    bench_parser.add_argument(
+        "--reference", default="exact", choices=sorted(TUNING_PROFILES)
+    )
+    bench_parser.add_argument("-k", type=int, default=5)
+    bench_parser.add_argument("--repeats", type=int, default=3)
+    bench_parser.add_argument(
+        "--keep-collections",
+        action="store_true",
+        help="Keep the per-profile collections after the benchmark",
+    )
+    args = parser.parse_args()
+
+    load_dotenv(verbose=True)
+    configs = Configs.from_env_var()
+    async_client = get_weaviate_async_client(
+        http_host=configs.weaviate_http_host,
+        http_port=configs.weaviate_http_port,
+        http_secure=configs.weaviate_http_secure,
+        grpc_host=configs.weaviate_grpc_host,
+        grpc_port=configs.weaviate_grpc_port,
+        grpc_secure=configs.weaviate_grpc_secure,
+        api_key=configs.weaviate_api_key,
+    )
+
+    if args.command == "create":
+        async with async_client:
+            await create_collection(
+                async_client, args.collection, args.profile, overwrite=args.overwrite
+            )
+        return
+
+    benchmarks = await benchmark_profiles(
+        async_client,
+        args.collection,
+        load_queries(args.queries),
+        profiles=args.profiles,
+        reference_profile=args.reference,
+        k=args.k,
+        repeats=args.repeats,
+        keep_collections=args.keep_collections,
+    )
+    print(f"{'profile':<12} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for result in benchmarks:
+        print(
+            f"{result.profile:<12} {result.recall_at_k:>9.3f} "
+            f"{result.p50_latency_ms:>8.1f} {result.p95_latency_ms:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
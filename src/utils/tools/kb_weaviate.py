@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import os
+from typing import Any, Iterable
 
 import backoff
 import openai
@@ -11,7 +12,16 @@ import weaviate
 from weaviate import WeaviateAsyncClient
 from weaviate.config import AdditionalConfig
 
-from ..async_utils import rate_limited
+from ..async_utils import (
+    AdaptiveConcurrencyLimiter,
+    HedgePolicy,
+    hedged,
+    rate_limited,
+)
+from ..caching import AsyncTTLCache
+from .embedding_cache import EmbeddingCache
+from .embeddings import AsyncBatchEmbedder, EmbeddingBatchStats
+from .weaviate_connection import CONNECTION_ERRORS, WeaviateConnectionManager
 
 
 class _Source(pydantic.BaseModel):
@@ -37,6 +47,75 @@ class _SearchResult(pydantic.BaseModel):
 SearchResults = list[_SearchResult]
 
 
+class MultiSearchResults(pydantic.BaseModel):
+    """Results of several knowledge base queries run as one batch."""
+
+    queries: list[str]
+    per_query: list[SearchResults]
+    merged: SearchResults
+    failed_queries: list[str] = pydantic.Field(default_factory=list)
+
+
+# (collection name, collection version, normalized keyword, num_results,
+# snippet_length)
+_ResultCacheKey = tuple[str, int, str, int, int]
+
+# Shared by every knowledge base instance in the process so that identical
+# queries from the ReAct tool, reference generation and the search demo hit
+# the same entries.
+_shared_result_cache: AsyncTTLCache[_ResultCacheKey, SearchResults] = AsyncTTLCache(
+    max_entries=1024, ttl=300.0
+)
+_collection_versions: dict[str, int] = {}
+
+
+def _normalize_query(keyword: str) -> str:
+    """Collapse whitespace and case so that trivial variants share a cache key."""
+    return " ".join(keyword.split()).casefold()
+
+
+def invalidate_search_cache(
+    collection_name: str,
+    result_cache: AsyncTTLCache[_ResultCacheKey, SearchResults] | None = None,
+    sections: Iterable[tuple[str, str | None]] | None = None,
+) -> int:
+    """Drop cached search results of a collection, e.g. after re-ingestion.
+
+    Parameters
+    ----------
+    collection_name : str
+        Name of the Weaviate collection whose contents changed.
+    result_cache : AsyncTTLCache, optional, default=None
+        The cache to invalidate. Defaults to the process-wide result cache.
+    sections : Iterable[tuple[str, str | None]], optional, default=None
+        (title, section) pairs whose chunks were updated or deleted. When given,
+        only cached results citing one of them are dropped; other entries stay
+        until their TTL expires. By default every entry of the collection is
+        dropped.
+
+    Returns
+    -------
+    int
+        The number of cached result lists dropped.
+    """
+    if result_cache is None:
+        result_cache = _shared_result_cache
+
+    if sections is not None:
+        stale = set(sections)
+        return result_cache.invalidate(
+            lambda key: key[0] == collection_name,
+            value_predicate=lambda results: any(
+                (hit.source.title, hit.source.section) in stale for hit in results
+            ),
+        )
+
+    _collection_versions[collection_name] = (
+        _collection_versions.get(collection_name, 0) + 1
+    )
+    return result_cache.invalidate(lambda key: key[0] == collection_name)
+
+
 class AsyncWeaviateKnowledgeBase:
     """Configurable search tools for Weaviate knowledge base."""
 
@@ -50,23 +129,69 @@ class AsyncWeaviateKnowledgeBase:
         embedding_model_name: str = "@cf/baai/bge-m3",
         embedding_api_key: str | None = None,
         embedding_base_url: str | None = None,
+        embedding_max_batch_size: int = 32,
+        embedding_max_wait_time: float = 0.005,
+        embedding_cache: EmbeddingCache | None = None,
+        result_cache: AsyncTTLCache[_ResultCacheKey, SearchResults] | None = None,
+        connection: WeaviateConnectionManager | None = None,
+        concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
+        hedge_policy: HedgePolicy | None = None,
     ) -> None:
         self.async_client = async_client
+        self.connection = (
+            connection
+            if connection is not None
+            else WeaviateConnectionManager(async_client)
+        )
         self.collection_name = collection_name
         self.num_results = num_results
         self.snippet_length = snippet_length
         self.logger = logging.getLogger(__name__)
-        self.semaphore = asyncio.Semaphore(max_concurrency)
+        # `max_concurrency` is the starting point; the limiter adapts it to
+        # Weaviate's latency and errors.
+        self.limiter = (
+            concurrency_limiter
+            if concurrency_limiter is not None
+            else AdaptiveConcurrencyLimiter(
+                initial_limit=max_concurrency,
+                max_limit=max(16, max_concurrency),
+                name=f"weaviate:{collection_name}",
+            )
+        )
+        self.hedge_policy = (
+            hedge_policy
+            if hedge_policy is not None
+            else HedgePolicy(max_extra_load=0.1, name=f"weaviate:{collection_name}")
+        )
 
         self.embedding_model_name = embedding_model_name
         self.embedding_api_key = embedding_api_key
         self.embedding_base_url = embedding_base_url
 
-        self._embed_client = openai.OpenAI(
+        self._embed_client = openai.AsyncOpenAI(
             api_key=self.embedding_api_key or os.getenv("EMBEDDING_API_KEY"),
             base_url=self.embedding_base_url or os.getenv("EMBEDDING_BASE_URL"),
             max_retries=5,
         )
+        self._embedder = AsyncBatchEmbedder(
+            self._embed_client,
+            model_name=self.embedding_model_name,
+            max_batch_size=embedding_max_batch_size,
+            max_wait_time=embedding_max_wait_time,
+        )
+        self.embedding_cache = (
+            embedding_cache
+            if embedding_cache is not None
+            else EmbeddingCache(cache_dir=os.getenv("EMBEDDING_CACHE_DIR"))
+        )
+        self.result_cache = (
+            result_cache if result_cache is not None else _shared_result_cache
+        )
+
+    @property
+    def embedding_stats(self) -> EmbeddingBatchStats:
+        """Batch size and queue wait counters of the embedding client."""
+        return self._embedder.stats
 
     @backoff.on_exception(backoff.expo, exception=asyncio.CancelledError)  # type: ignore
     async def search_knowledgebase(self, keyword: str) -> SearchResults:
@@ -89,18 +214,88 @@ class AsyncWeaviateKnowledgeBase:
             If Weaviate is not ready to accept requests (HTTP 503).
 
         """
-        async with self.async_client:
-            if not await self.async_client.is_ready():
-                raise Exception("Weaviate is not ready to accept requests (HTTP 503).")
+        results = await self.result_cache.get_or_compute(
+            self._cache_key(keyword), lambda: self._search_uncached(keyword)
+        )
+        return list(results)
 
-            collection = self.async_client.collections.get(self.collection_name)
-            vector = self._vectorize(keyword)
-            response = await rate_limited(
-                lambda: collection.query.hybrid(
-                    keyword, vector=vector, limit=self.num_results
-                ),
-                semaphore=self.semaphore,
-            )
+    async def search_knowledgebase_many(
+        self, keywords: list[str]
+    ) -> MultiSearchResults:
+        """Search knowledge base for several keywords in one round-trip.
+
+        All keywords are embedded in a single batch and the hybrid queries run
+        concurrently. Chunks returned by more than one query appear once in
+        the merged list, which is ranked by reciprocal rank fusion.
+
+        Parameters
+        ----------
+        keywords : list[str]
+            The search keywords to query the knowledge base.
+
+        Returns
+        -------
+        MultiSearchResults
+            Hits for each keyword, in input order, and the merged ranking.
+            Keywords whose search failed have empty hit lists and are listed
+            in `failed_queries`.
+        """
+        uncached = [
+            keyword
+            for keyword in dict.fromkeys(keywords)
+            if self._cache_key(keyword) not in self.result_cache
+        ]
+        try:
+            await self._vectorize_many(uncached)
+        except Exception as e:
+            # Each search below retries embedding its own keyword.
+            self.logger.error(f"Batch embedding of {len(uncached)} queries failed: {e}")
+
+        outcomes = await asyncio.gather(
+            *[self.search_knowledgebase(keyword) for keyword in keywords],
+            return_exceptions=True,
+        )
+
+        per_query: list[SearchResults] = []
+        failed_queries: list[str] = []
+        for keyword, outcome in zip(keywords, outcomes):
+            if isinstance(outcome, BaseException):
+                self.logger.error(f"Error searching for '{keyword}': {outcome}")
+                failed_queries.append(keyword)
+                per_query.append([])
+            else:
+                per_query.append(outcome)
+
+        return MultiSearchResults(
+            queries=list(keywords),
+            per_query=per_query,
+            merged=_fuse_rankings(per_query),
+            failed_queries=failed_queries,
+        )
+
+    def invalidate_cache(self) -> int:
+        """Drop cached search results for this collection.
+
+        Returns
+        -------
+        int
+            The number of cached result lists dropped.
+        """
+        return invalidate_search_cache(self.collection_name, self.result_cache)
+
+    async def close(self) -> None:
+        """Stop the health probe and close the shared Weaviate connection."""
+        await self.connection.close()
+
+    async def _search_uncached(self, keyword: str) -> SearchResults:
+        """Run the hybrid query, reconnecting once if the connection dropped."""
+        vector = await self._vectorize(keyword)
+        try:
+            response = await self._hybrid_query(keyword, vector)
+        except CONNECTION_ERRORS as e:
+            self.logger.warning(f"Weaviate connection lost ({e}); retrying once.")
+            self.connection.mark_unhealthy()
+            response = await self._hybrid_query(keyword, vector)
 
         self.logger.info(f"Query: {keyword}; Returned matches: {len(response.objects)}")
 
@@ -119,8 +314,38 @@ class AsyncWeaviateKnowledgeBase:
 
         return [_SearchResult.model_validate(_hit) for _hit in hits]
 
-    def _vectorize(self, text: str) -> list[float]:
-        """Vectorize text using the embedding client.
+    def _cache_key(self, keyword: str) -> _ResultCacheKey:
+        """Key of the result cache entry for keyword."""
+        return (
+            self.collection_name,
+            _collection_versions.get(self.collection_name, 0),
+            _normalize_query(keyword),
+            self.num_results,
+            self.snippet_length,
+        )
+
+    async def _hybrid_query(self, keyword: str, vector: list[float]) -> Any:
+        """Run one hybrid query over the shared connection.
+
+        A slow query is hedged with a duplicate; the first response wins.
+        """
+        client = await self.connection.get_client()
+        collection = client.collections.get(self.collection_name)
+        return await hedged(
+            lambda: rate_limited(
+                lambda: collection.query.hybrid(
+                    keyword, vector=vector, limit=self.num_results
+                ),
+                semaphore=self.limiter,
+            ),
+            self.hedge_policy,
+        )
+
+    async def _vectorize(self, text: str) -> list[float]:
+        """Vectorize text using the embedding cache and batching client.
+
+        Cache misses from concurrent calls are coalesced into a single
+        `embeddings.create` request.
 
         Parameters
         ----------
@@ -132,10 +357,46 @@ class AsyncWeaviateKnowledgeBase:
         list[float]
             A list of floats representing the vectorized text.
         """
-        response = self._embed_client.embeddings.create(
-            input=text, model=self.embedding_model_name
+        (vector,) = await self.embedding_cache.get_many(
+            self.embedding_model_name, [text]
         )
-        return response.data[0].embedding
+        if vector is None:
+            vector = await self._embedder.embed(text)
+            await self.embedding_cache.put_many(
+                self.embedding_model_name, [text], [vector]
+            )
+        return vector
+
+    async def _vectorize_many(self, texts: list[str]) -> list[list[float]]:
+        """Vectorize several texts, embedding all cache misses in one batch."""
+        vectors = await self.embedding_cache.get_many(self.embedding_model_name, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = await self._embedder.embed_many([texts[i] for i in missing])
+            await self.embedding_cache.put_many(
+                self.embedding_model_name, [texts[i] for i in missing], embedded
+            )
+            for i, vector in zip(missing, embedded):
+                vectors[i] = vector
+        return vectors  # type: ignore
+
+
+def _fuse_rankings(rankings: list[SearchResults], k: int = 60) -> SearchResults:
+    """Merge ranked hit lists with reciprocal rank fusion, deduplicating chunks.
+
+    A chunk is identified by its title, section and snippet text; its fused
+    score is the sum of `1 / (k + rank)` over every list that returned it.
+    """
+    scores: dict[tuple[str, str | None, tuple[str, ...]], float] = {}
+    hits: dict[tuple[str, str | None, tuple[str, ...]], _SearchResult] = {}
+    for ranking in rankings:
+        for rank, hit in enumerate(ranking, 1):
+            key = (hit.source.title, hit.source.section, tuple(hit.highlight.text))
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            hits.setdefault(key, hit)
+
+    # sorted() is stable, so ties keep first-seen order.
+    return [hits[key] for key in sorted(scores, key=lambda key: -scores[key])]
 
 
 def get_weaviate_async_client(
@@ -208,4 +469,4 @@ def get_weaviate_async_client(
         headers=headers,
         additional_config=additional_config,
         skip_init_checks=skip_init_checks,
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,282 @@
+"""Columnar price series and vectorized technical analytics.
+
+Every indicator is computed with whole-array NumPy operations (cumulative sums,
+running maxima and a blocked closed-form EMA), so thousands of bars take
+microseconds and the agent receives a compact `TimeSeriesSummary` instead of
+raw rows.
+"""
+
+import math
+
+import numpy as np
+import pyarrow as pa
+import pydantic
+
+from .timeseries_store import PRICE_COLUMNS, bars_to_table
+
+
+# Bars per year, used to annualize returns and volatility.
+PERIODS_PER_YEAR = {
+    "1min": 252 * 390,
+    "5min": 252 * 78,
+    "15min": 252 * 26,
+    "30min": 252 * 13,
+    "45min": 252 * 390 / 45,
+    "1h": 252 * 6.5,
+    "2h": 252 * 6.5 / 2,
+    "4h": 252 * 6.5 / 4,
+    "5h": 252 * 6.5 / 5,
+    "1day": 252,
+    "1week": 52,
+    "1month": 12,
+}
+
+
+class TimeSeries(pydantic.BaseModel):
+    """OHLC bars as parallel arrays, oldest first."""
+
+    model_config = pydantic.ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    symbol: str
+    interval: str
+    datetime: np.ndarray  # datetime64[s]
+    open: np.ndarray  # float64
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+    def __len__(self) -> int:
+        """Return the number of bars."""
+        return len(self.close)
+
+    @classmethod
+    def from_table(cls, symbol: str, interval: str, table: pa.Table) -> "TimeSeries":
+        """Build from a stored Arrow table, without copying when possible."""
+        columns = {
+            name: table[name].combine_chunks().to_numpy(zero_copy_only=False)
+            for name in ("datetime", *PRICE_COLUMNS)
+        }
+        columns["datetime"] = columns["datetime"].astype("datetime64[s]")
+        return cls(symbol=symbol, interval=interval, **columns)
+
+    @classmethod
+    def from_bars(
+        cls, symbol: str, interval: str, values: list[dict[str, str]]
+    ) -> "TimeSeries":
+        """Build from Twelve Data bars (strings, newest first)."""
+        return cls.from_table(symbol, interval, bars_to_table(values))
+
+
+def simple_returns(prices: np.ndarray) -> np.ndarray:
+    """Period-over-period returns; one element shorter than prices."""
+    return prices[1:] / prices[:-1] - 1.0
+
+
+def log_returns(prices: np.ndarray) -> np.ndarray:
+    """Period-over-period log returns; one element shorter than prices."""
+    return np.diff(np.log(prices))
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Compute the simple moving average; the first `window - 1` elements are NaN."""
+    out = np.full(len(values), np.nan)
+    if window <= len(values):
+        sums = np.cumsum(np.concatenate(([0.0], values)))
+        out[window - 1 :] = (sums[window:] - sums[:-window]) / window
+    return out
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Compute the rolling sample standard deviation, NaN for the first bars.
+
+    Values are centred on their mean before accumulating squares, which keeps
+    the cumulative-sum formula accurate for price-level inputs.
+    """
+    out = np.full(len(values), np.nan)
+    if 1 < window <= len(values):
+        centred = values - values.mean()
+        sums = np.cumsum(np.concatenate(([0.0], centred)))
+        squares = np.cumsum(np.concatenate(([0.0], centred**2)))
+        window_sum = sums[window:] - sums[:-window]
+        window_squares = squares[window:] - squares[:-window]
+        variance = (window_squares - window_sum**2 / window) / (window - 1)
+        out[window - 1 :] = np.sqrt(np.maximum(variance, 0.0))
+    return out
+
+
+def rolling_volatility(
+    returns: np.ndarray, window: int, periods_per_year: float = 252
+) -> np.ndarray:
+    """Annualized rolling volatility of returns."""
+    return rolling_std(returns, window) * math.sqrt(periods_per_year)
+
+
+def ewm(values: np.ndarray, alpha: float, initial: float | None = None) -> np.ndarray:
+    """Exponentially weighted mean, y[t] = alpha * x[t] + (1 - alpha) * y[t-1].
+
+    Within a block of m values the recurrence has the closed form
+    y[j] = b^(j+1) * y[-1] + alpha * b^j * cumsum(x[k] / b^k), with b = 1 - alpha.
+    Blocks are sized so that b^-k stays below 1e8, which bounds the rounding
+    error while leaving only a short Python loop over blocks.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Input series.
+    alpha : float
+        Smoothing factor in (0, 1].
+    initial : float, optional, default=None
+        Value of y[-1]. Defaults to values[0], so that y[0] == values[0].
+    """
+    out = np.empty(len(values))
+    if len(values) == 0:
+        return out
+
+    beta = 1.0 - alpha
+    if beta == 0.0:
+        out[:] = values
+        return out
+    block = max(1, int(math.log(1e8) / -math.log(beta)))
+    powers = beta ** np.arange(min(block, len(values)))
+
+    previous = values[0] if initial is None else initial
+    for start in range(0, len(values), block):
+        segment = values[start : start + block]
+        p = powers[: len(segment)]
+        out[start : start + len(segment)] = beta * p * previous + alpha * p * np.cumsum(
+            segment / p
+        )
+        previous = out[start + len(segment) - 1]
+    return out
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average with alpha = 2 / (span + 1)."""
+    return ewm(values, 2.0 / (span + 1))
+
+
+def rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder's relative strength index; the first `period` elements are NaN."""
+    out = np.full(len(prices), np.nan)
+    if len(prices) <= period:
+        return out
+
+    changes = np.diff(prices)
+    gains = np.maximum(changes, 0.0)
+    losses = np.maximum(-changes, 0.0)
+    # Wilder seeds the averages with a simple mean over the first period.
+    avg_gain = ewm(gains[period:], 1.0 / period, initial=gains[:period].mean())
+    avg_loss = ewm(losses[period:], 1.0 / period, initial=losses[:period].mean())
+    avg_gain = np.concatenate(([gains[:period].mean()], avg_gain))
+    avg_loss = np.concatenate(([losses[:period].mean()], avg_loss))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative_strength = avg_gain / avg_loss
+        values = 100.0 - 100.0 / (1.0 + relative_strength)
+    # No losses in the window: RSI is 100 (or undefined when flat; use 50).
+    values = np.where(avg_loss == 0.0, np.where(avg_gain == 0.0, 50.0, 100.0), values)
+    out[period:] = values
+    return out
+
+
+def max_drawdown(prices: np.ndarray) -> tuple[float, int, int]:
+    """Largest peak-to-trough decline.
+
+    Returns
+    -------
+    tuple[float, int, int]
+        The drawdown as a negative fraction, and the peak and trough indices.
+    """
+    if len(prices) == 0:
+        return 0.0, 0, 0
+    running_max = np.maximum.accumulate(prices)
+    drawdowns = prices / running_max - 1.0
+    trough = int(np.argmin(drawdowns))
+    peak = int(np.argmax(prices[: trough + 1]))
+    return float(drawdowns[trough]), peak, trough
+
+
+class TimeSeriesSummary(pydantic.BaseModel):
+    """Compact description of a price series for the agent."""
+
+    symbol: str
+    interval: str
+    num_bars: int
+    start: str
+    end: str
+    last_close: float
+    total_return: float
+    annualized_return: float | None
+    annualized_volatility: float | None
+    recent_volatility: float | None = pydantic.Field(
+        description="Annualized volatility over the last `window` bars."
+    )
+    max_drawdown: float
+    max_drawdown_peak: str
+    max_drawdown_trough: str
+    period_high: float
+    period_low: float
+    sma: dict[int, float | None]
+    ema: dict[int, float | None]
+    rsi_14: float | None
+
+
+def _last(values: np.ndarray) -> float | None:
+    """Return the last element rounded for display, or None if NaN/empty."""
+    if len(values) == 0 or np.isnan(values[-1]):
+        return None
+    return round(float(values[-1]), 4)
+
+
+def summarize(
+    series: TimeSeries,
+    window: int = 20,
+    sma_windows: tuple[int, ...] = (20, 50, 200),
+    ema_spans: tuple[int, ...] = (12, 26),
+) -> TimeSeriesSummary:
+    """Compute returns, volatility, drawdown, moving averages and RSI.
+
+    Raises
+    ------
+    ValueError
+        If the series has fewer than two bars.
+    """
+    if len(series) < 2:
+        raise ValueError(f"Need at least two bars to summarize {series.symbol}.")
+
+    close = series.close
+    periods_per_year = PERIODS_PER_YEAR.get(series.interval, 252)
+    returns = log_returns(close)
+    total_return = float(close[-1] / close[0] - 1.0)
+    years = len(returns) / periods_per_year
+    drawdown, peak, trough = max_drawdown(close)
+    day = np.datetime_as_string(series.datetime, unit="s")
+
+    return TimeSeriesSummary(
+        symbol=series.symbol,
+        interval=series.interval,
+        num_bars=len(series),
+        start=str(day[0]),
+        end=str(day[-1]),
+        last_close=round(float(close[-1]), 4),
+        total_return=round(total_return, 4),
+        annualized_return=(
+            round(float((1.0 + total_return) ** (1.0 / years) - 1.0), 4)
+            if years >= 1.0
+            else None
+        ),
+        annualized_volatility=(
+            round(float(returns.std(ddof=1) * math.sqrt(periods_per_year)), 4)
+            if len(returns) > 1
+            else None
+        ),
+        recent_volatility=_last(rolling_volatility(returns, window, periods_per_year)),
+        max_drawdown=round(drawdown, 4),
+        max_drawdown_peak=str(day[peak]),
+        max_drawdown_trough=str(day[trough]),
+        period_high=round(float(series.high.max()), 4),
+        period_low=round(float(series.low.min()), 4),
+        sma={w: _last(sma(close, w)) for w in sma_windows},
+        ema={s: _last(ema(close, s)) for s in ema_spans},
+        rsi_14=_last(rsi(close, 14)),
+    )
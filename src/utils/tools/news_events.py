@@ -5,16 +5,34 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import glob
+import json
+import logging
+import multiprocessing
+import os
 import random
+import time
 from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import date, timedelta
-from typing import Any
+from typing import Any, AsyncIterator, Callable, Literal
 
 import httpx
 from bs4 import BeautifulSoup
+from lxml import etree
 from pydantic import BaseModel, RootModel
 from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
 
+from ..async_utils import rate_limited
+
+
+WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
+
+# Titles per revision query; the API accepts up to 50.
+_TITLES_PER_QUERY = 50
+
+ParserName = Literal["bs4", "lxml"]
+
 
 class NewsEvent(BaseModel):
     """Represents a single current event item."""
@@ -48,14 +66,12 @@ async def _fetch_current_events_html() -> str:
     # convert to Year_Month_day format (example: 2025_May_6)
     date_str = random_date.strftime("%Y_%B_%d")
 
-    api_url = "https://en.wikipedia.org/w/api.php"
     params = {
         "action": "parse",
         "page": f"Portal:Current_events/{date_str}",
         "prop": "text",
         "format": "json",
     }
-    client = httpx.AsyncClient()
 
     with Progress(
         SpinnerColumn(),
@@ -63,7 +79,8 @@ async def _fetch_current_events_html() -> str:
         TimeElapsedColumn(),
     ) as progress:
         progress.add_task("GET wikipedia/Portal:Current_events...")
-        resp = await client.get(api_url, params=params)
+        async with httpx.AsyncClient() as client:
+            resp = await client.get(WIKIPEDIA_API_URL, params=params)
 
     resp.raise_for_status()
     data = resp.json()
@@ -124,6 +141,147 @@ def _parse_current_events(html: str) -> dict[str, list[NewsEvent]]:
     return events_by_category
 
 
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements with `name` among their classes."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_DATE_BLOCKS = etree.XPath(
+    "//div[normalize-space(@class) = 'current-events-main vevent']"
+)
+_DATE_SPAN = etree.XPath(f"(.//span[{_has_class('bday')}])[1]")
+_CONTENT_DIV = etree.XPath(f"(.//div[{_has_class('current-events-content')}])[1]")
+_HEADINGS = etree.XPath(".//p")
+_HEADING_TITLE = etree.XPath("(.//b)[1]")
+_NEXT_LIST = etree.XPath("following-sibling::ul[1]")
+_LIST_ITEMS = etree.XPath("li")
+# BeautifulSoup leaves out text of these elements from `stripped_strings`.
+_TEXT = etree.XPath(
+    "descendant::text()[not(ancestor::script or ancestor::style"
+    " or ancestor::template or ancestor::rt or ancestor::rp)]",
+    smart_strings=False,
+)
+
+
+def _stripped_strings(element: etree._Element) -> list[str]:
+    """Return the non-blank text fragments of an element, stripped."""
+    return [text for text in (t.strip() for t in _TEXT(element)) if text]
+
+
+def _parse_current_events_lxml(html: str) -> dict[str, list[NewsEvent]]:
+    """Parse the portal HTML with lxml XPath instead of BeautifulSoup.
+
+    The output is identical to `_parse_current_events`, at a fraction of the
+    cost: only the date blocks are visited, without building a soup.
+    """
+    events_by_category: dict[str, list[NewsEvent]] = defaultdict(list)
+    root = etree.HTML(html) if html.strip() else None
+    if root is None:
+        return events_by_category
+
+    for date_div in _DATE_BLOCKS(root):
+        date_span = _DATE_SPAN(date_div)
+        date_str = "".join(_stripped_strings(date_span[0])) if date_span else ""
+
+        content_div = _CONTENT_DIV(date_div)
+        if not content_div:
+            continue
+
+        for p_tag in _HEADINGS(content_div[0]):
+            b_tag = _HEADING_TITLE(p_tag)
+            if not b_tag:
+                continue
+            category = "".join(_stripped_strings(b_tag[0]))
+
+            ul = _NEXT_LIST(p_tag)
+            if not ul:
+                continue
+
+            for li in _LIST_ITEMS(ul[0]):
+                events_by_category[category].append(
+                    NewsEvent(
+                        date=date.fromisoformat(date_str),
+                        category=category,
+                        description=" ".join(_stripped_strings(li)),
+                    )
+                )
+
+    return events_by_category
+
+
+PARSERS: dict[str, Callable[[str], dict[str, list[NewsEvent]]]] = {
+    "bs4": _parse_current_events,
+    "lxml": _parse_current_events_lxml,
+}
+
+
+def parse_day_events(html: str, parser: ParserName = "lxml") -> list[NewsEvent]:
+    """Parse one portal page into a flat list of events.
+
+    A module-level function, so that it can run in a process pool.
+    """
+    return [
+        event
+        for category_events in PARSERS[parser](html).values()
+        for event in category_events
+    ]
+
+
+class ParserBenchmark(BaseModel):
+    """Parsing time of one parser over a set of pages."""
+
+    parser: str
+    pages: int
+    events: int
+    total_ms: float
+    mean_page_ms: float
+    max_page_ms: float
+    matches_reference: bool
+
+
+def load_cached_pages(cache_dir: str) -> list[str]:
+    """Read every page revision saved by a `CurrentEventsFetcher`."""
+    paths = sorted(glob.glob(os.path.join(cache_dir, "*", "*.html")))
+    return [_read_text(path) for path in paths]
+
+
+def benchmark_parsers(
+    pages: list[str],
+    parsers: tuple[ParserName, ...] = ("bs4", "lxml"),
+    repeats: int = 3,
+) -> list[ParserBenchmark]:
+    """Time each parser on the same pages and compare their output.
+
+    Each page's time is the best of `repeats` runs. The first parser is the
+    reference whose events the others must reproduce exactly.
+    """
+    reference = [parse_day_events(html, parsers[0]) for html in pages]
+    benchmarks: list[ParserBenchmark] = []
+    for name in parsers:
+        page_ms = [float("inf")] * len(pages)
+        events: list[list[NewsEvent]] = []
+        for _ in range(repeats):
+            events = []
+            for i, html in enumerate(pages):
+                started = time.perf_counter()
+                events.append(parse_day_events(html, name))
+                elapsed = (time.perf_counter() - started) * 1000
+                page_ms[i] = min(page_ms[i], elapsed)
+        total_ms = sum(page_ms)
+        benchmarks.append(
+            ParserBenchmark(
+                parser=name,
+                pages=len(pages),
+                events=sum(len(e) for e in events),
+                total_ms=round(total_ms, 3),
+                mean_page_ms=round(total_ms / len(pages), 3) if pages else 0.0,
+                max_page_ms=round(max(page_ms, default=0.0), 3),
+                matches_reference=events == reference,
+            )
+        )
+    return benchmarks
+
+
 async def get_news_events() -> CurrentEvents:
     """Return a list of current news events from the English Wikipedia.
 
@@ -137,6 +295,260 @@ async def get_news_events() -> CurrentEvents:
     return CurrentEvents.model_validate(events_dict)
 
 
+def current_events_title(day: date) -> str:
+    """Portal page title of one day, e.g. "Portal:Current_events/2025_May_6"."""
+    return f"Portal:Current_events/{day.year}_{day:%B}_{day.day}"
+
+
+class FetchStats(BaseModel):
+    """Counters of a `CurrentEventsFetcher`."""
+
+    pages: int = 0
+    cache_hits: int = 0
+    downloads: int = 0
+    missing: int = 0
+    failed: int = 0
+    events: int = 0
+    elapsed: float = 0.0
+
+
+class CurrentEventsFetcher:
+    """Fetch the Current Events portal for a range of dates.
+
+    Page revisions for up to 50 days are looked up in one API call. Pages
+    whose revision is already cached on disk are read from there; the others
+    are downloaded concurrently over one pooled connection. Cached pages are
+    keyed by title and revision, so an edited page is fetched again.
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        Directory for raw page HTML. Defaults to NEWS_CACHE_DIR; no disk cache
+        if neither is set.
+    max_concurrency : int, optional
+        Most requests in flight at once, by default 8.
+    timeout : float, optional
+        Request timeout in seconds, by default 30.
+    client : httpx.AsyncClient, optional
+        Client to use instead of creating one; it is not closed by `close`.
+    parser : {"lxml", "bs4"}, optional
+        Page parser, by default the faster "lxml"; both return the same events.
+    executor : concurrent.futures.Executor, optional
+        Pool that pages are parsed in, so that parsing never blocks the event
+        loop. Defaults to the loop's thread pool; pass a `ProcessPoolExecutor`
+        to parse long ranges on several cores. It is not shut down by `close`.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        max_concurrency: int = 8,
+        timeout: float = 30.0,
+        client: httpx.AsyncClient | None = None,
+        parser: ParserName = "lxml",
+        executor: Executor | None = None,
+    ) -> None:
+        if parser not in PARSERS:
+            raise ValueError(
+                f"Unknown parser {parser!r}; expected one of {sorted(PARSERS)}"
+            )
+        self.cache_dir = cache_dir or os.getenv("NEWS_CACHE_DIR")
+        self.parser = parser
+        self.executor = executor
+        self.stats = FetchStats()
+        self.logger = logging.getLogger(__name__)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            headers={"User-Agent": "Wealth-Management-Agent/1.0"},
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+            timeout=timeout,
+        )
+
+    async def stream_events(
+        self, start: date, end: date
+    ) -> AsyncIterator[tuple[date, list[NewsEvent]]]:
+        """Yield each day's events, in completion order, as soon as it is parsed.
+
+        Days without a portal page, or whose page could not be fetched, are
+        yielded with an empty list.
+        """
+        started = time.perf_counter()
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        revisions = await self._revisions(days)
+
+        tasks = [
+            asyncio.create_task(self._day_events(day, revisions.get(day)))
+            for day in days
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                day, events = await next_done
+                self.stats.events += len(events)
+                yield day, events
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.stats.elapsed += time.perf_counter() - started
+
+    async def get_events(self, start: date, end: date) -> CurrentEvents:
+        """Return all events between two dates, inclusive, by category."""
+        by_day: dict[date, list[NewsEvent]] = {}
+        async for day, events in self.stream_events(start, end):
+            by_day[day] = events
+
+        events_by_category: dict[str, list[NewsEvent]] = defaultdict(list)
+        for day in sorted(by_day):
+            for event in by_day[day]:
+                events_by_category[event.category].append(event)
+        return CurrentEvents.model_validate(events_by_category)
+
+    async def _revisions(self, days: list[date]) -> dict[date, int]:
+        """Look up the current revision of each day's page, batching titles."""
+        batches = [
+            days[i : i + _TITLES_PER_QUERY]
+            for i in range(0, len(days), _TITLES_PER_QUERY)
+        ]
+        results = await asyncio.gather(
+            *[self._revision_batch(batch) for batch in batches]
+        )
+        return {day: revid for result in results for day, revid in result.items()}
+
+    async def _revision_batch(self, days: list[date]) -> dict[date, int]:
+        """Query revisions of up to 50 pages, following title normalization."""
+        titles = {current_events_title(day): day for day in days}
+        try:
+            response = await rate_limited(
+                lambda: self._get(
+                    {
+                        "action": "query",
+                        "prop": "revisions",
+                        "rvprop": "ids",
+                        "titles": "|".join(titles),
+                        "redirects": "1",
+                    }
+                ),
+                semaphore=self._semaphore,
+            )
+        except httpx.HTTPError as e:
+            self.logger.error(f"Revision lookup failed for {len(days)} days: {e}")
+            return {}
+
+        query = response.get("query", {})
+        # Map requested titles through normalization and redirects.
+        renamed = {
+            item["from"]: item["to"]
+            for key in ("normalized", "redirects")
+            for item in query.get(key, [])
+        }
+        revids = {
+            page["title"]: page["revisions"][0]["revid"]
+            for page in query.get("pages", [])
+            if page.get("revisions")
+        }
+        result: dict[date, int] = {}
+        for title, day in titles.items():
+            resolved = title
+            while resolved in renamed:
+                resolved = renamed[resolved]
+            if resolved in revids:
+                result[day] = revids[resolved]
+        return result
+
+    async def _day_events(
+        self, day: date, revid: int | None
+    ) -> tuple[date, list[NewsEvent]]:
+        """Fetch (or read from cache) and parse one day's page."""
+        self.stats.pages += 1
+        if revid is None:
+            self.stats.missing += 1
+            return day, []
+        try:
+            html = await self._page_html(current_events_title(day), revid)
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            self.logger.error(f"Failed to fetch current events of {day}: {e!r}")
+            self.stats.failed += 1
+            return day, []
+        loop = asyncio.get_running_loop()
+        try:
+            events = await loop.run_in_executor(
+                self.executor, parse_day_events, html, self.parser
+            )
+        except (KeyError, ValueError) as e:
+            self.logger.error(f"Failed to parse current events of {day}: {e!r}")
+            self.stats.failed += 1
+            return day, []
+        return day, events
+
+    async def _page_html(self, title: str, revid: int) -> str:
+        """Return the rendered HTML of a page revision, from cache if possible."""
+        path = self._cache_path(title, revid)
+        if path is not None and os.path.exists(path):
+            self.stats.cache_hits += 1
+            return await asyncio.to_thread(_read_text, path)
+
+        response = await rate_limited(
+            lambda: self._get({"action": "parse", "oldid": str(revid), "prop": "text"}),
+            semaphore=self._semaphore,
+        )
+        # Errors such as a deleted revision come back with HTTP 200.
+        if "error" in response:
+            error = response["error"]
+            raise ValueError(f"{error.get('code')}: {error.get('info')}")
+        html = response["parse"]["text"]
+        self.stats.downloads += 1
+        if path is not None:
+            await asyncio.to_thread(_write_text_atomic, path, html)
+        return html
+
+    def _cache_path(self, title: str, revid: int) -> str | None:
+        """File holding one page revision, or None without a cache directory."""
+        if self.cache_dir is None:
+            return None
+        page = title.replace("/", "_").replace(":", "_")
+        return os.path.join(self.cache_dir, page, f"{revid}.html")
+
+    async def _get(self, params: dict[str, str]) -> dict[str, Any]:
+        """Call the MediaWiki API and return the decoded JSON body."""
+        response = await self._client.get(
+            WIKIPEDIA_API_URL,
+            params={**params, "format": "json", "formatversion": "2"},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def close(self) -> None:
+        """Close the HTTP client if this fetcher created it."""
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def __aenter__(self) -> "CurrentEventsFetcher":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Async context manager exit."""
+        await self.close()
+
+
+def _read_text(path: str) -> str:
+    """Read a UTF-8 text file."""
+    with open(path, encoding="utf-8") as file:
+        return file.read()
+
+
+def _write_text_atomic(path: str, text: str) -> None:
+    """Write a UTF-8 text file so that readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(text)
+    os.replace(tmp_path, path)
+
+
 async def main() -> None:
     """Fetch, parse, and output events as JSON."""
     parser = argparse.ArgumentParser(
@@ -145,9 +557,62 @@ async def main() -> None:
     parser.add_argument(
         "--output", "-o", help="Output JSON file path (default: stdout)"
     )
+    parser.add_argument(
+        "--start", type=date.fromisoformat, help="First date (YYYY-MM-DD) of a range"
+    )
+    parser.add_argument(
+        "--end", type=date.fromisoformat, help="Last date of the range (default: start)"
+    )
+    parser.add_argument("--cache-dir", help="Directory caching raw portal pages")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--parser", default="lxml", choices=sorted(PARSERS))
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="Parse pages in this many processes (default: a thread)",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Compare the parsers on the pages saved in the cache directory",
+    )
     args = parser.parse_args()
 
-    news_events = await get_news_events()
+    if args.benchmark:
+        cache_dir = args.cache_dir or os.getenv("NEWS_CACHE_DIR")
+        if not cache_dir:
+            parser.error("--benchmark needs --cache-dir or NEWS_CACHE_DIR")
+        benchmarks = benchmark_parsers(load_cached_pages(cache_dir))
+        print(json.dumps([b.model_dump() for b in benchmarks], indent=2))
+        return
+
+    if args.start:
+        # Spawned workers avoid forking a process that already runs threads.
+        executor = (
+            ProcessPoolExecutor(
+                max_workers=args.parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            if args.parse_workers > 0
+            else None
+        )
+        try:
+            async with CurrentEventsFetcher(
+                cache_dir=args.cache_dir,
+                max_concurrency=args.concurrency,
+                parser=args.parser,
+                executor=executor,
+            ) as fetcher:
+                news_events = await fetcher.get_events(
+                    args.start, args.end or args.start
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        logging.info(f"Fetch stats: {fetcher.stats.model_dump()}")
+    else:
+        news_events = await get_news_events()
     output = news_events.model_dump_json(indent=2)
 
     if args.output:
@@ -158,4 +623,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
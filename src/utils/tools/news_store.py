@@ -0,0 +1,425 @@
+"""Local index of Wikipedia Current Events, searchable by the agent.
+
+`NewsEvent`s are stored in SQLite with B-tree indexes on date and category and
+an FTS5 full-text index over the descriptions. A search is one indexed query,
+so it answers in milliseconds without touching the network. When a client is
+named, results are re-ranked by how many of the client's preferred sectors
+they mention.
+
+Populate the store from the portal with:
+
+    python -m src.utils.tools.news_store --start 2025-01-01 --end 2025-05-31
+"""
+
+import argparse
+import asyncio
+import functools
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import date
+from typing import Iterable
+
+import pydantic
+
+from ..data.client_profiles import ClientProfile, get_client_profile
+from .news_events import CurrentEventsFetcher, NewsEvent
+
+
+DEFAULT_NEWS_DB_PATH = os.path.join("data", "news", "news_events.sqlite")
+
+# Words that tie an event to a `sector_pref` entry of a client profile.
+SECTOR_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "technology": (
+        "technology",
+        "tech",
+        "software",
+        "semiconductor",
+        "semiconductors",
+        "chip",
+        "chips",
+        "ai",
+        "artificial",
+        "intelligence",
+        "cyber",
+        "cyberattack",
+        "internet",
+        "apple",
+        "google",
+        "microsoft",
+        "nvidia",
+        "openai",
+        "tesla",
+    ),
+    "financials": (
+        "bank",
+        "banks",
+        "banking",
+        "financial",
+        "finance",
+        "rates",
+        "inflation",
+        "stock",
+        "stocks",
+        "market",
+        "markets",
+        "insurance",
+        "insurer",
+        "bond",
+        "bonds",
+        "currency",
+        "tariff",
+        "tariffs",
+    ),
+    "real_estate": (
+        "housing",
+        "house",
+        "homes",
+        "mortgage",
+        "mortgages",
+        "property",
+        "realty",
+        "rent",
+        "construction",
+    ),
+    "growth": ("startup", "ipo", "innovation", "acquisition", "merger", "growth"),
+    "energy": ("oil", "gas", "energy", "pipeline", "opec", "electricity"),
+    # A diversified preference does not favour any events.
+    "diversified": (),
+}
+SECTOR_ALIASES = {"tech": "technology", "financial": "financials"}
+
+# Candidates fetched per requested result before re-ranking by sector.
+_RERANK_FACTOR = 5
+
+
+def _words(text: str) -> list[str]:
+    """Lower-cased alphanumeric words of a text."""
+    return re.findall(r"\w+", text.lower())
+
+
+def sector_keywords(sector: str) -> tuple[str, ...]:
+    """Keywords of a profile sector; unknown sectors match their own words."""
+    sector = SECTOR_ALIASES.get(sector, sector)
+    if sector in SECTOR_KEYWORDS:
+        return SECTOR_KEYWORDS[sector]
+    return tuple(_words(sector.replace("_", " ")))
+
+
+def _match_expression(words: Iterable[str]) -> str | None:
+    """FTS5 query matching any of the words, quoted so none is an operator."""
+    terms = sorted({f'"{w}"' for w in words})
+    return " OR ".join(terms) or None
+
+
+class NewsSearchHit(pydantic.BaseModel):
+    """One event returned by a search."""
+
+    date: date
+    category: str
+    description: str
+    matched_sectors: list[str] = pydantic.Field(
+        default_factory=list,
+        description="Client sectors the event mentions, if a client was given.",
+    )
+
+
+class NewsSearchResults(pydantic.BaseModel):
+    """Events matching a search, best first."""
+
+    query: str | None
+    client: str | None = None
+    hits: list[NewsSearchHit]
+    indexed_events: int
+    elapsed_ms: float
+
+
+class NewsStore:
+    """SQLite store of news events with a full-text index.
+
+    Parameters
+    ----------
+    path : str, optional
+        Database file, created if missing. Defaults to an in-memory database.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path or ":memory:"
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY,
+                    date TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    UNIQUE (date, category, description)
+                );
+                CREATE INDEX IF NOT EXISTS events_by_date ON events (date);
+                CREATE INDEX IF NOT EXISTS events_by_category
+                    ON events (category COLLATE NOCASE, date);
+                CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5 (
+                    category, description,
+                    content='events', content_rowid='id',
+                    tokenize='porter unicode61'
+                );
+                CREATE TRIGGER IF NOT EXISTS events_ai AFTER INSERT ON events BEGIN
+                    INSERT INTO events_fts (rowid, category, description)
+                    VALUES (new.id, new.category, new.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS events_ad AFTER DELETE ON events BEGIN
+                    INSERT INTO events_fts (events_fts, rowid, category, description)
+                    VALUES ('delete', old.id, old.category, old.description);
+                END;
+                """
+            )
+
+    def add_events(self, events: Iterable[NewsEvent]) -> int:
+        """Store events, skipping ones already present; return how many were new."""
+        rows = [(e.date.isoformat(), e.category, e.description) for e in events]
+        with self._lock, self._db:
+            cursor = self._db.executemany(
+                "INSERT OR IGNORE INTO events (date, category, description) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            return cursor.rowcount
+
+    def count(self) -> int:
+        """Return the number of stored events."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def search(
+        self,
+        query: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        categories: list[str] | None = None,
+        sectors: list[str] | None = None,
+        limit: int = 10,
+    ) -> list[NewsSearchHit]:
+        """Find events by text, date range and category.
+
+        Parameters
+        ----------
+        query : str, optional
+            Words to look for, ranked by BM25. Without a query, the newest
+            events come first.
+        start, end : date, optional
+            Inclusive date range.
+        categories : list[str], optional
+            Portal categories (case-insensitive), e.g. "Business and economy".
+        sectors : list[str], optional
+            Preferred sectors of a client. Events mentioning more of them rank
+            first; without a query, only such events are returned.
+        limit : int, optional
+            Most events to return, by default 10.
+        """
+        keywords = {sector: set(sector_keywords(sector)) for sector in sectors or []}
+        keywords = {sector: words for sector, words in keywords.items() if words}
+        match = _match_expression(_words(query or ""))
+        if match is None and keywords:
+            match = _match_expression(set().union(*keywords.values()))
+
+        conditions, params = [], []
+        if match is not None:
+            conditions.append("events_fts MATCH ?")
+            params.append(match)
+        if start is not None:
+            conditions.append("e.date >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            conditions.append("e.date <= ?")
+            params.append(end.isoformat())
+        if categories:
+            placeholders = ", ".join("?" * len(categories))
+            conditions.append(f"e.category COLLATE NOCASE IN ({placeholders})")
+            params.extend(categories)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        if match is not None:
+            sql = (
+                "SELECT e.date, e.category, e.description FROM events_fts "
+                f"JOIN events e ON e.id = events_fts.rowid {where} "
+                "ORDER BY bm25(events_fts), e.date DESC LIMIT ?"
+            )
+        else:
+            sql = (
+                "SELECT e.date, e.category, e.description FROM events e "
+                f"{where} ORDER BY e.date DESC, e.id LIMIT ?"
+            )
+        params.append(limit * _RERANK_FACTOR if keywords else limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+
+        hits = []
+        for day, category, description in rows:
+            words = set(_words(f"{category} {description}"))
+            hits.append(
+                NewsSearchHit(
+                    date=date.fromisoformat(day),
+                    category=category,
+                    description=description,
+                    matched_sectors=[s for s, kw in keywords.items() if kw & words],
+                )
+            )
+        # Stable sort: equal overlap keeps the relevance order.
+        hits.sort(key=lambda hit: -len(hit.matched_sectors))
+        return hits[:limit]
+
+    async def ingest(
+        self, fetcher: CurrentEventsFetcher, start: date, end: date
+    ) -> int:
+        """Fetch the portal pages of a date range and store their events."""
+        added = 0
+        async for _, events in fetcher.stream_events(start, end):
+            added += await asyncio.to_thread(self.add_events, events)
+        return added
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+
+class NewsSearchTool:
+    """News search for the agent.
+
+    Parameters
+    ----------
+    store : NewsStore
+        Index to search.
+    profiles : list[ClientProfile], optional
+        Profiles searched by client name. Defaults to the bundled profiles.
+    """
+
+    def __init__(
+        self, store: NewsStore, profiles: list[ClientProfile] | None = None
+    ) -> None:
+        self.store = store
+        self.profiles = profiles
+        self.logger = logging.getLogger(__name__)
+
+    async def search_news(
+        self,
+        query: str,
+        start: date | None = None,
+        end: date | None = None,
+        categories: list[str] | None = None,
+        client_name: str | None = None,
+        limit: int = 10,
+    ) -> NewsSearchResults | str:
+        """Search past news events from Wikipedia's Current Events portal.
+
+        Use this for questions about what happened in the news over a period,
+        e.g. market-moving events, instead of searching the web.
+
+        Parameters
+        ----------
+        query : str
+            Words to look for, e.g. "tariffs steel". May be empty to list the
+            newest events matching the other filters.
+        start : date, optional
+            First date (YYYY-MM-DD) of the range.
+        end : date, optional
+            Last date of the range.
+        categories : list[str], optional
+            Portal categories, e.g. ["Business and economy",
+            "Politics and elections", "Armed conflicts and attacks"].
+        client_name : str, optional
+            Client (e.g., "Robert Chen") whose preferred sectors rank events.
+        limit : int, optional
+            Most events to return, by default 10.
+
+        Returns
+        -------
+        NewsSearchResults | str
+            Matching events, best first, or an explanation if none can be
+            searched.
+        """
+        started = time.perf_counter()
+        sectors, client = None, None
+        if client_name:
+            try:
+                profile = get_client_profile(client_name, self.profiles)
+            except ValueError as e:
+                return str(e)
+            sectors, client = profile.sectors, profile.full_name
+
+        indexed = self.store.count()
+        if not indexed:
+            return (
+                "No news events are indexed. Populate the store with "
+                "`python -m src.utils.tools.news_store --start ... --end ...`."
+            )
+        hits = self.store.search(query, start, end, categories, sectors, limit)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.logger.info(
+            f"News search {query!r}: {len(hits)} of {indexed} events; "
+            f"{elapsed_ms:.1f}ms"
+        )
+        return NewsSearchResults(
+            query=query or None,
+            client=client,
+            hits=hits,
+            indexed_events=indexed,
+            elapsed_ms=elapsed_ms,
+        )
+
+
+@functools.lru_cache(maxsize=4)
+def _news_search_tool(path: str) -> NewsSearchTool:
+    """One tool, and database connection, per store file for the process."""
+    return NewsSearchTool(NewsStore(path))
+
+
+def create_news_search_tool() -> NewsSearchTool | None:
+    """News search over the store at NEWS_DB_PATH, or the default location.
+
+    Returns None, without creating any file, when NEWS_DB_PATH is unset and
+    no store exists at the default location.
+    """
+    path = os.getenv("NEWS_DB_PATH")
+    if not path:
+        if not os.path.exists(DEFAULT_NEWS_DB_PATH):
+            return None
+        path = DEFAULT_NEWS_DB_PATH
+    return _news_search_tool(os.path.abspath(path))
+
+
+async def main() -> None:
+    """Fetch a date range from the portal into the news store."""
+    parser = argparse.ArgumentParser(
+        description="Index Wikipedia Current Events for the search_news tool."
+    )
+    parser.add_argument("--start", type=date.fromisoformat, required=True)
+    parser.add_argument(
+        "--end", type=date.fromisoformat, help="Last date (default: start)"
+    )
+    parser.add_argument(
+        "--db", default=os.getenv("NEWS_DB_PATH") or DEFAULT_NEWS_DB_PATH
+    )
+    parser.add_argument("--cache-dir", help="Directory caching raw portal pages")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    store = NewsStore(args.db)
+    async with CurrentEventsFetcher(
+        cache_dir=args.cache_dir, max_concurrency=args.concurrency
+    ) as fetcher:
+        added = await store.ingest(fetcher, args.start, args.end or args.start)
+    print(f"Added {added} events; {store.count()} indexed in {args.db}")
+    store.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
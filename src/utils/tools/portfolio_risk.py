@@ -0,0 +1,398 @@
+"""Portfolio risk metrics computed with NumPy over stored price history.
+
+Given holdings (or a client profile, mapped to proxy ETFs), the tool aligns the
+daily closes of every position, then derives the covariance matrix,
+historical and parametric VaR/CVaR, sector concentration and stress-scenario
+P&L as matrix operations. Once history is stored locally the whole report
+takes a few milliseconds.
+"""
+
+import logging
+import math
+import time
+from statistics import NormalDist
+
+import numpy as np
+import pydantic
+
+from ..data.client_profiles import ClientProfile, get_client_profile
+from .market_analytics import TimeSeries
+from .twelve_data import AsyncFinancialDataTool
+
+
+# Proxy ETFs standing in for a profile's allocation, by residency.
+PROXY_ETFS = {
+    "USA": {
+        "broad": "VTI",
+        "diversified": "VTI",
+        "fixed_income": "BND",
+        "technology": "XLK",
+        "tech": "XLK",
+        "growth": "QQQ",
+        "financials": "XLF",
+        "real_estate": "VNQ",
+    },
+    "Canada": {
+        "broad": "XIC",
+        "diversified": "XIC",
+        "fixed_income": "XBB",
+        "technology": "XIT",
+        "tech": "XIT",
+        "growth": "XQQ",
+        "financials": "XFN",
+        "real_estate": "XRE",
+    },
+}
+
+# Sector of each proxy, and of a few tickers that come up in meetings.
+SYMBOL_SECTORS = {
+    "VTI": "broad_equity",
+    "XIC": "broad_equity",
+    "BND": "fixed_income",
+    "XBB": "fixed_income",
+    "XLK": "technology",
+    "XIT": "technology",
+    "QQQ": "technology",
+    "XQQ": "technology",
+    "AAPL": "technology",
+    "MSFT": "technology",
+    "NVDA": "technology",
+    "GOOGL": "technology",
+    "XLF": "financials",
+    "XFN": "financials",
+    "VNQ": "real_estate",
+    "XRE": "real_estate",
+}
+
+EQUITY_SECTORS = ("broad_equity", "technology", "financials", "real_estate", "other")
+
+# Shock to each sector's value; sectors not listed are unchanged.
+DEFAULT_SCENARIOS: dict[str, dict[str, float]] = {
+    "Technology -20%": {"technology": -0.20},
+    "Equity bear market -30%, bonds +5%": {
+        **dict.fromkeys(EQUITY_SECTORS, -0.30),
+        "fixed_income": 0.05,
+    },
+    "Rates +100bp (bonds -6%)": {"fixed_income": -0.06},
+    "Financials -25%": {"financials": -0.25},
+    "Real estate -20%": {"real_estate": -0.20},
+}
+
+
+class Holding(pydantic.BaseModel):
+    """A position, sized by market value."""
+
+    symbol: str
+    value: float = pydantic.Field(description="Market value in account currency.")
+    sector: str | None = pydantic.Field(
+        default=None,
+        description="E.g. technology, financials, fixed_income. Looked up if omitted.",
+    )
+
+
+class StressResult(pydantic.BaseModel):
+    """Portfolio P&L under one scenario."""
+
+    scenario: str
+    pnl: float
+    pnl_pct: float
+
+
+class PortfolioRiskReport(pydantic.BaseModel):
+    """Risk metrics of a portfolio; losses are positive amounts."""
+
+    client: str | None = None
+    total_value: float
+    weights: dict[str, float]
+    sector_weights: dict[str, float]
+    largest_sector: str
+    herfindahl_index: float = pydantic.Field(
+        description="Sum of squared holding weights; 1 means a single holding."
+    )
+    effective_holdings: float
+    observations: int
+    confidence: float
+    horizon_days: int
+    annualized_volatility: float
+    risk_contributions: dict[str, float] = pydantic.Field(
+        description="Share of portfolio variance from each holding."
+    )
+    historical_var: float
+    historical_cvar: float
+    parametric_var: float
+    parametric_cvar: float
+    stress_tests: list[StressResult]
+    missing_history: list[str] = []
+    elapsed_ms: float
+
+
+def holdings_from_profile(profile: ClientProfile) -> list[Holding]:
+    """Approximate a client's portfolio with proxy ETFs.
+
+    The equity share of `asset_alloc_pref` is split equally across the
+    preferred sectors; "diversified", sectors without a proxy and profiles
+    without preferences get a broad-market ETF. The rest goes to an aggregate
+    bond ETF. The total is the client's investable assets.
+    """
+    proxies = PROXY_ETFS.get(profile.residency or "", PROXY_ETFS["USA"])
+    total = profile.investable_assets
+    equity = profile.equity_fraction if profile.equity_fraction is not None else 0.6
+
+    sectors = profile.sectors or ["broad"]
+    share = total * equity / len(sectors)
+    equity_values: dict[str, float] = {}
+    for sector in sectors:
+        symbol = proxies.get(sector, proxies["broad"])
+        equity_values[symbol] = equity_values.get(symbol, 0.0) + share
+    holdings = [
+        Holding(symbol=symbol, value=value) for symbol, value in equity_values.items()
+    ]
+    if equity < 1.0:
+        holdings.append(
+            Holding(symbol=proxies["fixed_income"], value=total * (1.0 - equity))
+        )
+    return holdings
+
+
+def align_closes(
+    series: list[TimeSeries], lookback: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the closes of every series on their common dates, oldest first.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The shared dates and a (dates, series) matrix of closes, limited to the
+        last `lookback + 1` dates.
+    """
+    dates = series[0].datetime.astype("datetime64[D]")
+    for s in series[1:]:
+        dates = np.intersect1d(dates, s.datetime.astype("datetime64[D]"))
+    dates = dates[-(lookback + 1) :]
+    closes = np.column_stack(
+        [
+            s.close[np.searchsorted(s.datetime.astype("datetime64[D]"), dates)]
+            for s in series
+        ]
+    )
+    return dates, closes
+
+
+def historical_var_cvar(pnl: np.ndarray, confidence: float) -> tuple[float, float]:
+    """Empirical VaR and CVaR (expected shortfall) of P&L samples, as losses."""
+    losses = -pnl
+    var = float(np.quantile(losses, confidence))
+    tail = losses[losses >= var]
+    return var, float(tail.mean()) if len(tail) else var
+
+
+def parametric_var_cvar(
+    mean: float, std: float, confidence: float
+) -> tuple[float, float]:
+    """Gaussian VaR and CVaR of P&L with the given mean and deviation, as losses."""
+    normal = NormalDist()
+    z = normal.inv_cdf(confidence)
+    return -mean + z * std, -mean + std * normal.pdf(z) / (1.0 - confidence)
+
+
+def stress_pnl(
+    values: np.ndarray,
+    sectors: list[str],
+    scenarios: dict[str, dict[str, float]],
+) -> np.ndarray:
+    """P&L of each scenario: a (scenarios, holdings) shock matrix times values."""
+    shocks = np.array(
+        [
+            [shocks.get(sector, 0.0) for sector in sectors]
+            for shocks in scenarios.values()
+        ]
+    )
+    return shocks @ values
+
+
+class PortfolioRiskTool:
+    """Portfolio risk metrics for the agent, from Twelve Data history.
+
+    Parameters
+    ----------
+    financial_tool : AsyncFinancialDataTool
+        Source of daily price history. With a time series store, repeated
+        reports only download the latest bars.
+    profiles : list[ClientProfile], optional
+        Profiles searched by client name. Defaults to the bundled profiles.
+    lookback : int, optional
+        Daily returns used, by default 252 (one year).
+    scenarios : dict[str, dict[str, float]], optional
+        Stress scenarios as sector shocks. Defaults to `DEFAULT_SCENARIOS`.
+    """
+
+    def __init__(
+        self,
+        financial_tool: AsyncFinancialDataTool,
+        profiles: list[ClientProfile] | None = None,
+        lookback: int = 252,
+        scenarios: dict[str, dict[str, float]] | None = None,
+    ) -> None:
+        self.financial_tool = financial_tool
+        self.profiles = profiles
+        self.lookback = lookback
+        self.scenarios = scenarios if scenarios is not None else DEFAULT_SCENARIOS
+        self.logger = logging.getLogger(__name__)
+
+    async def analyze_portfolio_risk(
+        self,
+        holdings: list[Holding] | None = None,
+        client_name: str | None = None,
+        confidence: float = 0.95,
+        horizon_days: int = 1,
+    ) -> PortfolioRiskReport | str:
+        """Compute VaR/CVaR, volatility, concentration and stress-test P&L.
+
+        Use this for questions about portfolio risk, concentration or "what if
+        a sector drops" scenarios instead of estimating the numbers yourself.
+
+        Parameters
+        ----------
+        holdings : list[Holding], optional
+            Positions by symbol and market value. If omitted, the client's
+            profile allocation is approximated with proxy ETFs.
+        client_name : str, optional
+            Client name (e.g., "Sarah Mitchell") whose profile to use when no
+            holdings are given.
+        confidence : float, optional
+            VaR confidence level, by default 0.95.
+        horizon_days : int, optional
+            VaR horizon in trading days, by default 1.
+
+        Returns
+        -------
+        PortfolioRiskReport | str
+            The report, or an explanation if it cannot be computed.
+        """
+        started = time.perf_counter()
+        if not holdings:
+            if not client_name:
+                return "Provide holdings or a client name."
+            try:
+                profile = get_client_profile(client_name, self.profiles)
+            except ValueError as e:
+                return str(e)
+            holdings = holdings_from_profile(profile)
+            client_name = profile.full_name
+
+        # Merge repeated symbols.
+        values_by_symbol: dict[str, float] = {}
+        sectors_by_symbol: dict[str, str] = {}
+        for h in holdings:
+            symbol = h.symbol.strip().upper()
+            values_by_symbol[symbol] = values_by_symbol.get(symbol, 0.0) + h.value
+            sectors_by_symbol[symbol] = (
+                (h.sector or "").strip().lower()
+                or sectors_by_symbol.get(symbol)
+                or SYMBOL_SECTORS.get(symbol)
+                or "other"
+            )
+
+        series = await self.financial_tool.get_time_series_columns(
+            list(values_by_symbol), "1day"
+        )
+        priced = [s for s in series.values() if s is not None and len(s) > 1]
+        missing = [symbol for symbol, s in series.items() if s is None or len(s) <= 1]
+        if not priced:
+            return f"No price history available for {', '.join(missing)}."
+
+        try:
+            report = self.compute_report(
+                priced,
+                np.array([values_by_symbol[s.symbol] for s in priced]),
+                [sectors_by_symbol[s.symbol] for s in priced],
+                confidence=confidence,
+                horizon_days=horizon_days,
+            )
+        except ValueError as e:
+            return str(e)
+        report.client = client_name
+        report.missing_history = missing
+        report.elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.logger.info(
+            f"Portfolio risk: {len(priced)} holdings, {report.observations} "
+            f"observations; {report.elapsed_ms:.1f}ms"
+        )
+        return report
+
+    def compute_report(
+        self,
+        series: list[TimeSeries],
+        values: np.ndarray,
+        sectors: list[str],
+        confidence: float = 0.95,
+        horizon_days: int = 1,
+    ) -> PortfolioRiskReport:
+        """Compute the report for positions with aligned price history.
+
+        Raises
+        ------
+        ValueError
+            If the series share fewer than `horizon_days + 2` dates.
+        """
+        started = time.perf_counter()
+        _, closes = align_closes(series, self.lookback + horizon_days - 1)
+        if len(closes) < horizon_days + 2:
+            raise ValueError("Not enough overlapping history for the horizon.")
+
+        symbols = [s.symbol for s in series]
+        total = float(values.sum())
+        weights = values / total
+
+        daily_returns = closes[1:] / closes[:-1] - 1.0
+        covariance = np.cov(daily_returns, rowvar=False).reshape(
+            len(symbols), len(symbols)
+        )
+        portfolio_variance = float(weights @ covariance @ weights)
+        contributions = (
+            weights * (covariance @ weights) / portfolio_variance
+            if portfolio_variance > 0
+            else np.zeros(len(symbols))
+        )
+
+        # Overlapping horizon returns of every holding, then of the portfolio.
+        horizon_returns = closes[horizon_days:] / closes[:-horizon_days] - 1.0
+        pnl = horizon_returns @ values
+        historical_var, historical_cvar = historical_var_cvar(pnl, confidence)
+        mean = float(daily_returns.mean(axis=0) @ values) * horizon_days
+        std = math.sqrt(portfolio_variance * horizon_days) * total
+        parametric_var, parametric_cvar = parametric_var_cvar(mean, std, confidence)
+
+        sector_names, sector_index = np.unique(sectors, return_inverse=True)
+        sector_weights = np.bincount(sector_index, weights=weights)
+        herfindahl = float(weights @ weights)
+        stress = stress_pnl(values, sectors, self.scenarios)
+
+        return PortfolioRiskReport(
+            total_value=round(total, 2),
+            weights={s: round(float(w), 4) for s, w in zip(symbols, weights)},
+            sector_weights={
+                str(s): round(float(w), 4) for s, w in zip(sector_names, sector_weights)
+            },
+            largest_sector=str(sector_names[int(np.argmax(sector_weights))]),
+            herfindahl_index=round(herfindahl, 4),
+            effective_holdings=round(1.0 / herfindahl, 2),
+            observations=len(daily_returns),
+            confidence=confidence,
+            horizon_days=horizon_days,
+            annualized_volatility=round(math.sqrt(portfolio_variance * 252), 4),
+            risk_contributions={
+                s: round(float(c), 4) for s, c in zip(symbols, contributions)
+            },
+            historical_var=round(historical_var, 2),
+            historical_cvar=round(historical_cvar, 2),
+            parametric_var=round(parametric_var, 2),
+            parametric_cvar=round(parametric_cvar, 2),
+            stress_tests=[
+                StressResult(
+                    scenario=name, pnl=round(float(p), 2), pnl_pct=round(p / total, 4)
+                )
+                for name, p in zip(self.scenarios, stress)
+            ],
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
@@ -0,0 +1,123 @@
+"""On-disk store of price history, one Arrow file per symbol and interval.
+
+Files use the uncompressed Arrow IPC format, so reads are memory-mapped and
+zero-copy: opening a series costs a few system calls regardless of its length.
+Writes replace the whole file atomically, which keeps existing memory maps
+valid.
+"""
+
+import logging
+import os
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+SCHEMA = pa.schema(
+    [("datetime", pa.timestamp("s"))]
+    + [(column, pa.float64()) for column in PRICE_COLUMNS]
+)
+
+# Intervals whose bars are labelled with a date rather than a timestamp.
+DAILY_OR_LONGER = {"1day", "1week", "1month"}
+
+
+def bars_to_table(values: list[dict[str, str]]) -> pa.Table:
+    """Convert Twelve Data bars (strings, any order) to a table sorted by time."""
+    datetimes = np.array([bar["datetime"] for bar in values], dtype="datetime64[s]")
+    order = np.argsort(datetimes, kind="stable")
+    columns = {"datetime": pa.array(datetimes[order])}
+    for column in PRICE_COLUMNS:
+        prices = np.array([bar.get(column, "nan") for bar in values], dtype=np.float64)
+        columns[column] = pa.array(prices[order])
+    return pa.table(columns, schema=SCHEMA)
+
+
+def table_to_bars(
+    table: pa.Table, interval: str, limit: int | None = None
+) -> list[dict[str, str]]:
+    """Convert the newest `limit` rows back to Twelve Data's newest-first format."""
+    if limit is not None:
+        table = table.slice(max(0, table.num_rows - limit))
+    datetime_format = "%Y-%m-%d" if interval in DAILY_OR_LONGER else "%Y-%m-%d %H:%M:%S"
+    datetimes = pc.strftime(table["datetime"], format=datetime_format).to_pylist()
+    prices = {column: table[column].to_pylist() for column in PRICE_COLUMNS}
+    return [
+        {"datetime": datetimes[i], **{c: str(prices[c][i]) for c in PRICE_COLUMNS}}
+        for i in reversed(range(table.num_rows))
+    ]
+
+
+class TimeSeriesStore:
+    """Price bars by symbol and interval, stored as memory-mapped Arrow files.
+
+    Parameters
+    ----------
+    root_dir : str
+        Directory holding one sub-directory per interval.
+    """
+
+    def __init__(self, root_dir: str) -> None:
+        self.root_dir = root_dir
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+    def path(self, symbol: str, interval: str) -> str:
+        """Location of the file for a symbol and interval."""
+        return os.path.join(self.root_dir, interval, f"{symbol.upper()}.arrow")
+
+    def read(self, symbol: str, interval: str) -> pa.Table | None:
+        """Return the stored bars, oldest first, or None if there are none.
+
+        The returned columns are views of the memory-mapped file.
+        """
+        path = self.path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        with pa.memory_map(path, "r") as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def last_timestamp(self, symbol: str, interval: str) -> np.datetime64 | None:
+        """Time of the newest stored bar, if any."""
+        table = self.read(symbol, interval)
+        if table is None or table.num_rows == 0:
+            return None
+        return np.datetime64(table["datetime"][-1].value, "s")
+
+    def append(self, symbol: str, interval: str, bars: pa.Table) -> pa.Table:
+        """Merge new bars into the stored series and return the result.
+
+        A new bar replaces a stored bar with the same timestamp, since the
+        previously stored last bar may have been incomplete.
+        """
+        with self._lock:
+            existing = self.read(symbol, interval)
+            if existing is not None and existing.num_rows:
+                new_times = pa.array(bars["datetime"]).cast(pa.timestamp("s"))
+                kept = existing.filter(
+                    pc.invert(pc.is_in(existing["datetime"], value_set=new_times))
+                )
+                merged = pa.concat_tables([kept, bars.cast(SCHEMA)])
+                merged = merged.take(pc.sort_indices(merged["datetime"]))
+            else:
+                merged = bars.cast(SCHEMA)
+
+            path = self.path(symbol, interval)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with (
+                pa.OSFile(tmp_path, "wb") as sink,
+                pa.ipc.new_file(sink, SCHEMA) as writer,
+            ):
+                writer.write_table(merged)
+            os.replace(tmp_path, path)
+
+        self.logger.debug(
+            f"Stored {bars.num_rows} bars for {symbol} ({interval}); "
+            f"{merged.num_rows} in total"
+        )
+        return merged
@@ -5,13 +5,51 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 import httpx
+import numpy as np
+import pyarrow as pa
 
-from ..async_utils import rate_limited
+from ..async_utils import AdaptiveConcurrencyLimiter, HedgePolicy, hedged, rate_limited
+from ..caching import AsyncTTLCache, TTLCacheStats
+from .credit_bucket import CreditBucket, default_credit_bucket_path
+from .market_analytics import TimeSeries, TimeSeriesSummary, summarize
+from .timeseries_store import TimeSeriesStore, bars_to_table, table_to_bars
 
 
+# Shared by every tool instance in the process, so that concurrent advisor
+# sessions asking for the same tickers share one upstream request.
+_shared_quote_cache: AsyncTTLCache[str, str] = AsyncTTLCache(
+    max_entries=2048, ttl=30.0, stale_ttl=300.0
+)
+
+
+def _is_overload(error: BaseException) -> bool:
+    """Whether a request failure means the API is overloaded or throttling us."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return status_code == 429 or status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+_ChunkFetcher = Callable[[list[str]], Awaitable[dict[str, Any]]]
+
+# Bars returned per series when the caller does not ask for more, matching the
+# provider's default `outputsize`.
+_DEFAULT_OUTPUTSIZE = 30
+
+_VALID_INTERVALS = ["1min", "5min", "15min", "30min", "45min", "1h", "2h", "4h", "5h", "1day", "1week", "1month"]
+
+
+def _clean_values(values: list[dict[str, str]]) -> list[dict[str, str]]:
+    """Remove the volume field, which is always 0."""
+    return [{k: v for k, v in item.items() if k != 'volume'} for item in values]
+
+
+def _normalize_symbols(symbols: list[str]) -> list[str]:
+    """Upper-case, strip and de-duplicate symbols, keeping their order."""
+    return list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
 
 
 class AsyncFinancialDataTool:
@@ -23,6 +61,13 @@ class AsyncFinancialDataTool:
         base_url: str | None = None,
         max_concurrency: int = 3,
         timeout: float = 30.0,
+        concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
+        quote_cache: AsyncTTLCache[str, str] | None = None,
+        max_symbols_per_request: int = 120,
+        time_series_store: TimeSeriesStore | None = None,
+        history_outputsize: int = 5000,
+        credit_bucket: CreditBucket | None = None,
+        credit_timeout: float = 60.0,
     ) -> None:
         """Initialize the financial data tool.
         
@@ -33,15 +78,72 @@ class AsyncFinancialDataTool:
         base_url : str, optional
             Base URL for Twelve Data API. If not provided, uses TWELVEDATA_BASE_URL env var.
         max_concurrency : int, optional
-            Maximum number of concurrent requests, by default 3
+            Initial number of concurrent requests, by default 3. The limit then
+            adapts to the API's latency and 429/5xx responses.
         timeout : float, optional
             Request timeout in seconds, by default 30.0
+        concurrency_limiter : AdaptiveConcurrencyLimiter, optional
+            Limiter to share with other clients of the same API. If not
+            provided, one is created from `max_concurrency`.
+        quote_cache : AsyncTTLCache, optional
+            Cache of prices by symbol. Defaults to a process-wide cache whose
+            quotes are fresh for 30 seconds and are served for 5 more minutes
+            while being refreshed in the background.
+        max_symbols_per_request : int, optional
+            Most symbols sent in one batch request, by default 120, the
+            provider's batch limit. Larger batches are split into concurrent
+            requests.
+        time_series_store : TimeSeriesStore, optional
+            Local history store. When set, time series requests only download
+            bars newer than the last stored one and are served from disk.
+            Defaults to a store in TIMESERIES_STORE_DIR if that is set.
+        history_outputsize : int, optional
+            Bars downloaded the first time a series is stored, by default
+            5000, the provider's maximum.
+        credit_bucket : CreditBucket, optional
+            API credit budget shared with other workers. Each request consumes
+            one credit per symbol. Defaults to a bucket of
+            TWELVEDATA_CREDITS_PER_MINUTE credits stored in
+            TWELVEDATA_CREDIT_DB, if the former is set.
+        credit_timeout : float, optional
+            Longest time a request waits for credits before failing, by
+            default 60 seconds.
         """
         self.api_key = api_key or os.getenv("TWELVE_DATA_API_TOKEN")
         self.base_url = (base_url or os.getenv("TWELVEDATA_BASE_URL", "https://api.twelvedata.com")).rstrip("/")
         self.timeout = timeout
         self.logger = logging.getLogger(__name__)
-        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.limiter = concurrency_limiter or AdaptiveConcurrencyLimiter(
+            initial_limit=max_concurrency,
+            max_limit=max(8, max_concurrency),
+            is_overload=_is_overload,
+            name="twelve_data",
+        )
+        # Duplicates cost API credits, so at most 5% of calls are hedged.
+        self.hedge_policies = {
+            endpoint: HedgePolicy(max_extra_load=0.05, name=f"twelve_data:{endpoint}")
+            for endpoint in ("price", "time_series", "price_batch", "time_series_batch")
+        }
+        self.max_symbols_per_request = max_symbols_per_request
+        store_dir = os.getenv("TIMESERIES_STORE_DIR")
+        self.time_series_store = time_series_store or (
+            TimeSeriesStore(store_dir) if store_dir else None
+        )
+        self.history_outputsize = history_outputsize
+        credits_per_minute = os.getenv("TWELVEDATA_CREDITS_PER_MINUTE")
+        self.credit_bucket = credit_bucket or (
+            CreditBucket(
+                float(credits_per_minute),
+                path=default_credit_bucket_path(),
+                name="twelve_data",
+            )
+            if credits_per_minute
+            else None
+        )
+        self.credit_timeout = credit_timeout
+        self.quote_cache = (
+            quote_cache if quote_cache is not None else _shared_quote_cache
+        )
         
         if not self.api_key:
             raise ValueError("API key is required. Set TWELVE_DATA_API_TOKEN environment variable or pass api_key parameter.")
@@ -54,6 +156,11 @@ class AsyncFinancialDataTool:
             timeout=self.timeout
         )
 
+    @property
+    def quote_stats(self) -> TTLCacheStats:
+        """Hit ratio, background refreshes and served data age of the quote cache."""
+        return self.quote_cache.stats
+
     async def get_price(self, symbol: str) -> str | None:
         """Get current price for a symbol using Twelve Data /price endpoint.
 
@@ -67,26 +174,14 @@ class AsyncFinancialDataTool:
         str | None
             Price as string, or None if error or not found.
         """
-        if not symbol.strip():
+        symbol = symbol.strip().upper()
+        if not symbol:
             return None
 
-        api_url = f"{self.base_url}/price"
-        params = {
-            "symbol": symbol.upper(),
-            "apikey": self.api_key
-        }
-
         try:
-            response = await rate_limited(
-                lambda: self._client.get(api_url, params=params),
-                semaphore=self.semaphore
+            price = await self.quote_cache.get_or_compute(
+                symbol, lambda: self._fetch_price(symbol)
             )
-            response.raise_for_status()
-            data = response.json()
-            
-            self.logger.info(f"Price query: {symbol}; Price: {data.get('price')}")
-            return data.get('price')
-            
         except httpx.HTTPStatusError as e:
             self.logger.error(f"HTTP error during price request: {e.response.status_code} - {e.response.text}")
             return None
@@ -94,6 +189,26 @@ class AsyncFinancialDataTool:
             self.logger.error(f"Error during price request: {str(e)}")
             return None
 
+        age = self.quote_cache.age(symbol) or 0.0
+        self.logger.info(f"Price query: {symbol}; Price: {price}; Age: {age:.1f}s")
+        return price
+
+    async def _fetch_price(self, symbol: str) -> str:
+        """Request the latest price of a symbol; raise if none is returned."""
+        api_url = f"{self.base_url}/price"
+        params = {
+            "symbol": symbol,
+            "apikey": self.api_key
+        }
+
+        response = await self._hedged_get("price", api_url, params)
+        data = response.json()
+        price = data.get('price')
+        if price is None:
+            # Twelve Data reports errors such as unknown symbols in the body.
+            raise ValueError(data.get('message', f"No price returned for {symbol}"))
+        return price
+
     async def get_time_series(self, symbol: str, interval: str = "1day") -> list[dict[str, str]] | None:
         """Get time series data for a symbol using Twelve Data /time_series endpoint.
 
@@ -115,11 +230,26 @@ class AsyncFinancialDataTool:
             return None
             
         # Validate interval
-        valid_intervals = ["1min", "5min", "15min", "30min", "45min", "1h", "2h", "4h", "5h", "1day", "1week", "1month"]
-        if interval not in valid_intervals:
-            self.logger.error(f"Invalid interval: {interval}. Valid intervals: {valid_intervals}")
+        if interval not in _VALID_INTERVALS:
+            self.logger.error(f"Invalid interval: {interval}. Valid intervals: {_VALID_INTERVALS}")
             return None
 
+        if self.time_series_store is not None:
+            (symbol,) = _normalize_symbols([symbol])
+            try:
+                history = await self._sync_history(
+                    self.time_series_store, [symbol], interval
+                )
+            except Exception as e:
+                self.logger.error(f"Error reading stored time series for {symbol}: {str(e)}")
+                return None
+            table = history[symbol]
+            if table is None:
+                return None
+            values = table_to_bars(table, interval, limit=_DEFAULT_OUTPUTSIZE)
+            self.logger.info(f"Time series query: {symbol} ({interval}); Count: {len(values)}; Stored: {table.num_rows}")
+            return values
+
         api_url = f"{self.base_url}/time_series"
         params = {
             "symbol": symbol.upper(),
@@ -128,19 +258,10 @@ class AsyncFinancialDataTool:
         }
 
         try:
-            response = await rate_limited(
-                lambda: self._client.get(api_url, params=params),
-                semaphore=self.semaphore
-            )
-            response.raise_for_status()
+            response = await self._hedged_get("time_series", api_url, params)
             data = response.json()
             
-            values = data.get('values', [])
-            # Remove volume field since it's always 0
-            cleaned_values = []
-            for item in values:
-                cleaned_item = {k: v for k, v in item.items() if k != 'volume'}
-                cleaned_values.append(cleaned_item)
+            cleaned_values = _clean_values(data.get('values', []))
             
             self.logger.info(f"Time series query: {symbol} ({interval}); Count: {len(cleaned_values)}")
             return cleaned_values
@@ -152,6 +273,344 @@ class AsyncFinancialDataTool:
             self.logger.error(f"Error during time series request: {str(e)}")
             return None
 
+    async def get_prices(self, symbols: list[str]) -> dict[str, str | None]:
+        """Get current prices for several symbols in as few requests as possible.
+
+        Use this instead of repeated `get_price` calls to price a portfolio.
+
+        Parameters
+        ----------
+        symbols : list[str]
+            Financial symbols to get prices for (e.g., ["AAPL", "XIC", "VFV"]).
+
+        Returns
+        -------
+        dict[str, str | None]
+            Price as string by upper-cased symbol; None for symbols that could
+            not be priced.
+        """
+        symbols = _normalize_symbols(symbols)
+        # Only symbols without a fresh cached quote are requested upstream.
+        missing = [s for s in symbols if s not in self.quote_cache]
+        chunks = self._fetch_in_chunks(missing, self._fetch_price_chunk)
+        batches = {symbol: batch for batch in chunks for symbol in batch.symbols}
+
+        async def quote(symbol: str) -> str | None:
+            batch = batches.get(symbol)
+            compute = (
+                (lambda: batch.get(symbol))
+                if batch is not None
+                else (lambda: self._fetch_price(symbol))
+            )
+            try:
+                return await self.quote_cache.get_or_compute(symbol, compute)
+            except Exception as e:
+                self.logger.error(f"Error during price request for {symbol}: {e}")
+                return None
+
+        prices = await asyncio.gather(*[quote(symbol) for symbol in symbols])
+        self.logger.info(
+            f"Batch price query: {len(symbols)} symbols; "
+            f"{len(missing)} requested in {len(chunks)} calls"
+        )
+        return dict(zip(symbols, prices))
+
+    async def get_time_series_many(
+        self, symbols: list[str], interval: str = "1day"
+    ) -> dict[str, list[dict[str, str]] | None]:
+        """Get time series for several symbols in as few requests as possible.
+
+        Parameters
+        ----------
+        symbols : list[str]
+            Financial symbols to query (e.g., ["AAPL", "US2Y"]).
+        interval : str, optional
+            Time interval: 1min, 5min, 15min, 30min, 45min, 1h, 2h, 4h, 5h, 1day, 1week, 1month.
+            Default is "1day".
+
+        Returns
+        -------
+        dict[str, list[dict[str, str]] | None]
+            Data points with datetime, open, high, low, close by upper-cased
+            symbol; None for symbols that could not be fetched.
+        """
+        symbols = _normalize_symbols(symbols)
+        if interval not in _VALID_INTERVALS:
+            self.logger.error(f"Invalid interval: {interval}. Valid intervals: {_VALID_INTERVALS}")
+            return dict.fromkeys(symbols)
+
+        if self.time_series_store is not None:
+            history = await self._sync_history(
+                self.time_series_store, symbols, interval
+            )
+            return {
+                symbol: None if table is None else table_to_bars(table, interval, limit=_DEFAULT_OUTPUTSIZE)
+                for symbol, table in history.items()
+            }
+
+        batches = self._fetch_in_chunks(
+            symbols, lambda chunk: self._fetch_time_series_chunk(chunk, interval)
+        )
+        series: dict[str, list[dict[str, str]] | None] = {}
+        for batch in batches:
+            for symbol in batch.symbols:
+                try:
+                    series[symbol] = await batch.get(symbol)
+                except Exception as e:
+                    self.logger.error(f"Error during time series request for {symbol}: {e}")
+                    series[symbol] = None
+
+        self.logger.info(
+            f"Batch time series query: {len(symbols)} symbols ({interval}) "
+            f"in {len(batches)} calls"
+        )
+        return {symbol: series[symbol] for symbol in symbols}
+
+    async def get_history(
+        self, symbol: str, interval: str = "1day", offline: bool = False
+    ) -> pa.Table | None:
+        """Return the full stored history of a symbol for analytics and backtests.
+
+        Parameters
+        ----------
+        symbol : str
+            The financial symbol to query.
+        interval : str, optional
+            Bar interval, by default "1day".
+        offline : bool, optional
+            Read only what is stored, without contacting the API.
+
+        Returns
+        -------
+        pa.Table | None
+            Memory-mapped columns datetime, open, high, low, close, oldest
+            first, or None if nothing is stored or could be fetched.
+
+        Raises
+        ------
+        ValueError
+            If no time series store is configured.
+        """
+        if self.time_series_store is None:
+            raise ValueError("get_history requires a time_series_store.")
+        symbol = symbol.strip().upper()
+        if offline:
+            return await asyncio.to_thread(self.time_series_store.read, symbol, interval)
+        history = await self._sync_history(self.time_series_store, [symbol], interval)
+        return history[symbol]
+
+    async def analyze_time_series(
+        self, symbols: list[str], interval: str = "1day"
+    ) -> dict[str, TimeSeriesSummary | None]:
+        """Summarize the price history of several symbols.
+
+        Use this instead of fetching raw bars to assess trend, volatility,
+        drawdown or momentum.
+
+        Parameters
+        ----------
+        symbols : list[str]
+            Financial symbols to analyze (e.g., ["AAPL", "XIC"]).
+        interval : str, optional
+            Time interval: 1min, 5min, 15min, 30min, 45min, 1h, 2h, 4h, 5h, 1day, 1week, 1month.
+            Default is "1day".
+
+        Returns
+        -------
+        dict[str, TimeSeriesSummary | None]
+            Returns, annualized volatility, maximum drawdown, SMA/EMA levels
+            and RSI by upper-cased symbol; None for symbols without data.
+        """
+        series = await self.get_time_series_columns(symbols, interval)
+        summaries: dict[str, TimeSeriesSummary | None] = {}
+        for symbol, columns in series.items():
+            try:
+                summaries[symbol] = None if columns is None else summarize(columns)
+            except ValueError as e:
+                self.logger.error(f"Cannot analyze {symbol}: {e}")
+                summaries[symbol] = None
+        return summaries
+
+    async def get_time_series_columns(
+        self, symbols: list[str], interval: str = "1day"
+    ) -> dict[str, TimeSeries | None]:
+        """Return up to `history_outputsize` bars per symbol as NumPy columns.
+
+        Parameters
+        ----------
+        symbols : list[str]
+            Financial symbols to query.
+        interval : str, optional
+            Bar interval, by default "1day".
+
+        Returns
+        -------
+        dict[str, TimeSeries | None]
+            Columnar series, oldest first, by upper-cased symbol; None for
+            symbols that could not be fetched.
+        """
+        symbols = _normalize_symbols(symbols)
+        if interval not in _VALID_INTERVALS:
+            self.logger.error(f"Invalid interval: {interval}. Valid intervals: {_VALID_INTERVALS}")
+            return dict.fromkeys(symbols)
+
+        if self.time_series_store is not None:
+            history = await self._sync_history(
+                self.time_series_store, symbols, interval
+            )
+            return {
+                symbol: None if table is None or table.num_rows == 0
+                else TimeSeries.from_table(symbol, interval, table)
+                for symbol, table in history.items()
+            }
+
+        batches = self._fetch_in_chunks(
+            symbols,
+            lambda chunk: self._fetch_time_series_chunk(
+                chunk, interval, {"outputsize": str(self.history_outputsize)}
+            ),
+        )
+        series: dict[str, TimeSeries | None] = {}
+        for batch in batches:
+            for symbol in batch.symbols:
+                try:
+                    values = await batch.get(symbol)
+                    series[symbol] = (
+                        TimeSeries.from_bars(symbol, interval, values) if values else None
+                    )
+                except Exception as e:
+                    self.logger.error(f"Error during time series request for {symbol}: {e}")
+                    series[symbol] = None
+        return {symbol: series[symbol] for symbol in symbols}
+
+    async def _sync_history(
+        self, store: TimeSeriesStore, symbols: list[str], interval: str
+    ) -> dict[str, pa.Table | None]:
+        """Download bars missing from the store, then read the stored series.
+
+        Symbols without stored bars get `history_outputsize` bars. The others
+        are batched into one delta request starting at the oldest of their
+        last stored bars; overlapping bars are de-duplicated on write. If a
+        request fails, whatever is stored is served.
+        """
+        last_stored = await asyncio.to_thread(
+            lambda: {s: store.last_timestamp(s, interval) for s in symbols}
+        )
+        new_symbols = [s for s in symbols if last_stored[s] is None]
+        delta_symbols = [s for s in symbols if last_stored[s] is not None]
+
+        batches = self._fetch_in_chunks(
+            new_symbols,
+            lambda chunk: self._fetch_time_series_chunk(
+                chunk, interval, {"outputsize": str(self.history_outputsize)}
+            ),
+        )
+        if delta_symbols:
+            start = min(last_stored[s] for s in delta_symbols)
+            start_date = str(np.datetime_as_string(start, unit="s")).replace("T", " ")
+            batches += self._fetch_in_chunks(
+                delta_symbols,
+                lambda chunk: self._fetch_time_series_chunk(
+                    chunk,
+                    interval,
+                    {"start_date": start_date, "outputsize": str(self.history_outputsize)},
+                ),
+            )
+
+        history: dict[str, pa.Table | None] = {}
+        for batch in batches:
+            for symbol in batch.symbols:
+                try:
+                    values = await batch.get(symbol)
+                except Exception as e:
+                    # Includes "no data for the requested dates" when up to date.
+                    self.logger.info(f"No new bars for {symbol} ({interval}): {e}")
+                    values = []
+                if values:
+                    history[symbol] = await asyncio.to_thread(
+                        store.append, symbol, interval, bars_to_table(values)
+                    )
+                else:
+                    history[symbol] = await asyncio.to_thread(store.read, symbol, interval)
+        return {symbol: history.get(symbol) for symbol in symbols}
+
+    def _fetch_in_chunks(
+        self, symbols: list[str], fetch_chunk: _ChunkFetcher
+    ) -> list[_BatchResult]:
+        """Start one concurrent request per chunk of at most the batch limit."""
+        size = self.max_symbols_per_request
+        if self.credit_bucket is not None:
+            # A request can never cost more credits than the bucket holds.
+            size = max(1, min(size, int(self.credit_bucket.capacity)))
+        return [
+            _BatchResult(symbols[i : i + size], fetch_chunk)
+            for i in range(0, len(symbols), size)
+        ]
+
+    async def _fetch_price_chunk(self, symbols: list[str]) -> dict[str, Any]:
+        """Request prices of up to `max_symbols_per_request` symbols at once."""
+        response = await self._hedged_get(
+            "price_batch",
+            f"{self.base_url}/price",
+            {"symbol": ",".join(symbols), "apikey": self.api_key},
+        )
+        return {
+            symbol: _field_or_error(data, "price", symbol)
+            for symbol, data in _split_batch(response.json(), symbols).items()
+        }
+
+    async def _fetch_time_series_chunk(
+        self,
+        symbols: list[str],
+        interval: str,
+        extra_params: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """Request time series of up to `max_symbols_per_request` symbols at once."""
+        response = await self._hedged_get(
+            "time_series_batch",
+            f"{self.base_url}/time_series",
+            {
+                "symbol": ",".join(symbols),
+                "interval": interval,
+                "apikey": self.api_key,
+                **(extra_params or {}),
+            },
+        )
+        results: dict[str, Any] = {}
+        for symbol, data in _split_batch(response.json(), symbols).items():
+            values = _field_or_error(data, "values", symbol)
+            results[symbol] = values if isinstance(values, Exception) else _clean_values(values)
+        return results
+
+    async def _hedged_get(
+        self, endpoint: str, api_url: str, params: dict[str, str]
+    ) -> httpx.Response:
+        """Send a rate-limited GET, hedging it if it is slower than usual."""
+        return await hedged(
+            lambda: self._metered_get(api_url, params), self.hedge_policies[endpoint]
+        )
+
+    async def _metered_get(
+        self, api_url: str, params: dict[str, str]
+    ) -> httpx.Response:
+        """Pay the request's credits, then send it under the concurrency limit.
+
+        Credits are acquired before a concurrency slot, so that time spent
+        queueing for credits is not mistaken for API latency.
+        """
+        if self.credit_bucket is not None:
+            await self.credit_bucket.acquire(
+                len(params["symbol"].split(",")), timeout=self.credit_timeout
+            )
+        return await rate_limited(
+            lambda: self._get(api_url, params), semaphore=self.limiter
+        )
+
+    async def _get(self, api_url: str, params: dict[str, str]) -> httpx.Response:
+        """Send a GET request, raising for HTTP error statuses."""
+        response = await self._client.get(api_url, params=params)
+        response.raise_for_status()
+        return response
 
     async def close(self) -> None:
         """Close the HTTP client."""
@@ -167,6 +626,46 @@ class AsyncFinancialDataTool:
         await self.close()
 
 
+class _BatchResult:
+    """A batch request started for some symbols, awaited per symbol."""
+
+    def __init__(self, symbols: list[str], fetch_chunk: _ChunkFetcher) -> None:
+        self.symbols = symbols
+        self._task = asyncio.ensure_future(self._fetch(fetch_chunk))
+
+    async def _fetch(self, fetch_chunk: _ChunkFetcher) -> dict[str, Any]:
+        """Run the request, turning a failure into a per-symbol error."""
+        try:
+            return await fetch_chunk(self.symbols)
+        except Exception as e:
+            return dict.fromkeys(self.symbols, e)
+
+    async def get(self, symbol: str) -> Any:
+        """Return the symbol's result, raising its error if it failed."""
+        result = (await self._task)[symbol]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _split_batch(data: dict[str, Any], symbols: list[str]) -> dict[str, Any]:
+    """Key a batch response by symbol.
+
+    Twelve Data nests results under each symbol, except when a single symbol
+    was requested or the whole request failed.
+    """
+    if len(symbols) == 1 or data.get("status") == "error":
+        return dict.fromkeys(symbols, data)
+    return {symbol: data.get(symbol, {}) for symbol in symbols}
+
+
+def _field_or_error(data: dict[str, Any], field: str, symbol: str) -> Any:
+    """Return a field of a per-symbol result, or the error it reports."""
+    if field in data:
+        return data[field]
+    return ValueError(data.get("message", f"No {field} returned for {symbol}"))
+
+
 def create_financial_data_tool(
     api_key: str | None = None,
     base_url: str | None = None,
@@ -181,7 +680,7 @@ def create_financial_data_tool(
     base_url : str, optional  
         Base URL for Twelve Data API
     max_concurrency : int, optional
-        Maximum number of concurrent requests, by default 3
+        Initial number of concurrent requests, by default 3
         
     Returns
     -------
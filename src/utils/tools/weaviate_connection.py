@@ -0,0 +1,129 @@
+"""Long-lived, health-checked connection to Weaviate."""
+
+import asyncio
+import contextlib
+import logging
+
+import pydantic
+from weaviate import WeaviateAsyncClient
+from weaviate.exceptions import (
+    WeaviateClosedClientError,
+    WeaviateConnectionError,
+    WeaviateGRPCUnavailableError,
+    WeaviateStartUpError,
+    WeaviateTimeoutError,
+)
+
+
+# Failures after which the connection is re-established and the call retried.
+CONNECTION_ERRORS: tuple[type[Exception], ...] = (
+    WeaviateClosedClientError,
+    WeaviateConnectionError,
+    WeaviateGRPCUnavailableError,
+    WeaviateStartUpError,
+    WeaviateTimeoutError,
+)
+
+
+class ConnectionStats(pydantic.BaseModel):
+    """Counters describing the connection lifecycle."""
+
+    connects: int = 0
+    reconnects: int = 0
+    health_checks: int = 0
+    failed_health_checks: int = 0
+
+
+class WeaviateConnectionManager:
+    """Connect once and share an async Weaviate client across coroutines.
+
+    Readiness is cached and refreshed by a background probe every
+    `health_check_interval` seconds rather than checked before every query.
+    When the probe or a caller reports a failure, the next `get_client` call
+    closes and re-opens the connection.
+    """
+
+    def __init__(
+        self,
+        async_client: WeaviateAsyncClient,
+        health_check_interval: float = 30.0,
+    ) -> None:
+        self.async_client = async_client
+        self.health_check_interval = health_check_interval
+        self.stats = ConnectionStats()
+        self.logger = logging.getLogger(__name__)
+
+        self._ready = False
+        self._lock = asyncio.Lock()
+        self._probe_task: asyncio.Task[None] | None = None
+
+    @property
+    def is_ready(self) -> bool:
+        """Cached readiness as of the last connect or health check."""
+        return self._ready and self.async_client.is_connected()
+
+    async def get_client(self) -> WeaviateAsyncClient:
+        """Return the connected client, (re)connecting first if needed.
+
+        Raises
+        ------
+        Exception
+            If Weaviate is not ready to accept requests (HTTP 503).
+        """
+        if not self.is_ready:
+            async with self._lock:
+                if not self.is_ready:
+                    await self._connect()
+
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.create_task(self._probe_loop())
+
+        return self.async_client
+
+    def mark_unhealthy(self) -> None:
+        """Force a reconnect on the next `get_client` call."""
+        self._ready = False
+
+    async def close(self) -> None:
+        """Stop the health probe and close the connection."""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._probe_task
+            self._probe_task = None
+
+        self._ready = False
+        await self.async_client.close()
+
+    async def _connect(self) -> None:
+        """Open a fresh connection and verify that Weaviate is ready."""
+        if self.stats.connects > 0:
+            self.stats.reconnects += 1
+            self.logger.warning("Reconnecting to Weaviate.")
+            with contextlib.suppress(Exception):
+                await self.async_client.close()
+
+        self.stats.connects += 1
+        await self.async_client.connect()
+        if not await self.async_client.is_ready():
+            raise Exception("Weaviate is not ready to accept requests (HTTP 503).")
+        self._ready = True
+
+    async def _probe_loop(self) -> None:
+        """Refresh the cached readiness flag periodically."""
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            if not self._ready:
+                # The next caller reconnects; nothing to probe until then.
+                continue
+
+            self.stats.health_checks += 1
+            try:
+                ready = await self.async_client.is_ready()
+            except Exception as e:
+                self.logger.warning(f"Weaviate health check failed: {e}")
+                ready = False
+
+            if not ready:
+                self.stats.failed_health_checks += 1
+                self._ready = False
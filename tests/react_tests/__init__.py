@@ -0,0 +1 @@
+"""ReAct agent tests package."""
@@ -0,0 +1,211 @@
+"""Unit tests for the Gemini web search agent against a fake async client."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.react.agent import WebSearchAgent
+from src.react.agents.meeting_intelligence.reference_generation import (
+    ReferenceGenerationAgent,
+)
+from src.utils.caching import SemanticCache
+
+
+GROUNDING = SimpleNamespace(
+    search_queries=["rrsp limit 2025"],
+    grounding_chunks=[
+        SimpleNamespace(web=SimpleNamespace(title="canada.ca", uri="https://canada.ca"))
+    ],
+)
+
+
+class FakeGemini:
+    """Mimic `genai.Client.aio.models.generate_content` with a fixed latency."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.aio = SimpleNamespace(models=self)
+
+    async def generate_content(self, model: str, contents: str, config) -> object:
+        """Answer after `latency` seconds."""
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return SimpleNamespace(text=f"Answer from {model}", candidates=None)
+
+    async def generate_content_stream(self, model: str, contents: str, config):
+        """Stream three text chunks `latency` apart, then the grounding."""
+        self.calls += 1
+
+        async def chunks():
+            for text in ("The 2025 ", "RRSP limit ", "is $32,490."):
+                await asyncio.sleep(self.latency)
+                yield SimpleNamespace(text=text, candidates=None)
+            candidate = SimpleNamespace(content=None, grounding_metadata=GROUNDING)
+            yield SimpleNamespace(text=None, candidates=[candidate])
+
+        return chunks()
+
+
+def make_agent(client: FakeGemini, **kwargs) -> WebSearchAgent:
+    """Build an agent around the fake client."""
+    return WebSearchAgent(
+        name="Web Search Agent",
+        model="gemini-test",
+        instructions="Search the web.",
+        api_key="unused",
+        client=client,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_searches_overlap_up_to_the_concurrency_cap() -> None:
+    """Six 0.2s searches take about 0.2s, or 0.4s when capped at three."""
+    client = FakeGemini(latency=0.2)
+    agent = make_agent(client, max_concurrency=8)
+
+    started = time.monotonic()
+    results = await asyncio.gather(
+        *[agent.search_and_respond(f"query {i}") for i in range(6)]
+    )
+    elapsed = time.monotonic() - started
+
+    assert results == ["Answer from gemini-test"] * 6
+    assert client.max_in_flight == 6
+    assert elapsed < 0.35
+
+    capped = FakeGemini(latency=0.2)
+    agent = make_agent(capped, max_concurrency=3)
+    started = time.monotonic()
+    await asyncio.gather(*[agent.search_and_respond(f"query {i}") for i in range(6)])
+
+    assert capped.max_in_flight == 3
+    assert 0.4 <= time.monotonic() - started < 0.55
+
+
+@pytest.mark.asyncio
+async def test_slow_search_times_out() -> None:
+    """A request slower than the timeout returns an error instead of hanging."""
+    agent = make_agent(FakeGemini(latency=5.0), timeout=0.1)
+
+    started = time.monotonic()
+    result = await agent.search_and_respond("query")
+
+    assert result == "Search error: no response within 0.1s"
+    assert time.monotonic() - started < 1.0
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_text_then_sources() -> None:
+    """Text arrives chunk by chunk; sources and queries follow at the end."""
+    agent = make_agent(FakeGemini(latency=0.1))
+
+    started = time.monotonic()
+    pieces, arrivals = [], []
+    async for piece in agent.search_and_respond_stream("RRSP limit"):
+        pieces.append(piece)
+        arrivals.append(time.monotonic() - started)
+
+    assert pieces[:3] == ["The 2025 ", "RRSP limit ", "is $32,490."]
+    assert arrivals[0] < 0.2
+    assert pieces[3] == (
+        "\n\n**Search Queries Used:**\n- rrsp limit 2025\n"
+        "\n**Sources:**\n1. [canada.ca](https://canada.ca)\n"
+    )
+
+
+class FakeRunner:
+    """Return two web search queries for any prompt."""
+
+    async def run_single_query(self, agent, query: str, verbose: bool = True):
+        """Answer like the query-generation agent."""
+        return {"success": True, "final_output": "rrsp limit\ntfsa limit"}
+
+
+@pytest.mark.asyncio
+async def test_reference_research_streams_partial_web_results() -> None:
+    """Partial web findings are yielded before stage 1 completes."""
+    reference = ReferenceGenerationAgent()
+    reference.runner = FakeRunner()
+    reference.react_agent_manager.initialized = True
+    reference.react_agent_manager.agent = object()
+    reference.web_agent_manager.initialized = True
+    reference.web_agent_manager.agent = make_agent(FakeGemini(latency=0.05))
+    reference.initialized = True
+
+    async def no_cra_terms(client_situation: str) -> str:
+        """Generate no CRA search terms."""
+        return ""
+
+    async def no_cra_results(queries: list[str]) -> list:
+        """Skip the CRA knowledge base."""
+        return []
+
+    reference._generate_cra_search_terms = no_cra_terms
+    reference._search_cra = no_cra_results
+
+    updates = [u async for u in reference.stream_stage1_research("Client")]
+
+    partial_text, research_data = updates[-1]
+    assert research_data is not None
+    assert all(data is None for _, data in updates[:-1])
+    assert "is $32,490." not in updates[0][0]
+    assert "Web Search 2 ('tfsa limit'):\nThe 2025 RRSP" in partial_text
+    assert partial_text.count("https://canada.ca") == 2
+    assert research_data["web_query"] == "rrsp limit\ntfsa limit"
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_reuses_answers_to_paraphrases() -> None:
+    """A reworded question is answered from the cache, streamed or not."""
+    vectors = {
+        "RRSP contribution limits Canada current rates": [0.95, 0.31],
+        "current RRSP limit Canada": [0.96, 0.28],
+        "TFSA limit": [0.0, 1.0],
+    }
+
+    async def embed(text: str) -> list[float]:
+        """Return a fixed vector per question."""
+        return vectors[text]
+
+    client = FakeGemini(latency=0.0)
+    cache: SemanticCache[str] = SemanticCache(
+        embed, should_cache=WebSearchAgent.is_answer
+    )
+    agent = make_agent(client, semantic_cache=cache)
+
+    first = await agent.search_and_respond(
+        "Long prompt 1", cache_key="RRSP contribution limits Canada current rates"
+    )
+    second = await agent.search_and_respond(
+        "Long prompt 2", cache_key="current RRSP limit Canada"
+    )
+    streamed = [
+        piece
+        async for piece in agent.search_and_respond_stream(
+            "Long prompt 3", cache_key="current RRSP limit Canada"
+        )
+    ]
+    fresh = [
+        piece
+        async for piece in agent.search_and_respond_stream(
+            "Long prompt 4", cache_key="TFSA limit"
+        )
+    ]
+
+    assert first == second == "Answer from gemini-test"
+    assert streamed == [first]
+    assert len(fresh) == 4
+    assert client.calls == 2
+    assert cache.stats.hits == 2
+    assert len(cache) == 2
@@ -0,0 +1,109 @@
+"""Unit tests for the Canadian tax engine and contribution optimizer."""
+
+import numpy as np
+import pytest
+
+from src.utils.tools.canadian_tax import (
+    CanadianTaxTool,
+    ContributionPlan,
+    federal_tax,
+    marginal_rate,
+    optimize_contributions,
+    rrsp_deduction_limit,
+    spousal_attribution,
+    tax_breakdown,
+    tfsa_room,
+    total_tax,
+)
+
+
+def test_rates_and_vectorized_tax() -> None:
+    """Marginal rates match the combined brackets; arrays equal scalar calls."""
+    assert float(federal_tax(50_000)) == pytest.approx(0.145 * (50_000 - 16_129))
+    assert float(marginal_rate(87_000, "ON")) == pytest.approx(0.2965)
+    assert float(marginal_rate(120_000, "Ontario")) == pytest.approx(
+        0.26 + 0.1116 * 1.56
+    )
+    assert float(marginal_rate(87_000, "BC")) == pytest.approx(0.282)
+    assert float(marginal_rate(50_000, "ab")) == pytest.approx(0.225)
+
+    incomes = np.linspace(0, 400_000, 2_001)
+    np.testing.assert_allclose(
+        total_tax(incomes, "ON"), [float(total_tax(i, "ON")) for i in incomes]
+    )
+    assert (np.diff(total_tax(incomes, "ON")) >= 0).all()
+
+    with pytest.raises(ValueError, match="Unsupported province"):
+        total_tax(50_000, "QC")
+
+
+def test_rrsp_deduction_saves_tax_at_marginal_rates() -> None:
+    """An $18,600 deduction from $87,000 in Ontario stays in the 29.65% bracket."""
+    breakdown = tax_breakdown(87_000, "ON", rrsp_deduction=18_600)
+
+    assert breakdown.taxable_income == 68_400
+    # Plus $150 of Ontario Health Premium, which steps up at $72,000.
+    assert breakdown.rrsp_tax_savings == pytest.approx(18_600 * 0.2965 + 150)
+
+
+def test_contribution_room_and_attribution() -> None:
+    """RRSP room is 18% capped; TFSA room accrues from age 18 or 2009."""
+    assert rrsp_deduction_limit(87_000) == pytest.approx(15_660)
+    assert rrsp_deduction_limit(250_000, pension_adjustment=2_490) == 30_000
+    assert tfsa_room(40) == 102_000
+    assert tfsa_room(20) == 20_500
+    assert tfsa_room(40, contributions=60_000, withdrawals=5_000) == 47_000
+
+    contributions = {2021: 10_000, 2023: 5_000, 2024: 3_000}
+    assert spousal_attribution(20_000, 2025, contributions) == 8_000
+    assert spousal_attribution(4_000, 2025, contributions) == 4_000
+    assert spousal_attribution(20_000, 2027, contributions) == 0
+
+
+def test_optimizer_follows_retirement_tax_rates() -> None:
+    """RRSP wins when retirement rates are lower; spousal RRSP when the spouse's are."""
+    low = optimize_contributions(
+        87_000, "ON", 6_000, 18_600, 43_000, 30, retirement_income=35_000
+    )
+    assert low.rrsp_contribution == 6_000
+    assert low.after_tax_value > low.all_tfsa_value
+
+    high = optimize_contributions(
+        60_000, "ON", 6_000, 18_600, 43_000, 30, retirement_income=130_000
+    )
+    assert high.rrsp_contribution == 0
+    assert high.tfsa_contribution == 6_000
+
+    couple = optimize_contributions(
+        87_000,
+        "ON",
+        15_000,
+        18_600,
+        43_000,
+        30,
+        retirement_income=45_000,
+        spouse_retirement_income=15_000,
+    )
+    assert couple.scenarios_evaluated == 101 * 101
+    assert couple.spousal_rrsp_contribution > couple.rrsp_contribution
+    assert couple.after_tax_value >= couple.all_rrsp_value
+    assert any("2028" in note for note in couple.notes)
+
+
+@pytest.mark.asyncio
+async def test_tool_fills_inputs_from_profile() -> None:
+    """Income, province and horizon come from the client's profile."""
+    tool = CanadianTaxTool()
+
+    plan = await tool.optimize_rrsp_tfsa(
+        annual_savings=6_000,
+        rrsp_room=18_600,
+        tfsa_room=43_000,
+        client_name="Michael Chen",
+    )
+
+    assert isinstance(plan, ContributionPlan)
+    assert plan.province == "ON"
+    assert await tool.optimize_rrsp_tfsa(6_000, 18_600, 43_000) == (
+        "Provide income, province and years_to_retirement, or a client name."
+    )
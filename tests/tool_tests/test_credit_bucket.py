@@ -0,0 +1,47 @@
+"""Unit tests for the SQLite-backed API credit bucket."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.utils.tools.credit_bucket import CreditBucket, CreditTimeoutError
+
+
+@pytest.mark.asyncio
+async def test_instances_share_one_budget(tmp_path) -> None:
+    """Two buckets on the same file (as in two workers) draw from one balance."""
+    path = str(tmp_path / "credits.sqlite")
+    first = CreditBucket(credits_per_minute=600, capacity=10, path=path)
+    second = CreditBucket(credits_per_minute=600, capacity=10, path=path)
+
+    assert await first.acquire(6) == 0.0
+    assert await second.acquire(4) == 0.0
+
+    # The bucket is empty; 5 more credits take 0.5s at 10 credits per second.
+    started = time.monotonic()
+    wait = await second.acquire(5)
+    assert wait == pytest.approx(0.5, abs=0.05)
+    assert time.monotonic() - started >= 0.45
+    assert second.stats.waits == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_fails_without_consuming_credits() -> None:
+    """A caller that cannot be served in time fails and leaves the budget intact."""
+    bucket = CreditBucket(credits_per_minute=60, capacity=5)
+    await bucket.acquire(5)
+
+    with pytest.raises(CreditTimeoutError):
+        await bucket.acquire(3, timeout=1.0)
+    with pytest.raises(ValueError, match="capacity"):
+        await bucket.acquire(6)
+
+    # Cancelled waiters hand their reservation back.
+    waiter = asyncio.create_task(bucket.acquire(2))
+    await asyncio.sleep(0.05)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert bucket.reserve(1, max_wait=1.5) is not None
+    assert bucket.stats.deadline_exceeded == 1
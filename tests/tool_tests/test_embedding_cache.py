@@ -0,0 +1,97 @@
+"""Unit tests for the two-tier embedding cache."""
+
+import asyncio
+
+import pytest
+
+from src.utils.tools.embedding_cache import DiskEmbeddingStore, EmbeddingCache
+
+
+MODEL = "@cf/baai/bge-m3"
+
+
+def test_memory_tier_normalizes_text() -> None:
+    """Whitespace and case variants of a query share one entry."""
+    cache = EmbeddingCache()
+    cache.put(MODEL, "RRSP contribution limits", [0.1, 0.2])
+
+    assert cache.get(MODEL, "  rrsp   Contribution limits ") == [0.1, 0.2]
+    assert cache.get("other-model", "RRSP contribution limits") is None
+    assert cache.stats.memory_hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path) -> None:
+    """A second cache on the same directory sees vectors written by the first."""
+    writer = EmbeddingCache(cache_dir=str(tmp_path))
+    writer.put(MODEL, "TFSA contribution room", [0.5, -0.25, 1.0])
+
+    reader = EmbeddingCache(cache_dir=str(tmp_path))
+    vector = reader.get(MODEL, "TFSA contribution room")
+
+    assert vector == pytest.approx([0.5, -0.25, 1.0], abs=1e-3)
+    assert reader.stats.disk_hits == 1
+    # The disk hit is promoted into the memory tier.
+    assert reader.get(MODEL, "TFSA contribution room") is not None
+    assert reader.stats.memory_hits == 1
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path) -> None:
+    """Writing past the byte limit reuses the least recently used slot."""
+    # Two float16 vectors of dimension 4 fit in 16 bytes.
+    store = DiskEmbeddingStore(str(tmp_path), max_entries=None, max_bytes=16)
+    store.put("a", [1.0] * 4)
+    store.put("b", [2.0] * 4)
+    assert store.get("a") is not None
+
+    evicted = store.put("c", [3.0] * 4)
+
+    assert evicted
+    assert len(store) == 2
+    assert store.get("b") is None
+    assert store.get("a") == [1.0] * 4
+    assert store.get("c") == [3.0] * 4
+
+
+def test_lower_limits_keep_shared_entries(tmp_path) -> None:
+    """A process with smaller limits keeps the store's existing capacity."""
+    writer = DiskEmbeddingStore(str(tmp_path), max_entries=4)
+    for i in range(4):
+        writer.put(f"k{i}", [float(i)] * 2)
+
+    reader = DiskEmbeddingStore(str(tmp_path), max_entries=2)
+
+    assert len(reader) == 4
+    assert reader.get("k3") == [3.0] * 2
+    assert writer.get("k3") == [3.0] * 2
+
+
+@pytest.mark.asyncio
+async def test_async_batch_lookup(tmp_path) -> None:
+    """Batched lookups combine both tiers and count misses."""
+    writer = EmbeddingCache(cache_dir=str(tmp_path))
+    await writer.put_many(MODEL, ["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+
+    reader = EmbeddingCache(cache_dir=str(tmp_path))
+    reader.put(MODEL, "a", [1.0, 0.0])
+    vectors = await reader.get_many(MODEL, ["a", "b", "c"])
+
+    assert vectors == [[1.0, 0.0], [0.0, 1.0], None]
+    assert (reader.stats.memory_hits, reader.stats.disk_hits) == (1, 1)
+    assert reader.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_batches_share_the_disk_tier(tmp_path) -> None:
+    """Overlapping lookups and writes from worker threads all succeed."""
+    cache = EmbeddingCache(cache_dir=str(tmp_path), memory_max_entries=1)
+    texts = [f"query {i}" for i in range(8)]
+    vectors = [[float(i), 1.0] for i in range(8)]
+
+    for _ in range(5):
+        await asyncio.gather(
+            *[cache.get_many(MODEL, texts) for _ in range(20)],
+            *[cache.put_many(MODEL, texts, vectors) for _ in range(10)],
+        )
+
+    assert await cache.get_many(MODEL, texts[-1:]) == [vectors[-1]]
@@ -0,0 +1,76 @@
+"""Unit tests for the micro-batching embedding client."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.tools.embeddings import AsyncBatchEmbedder
+
+
+class _FakeEmbeddings:
+    """Stand-in for `AsyncOpenAI().embeddings` that records each call."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    async def create(self, input: list[str], model: str) -> SimpleNamespace:  # noqa: A002
+        self.calls.append(list(input))
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=[float(len(text)), float(i)])
+                for i, text in enumerate(input)
+            ]
+        )
+
+
+def _fake_client() -> SimpleNamespace:
+    return SimpleNamespace(embeddings=_FakeEmbeddings())
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_call() -> None:
+    """Requests arriving within the wait window go upstream together."""
+    client = _fake_client()
+    embedder = AsyncBatchEmbedder(client, "test-model", max_wait_time=0.01)  # type: ignore
+
+    texts = ["a", "bb", "ccc"]
+    vectors = await asyncio.gather(*[embedder.embed(text) for text in texts])
+
+    assert client.embeddings.calls == [texts]
+    assert [vector[0] for vector in vectors] == [1.0, 2.0, 3.0]
+    assert embedder.stats.num_batches == 1
+    assert embedder.stats.batch_size_counts[3] == 1
+    assert embedder.stats.max_queue_wait > 0
+
+
+@pytest.mark.asyncio
+async def test_embed_many_respects_max_batch_size() -> None:
+    """Large requests are split into batches of at most `max_batch_size`."""
+    client = _fake_client()
+    embedder = AsyncBatchEmbedder(client, "test-model", max_batch_size=2)  # type: ignore
+
+    vectors = await embedder.embed_many(["a", "bb", "ccc", "dddd", "eeeee"])
+
+    assert [len(call) for call in client.embeddings.calls] == [2, 2, 1]
+    assert [vector[0] for vector in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert embedder.stats.mean_batch_size == pytest.approx(5 / 3)
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_propagates_to_callers() -> None:
+    """Every caller in a failed batch receives the upstream exception."""
+
+    async def _fail(input: list[str], model: str) -> None:  # noqa: A002
+        raise RuntimeError("upstream down")
+
+    client = SimpleNamespace(embeddings=SimpleNamespace(create=_fail))
+    embedder = AsyncBatchEmbedder(client, "test-model")  # type: ignore
+
+    results = await asyncio.gather(
+        embedder.embed("a"), embedder.embed("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert embedder.stats.num_failed_batches == 1
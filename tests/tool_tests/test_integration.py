@@ -60,9 +60,10 @@ async def react_agent_manager() -> AsyncGenerator[ReactAgentManager, None]:
     await manager.cleanup()
 
 
-def test_vectorizer(weaviate_kb: AsyncWeaviateKnowledgeBase) -> None:
+@pytest.mark.asyncio
+async def test_vectorizer(weaviate_kb: AsyncWeaviateKnowledgeBase) -> None:
     """Test vectorizer integration."""
-    vector = weaviate_kb._vectorize("What are diversified investment portfolios?")
+    vector = await weaviate_kb._vectorize("What are diversified investment portfolios?")
     assert vector is not None
     assert len(vector) > 0
     print(f"Vector ({len(vector)} dimensions): {vector[:10]}...")
@@ -0,0 +1,273 @@
+"""Unit tests for document extraction, chunking and incremental ingestion."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.caching import AsyncTTLCache
+from src.utils.tools.kb_ingest import (
+    CRAIngestionPipeline,
+    ExtractedDocument,
+    chunk_document,
+    extract_document,
+    find_documents,
+)
+from src.utils.tools.kb_weaviate import invalidate_search_cache
+
+
+HTML = """
+<html><head><title>RRSPs and Related Plans</title></head>
+<body>
+<nav>Skip to main content</nav>
+<main>
+<h1>RRSPs and Related Plans</h1>
+<p>Intro paragraph.</p>
+<h2>Contribution limits</h2>
+<p>Your deduction limit is 18% of earned income.</p>
+<ul><li>Up to the annual maximum.</li></ul>
+<h3>Unused room</h3>
+<p>Unused room carries forward.</p>
+</main>
+</body></html>
+"""
+
+
+def test_extract_html_splits_on_headings(tmp_path) -> None:
+    """HTML text is grouped under the nearest h2/h3 heading."""
+    path = tmp_path / "docs" / "rrsp.html"
+    path.parent.mkdir()
+    path.write_text(HTML)
+    (tmp_path / "docs" / "notes.txt").write_text("ignored")
+
+    assert find_documents(str(tmp_path)) == [str(path)]
+    document = extract_document(str(path))
+
+    assert document.title == "RRSPs and Related Plans"
+    assert document.sections == [
+        (None, "Intro paragraph."),
+        (
+            "Contribution limits",
+            "Your deduction limit is 18% of earned income.\n\n"
+            "Up to the annual maximum.",
+        ),
+        ("Unused room", "Unused room carries forward."),
+    ]
+
+
+def test_chunk_document_respects_size_and_sections() -> None:
+    """Chunks stay within max_chars, never span sections and have stable IDs."""
+    paragraphs = "\n\n".join(f"Paragraph {i} " + "x" * 80 for i in range(20))
+    document = ExtractedDocument(
+        source="t4040.pdf",
+        title="T4040",
+        sections=[("Limits", paragraphs), ("Withdrawals", "Short section.")],
+    )
+
+    chunks = chunk_document(document, max_chars=400, overlap_chars=50)
+    again = chunk_document(document, max_chars=400, overlap_chars=50)
+
+    assert all(len(chunk.text) <= 400 for chunk in chunks)
+    assert chunks[-1].section == "Withdrawals"
+    assert chunks[-1].text == "Short section."
+    assert {chunk.section for chunk in chunks[:-1]} == {"Limits"}
+    assert len({chunk.uuid for chunk in chunks}) == len(chunks)
+    assert [chunk.uuid for chunk in chunks] == [chunk.uuid for chunk in again]
+
+    # Growing an earlier section does not renumber the chunks after it.
+    document.sections[0] = ("Limits", paragraphs + "\n\nOne more paragraph.")
+    grown = chunk_document(document, max_chars=400, overlap_chars=50)
+    assert grown[-1].uuid == chunks[-1].uuid
+
+
+def test_repeated_and_untitled_sections_get_distinct_ids() -> None:
+    """Sections sharing a heading, or having none, do not share chunk UUIDs."""
+    document = ExtractedDocument(
+        source="t4040.pdf",
+        title="T4040",
+        sections=[
+            (None, "Preface."),
+            ("Example", "First example."),
+            (None, "Note."),
+            ("Example", "Second example."),
+            ("Example", "Third example."),
+        ],
+    )
+
+    chunks = chunk_document(document)
+
+    assert len(chunks) == 5
+    assert len({chunk.uuid for chunk in chunks}) == 5
+
+
+class _FakeEmbeddings:
+    """Stand-in for `AsyncOpenAI().embeddings` that counts embedded texts."""
+
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+    async def create(self, input: list[str], model: str) -> SimpleNamespace:  # noqa: A002
+        """Return one fixed-size vector per input text."""
+        self.texts.extend(input)
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=[1.0, 0.0])
+                for i in range(len(input))
+            ]
+        )
+
+
+class _FakeData:
+    """Stand-in for `collection.data` storing objects in a dict."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, dict] = {}
+        self.unavailable = False
+
+    async def insert_many(self, objects) -> SimpleNamespace:
+        """Upsert objects by UUID, or raise while `unavailable` is set."""
+        if self.unavailable:
+            raise ConnectionError("Weaviate is unavailable")
+        for obj in objects:
+            self.objects[str(obj.uuid)] = obj.properties
+        return SimpleNamespace(errors={})
+
+    async def delete_many(self, where) -> SimpleNamespace:
+        """Delete the objects whose UUIDs the filter lists."""
+        deleted = [uuid for uuid in where.value if self.objects.pop(uuid, None)]
+        return SimpleNamespace(successful=len(deleted), failed=0)
+
+
+class _FakeClient:
+    """Async Weaviate client exposing a single existing collection."""
+
+    def __init__(self) -> None:
+        self.data = _FakeData()
+        self.collections = SimpleNamespace(
+            exists=self._exists, get=lambda name: SimpleNamespace(data=self.data)
+        )
+
+    async def _exists(self, name: str) -> bool:
+        return True
+
+    async def __aenter__(self) -> "_FakeClient":
+        """Enter the client context."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Exit the client context."""
+
+
+def _write_guide(path, sections: dict[str, str]) -> None:
+    """Write an HTML page with one h2 section per entry."""
+    body = "".join(f"<h2>{name}</h2><p>{text}</p>" for name, text in sections.items())
+    path.write_text(
+        f"<html><body><main><h1>{path.stem}</h1>{body}</main></body></html>"
+    )
+
+
+@pytest.mark.asyncio
+async def test_refresh_embeds_only_changed_chunks(tmp_path) -> None:
+    """A refresh upserts changed chunks, deletes orphans and skips the rest."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    manifest = str(tmp_path / "manifest.json")
+    _write_guide(
+        docs / "rrsp.html", {"Limits": "18% of income", "Deadlines": "60 days"}
+    )
+    _write_guide(docs / "tfsa.html", {"Room": "Annual dollar limit"})
+    _write_guide(docs / "fhsa.html", {"Eligibility": "First-time buyers"})
+
+    client = _FakeClient()
+    embeddings = _FakeEmbeddings()
+    pipeline = CRAIngestionPipeline(client, embedding_api_key="test")  # type: ignore
+    pipeline._embedder.client = SimpleNamespace(embeddings=embeddings)  # type: ignore
+
+    first = await pipeline.run(find_documents(str(docs)), manifest_path=manifest)
+    assert len(first.added) == 4
+    assert len(client.data.objects) == 4
+
+    _write_guide(docs / "rrsp.html", {"Limits": "18% of earned income"})
+    (docs / "fhsa.html").unlink()
+    embeddings.texts.clear()
+
+    second = await pipeline.run(find_documents(str(docs)), manifest_path=manifest)
+
+    assert embeddings.texts == ["18% of earned income"]
+    assert (len(second.added), len(second.updated), len(second.deleted)) == (0, 1, 2)
+    assert second.removed_sources == [str(docs / "fhsa.html")]
+    assert second.stale_titles == ["fhsa", "rrsp"]
+    assert pipeline.stats.unchanged_documents == 1
+    assert sorted(obj["text"] for obj in client.data.objects.values()) == [
+        "18% of earned income",
+        "Annual dollar limit",
+    ]
+
+    third = await pipeline.run(find_documents(str(docs)), manifest_path=manifest)
+    assert third.is_empty
+    assert pipeline.stats.unchanged_documents == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_write_is_counted(tmp_path) -> None:
+    """A batch whose insert request raises is counted as failed, not dropped."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write_guide(docs / "rrsp.html", {"Limits": "18% of income", "Deadlines": "60"})
+    _write_guide(docs / "tfsa.html", {"Room": "Annual dollar limit"})
+
+    client = _FakeClient()
+    client.data.unavailable = True
+    pipeline = CRAIngestionPipeline(client, embedding_api_key="test")  # type: ignore
+    pipeline._embedder.client = SimpleNamespace(embeddings=_FakeEmbeddings())  # type: ignore
+
+    await pipeline.run(find_documents(str(docs)))
+
+    assert pipeline.stats.failed_objects == 3
+    assert pipeline.stats.objects_written == 0
+    assert client.data.objects == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_next_run(tmp_path) -> None:
+    """Sources with a failed batch are parsed and written again on the next run."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    manifest = str(tmp_path / "manifest.json")
+    _write_guide(docs / "rrsp.html", {"Limits": "18% of income"})
+
+    client = _FakeClient()
+    client.data.unavailable = True
+    pipeline = CRAIngestionPipeline(client, embedding_api_key="test")  # type: ignore
+    pipeline._embedder.client = SimpleNamespace(embeddings=_FakeEmbeddings())  # type: ignore
+    await pipeline.run(find_documents(str(docs)), manifest_path=manifest)
+
+    client.data.unavailable = False
+    retry = await pipeline.run(find_documents(str(docs)), manifest_path=manifest)
+
+    assert pipeline.stats.unchanged_documents == 0
+    assert len(retry.added) == 1
+    assert [obj["text"] for obj in client.data.objects.values()] == ["18% of income"]
+
+
+@pytest.mark.asyncio
+async def test_targeted_invalidation_keeps_unaffected_results() -> None:
+    """Invalidating by section only drops results that cite those sections."""
+    cache = AsyncTTLCache(max_entries=8, ttl=60.0)
+
+    def hit(title: str, section: str) -> SimpleNamespace:
+        return SimpleNamespace(source=SimpleNamespace(title=title, section=section))
+
+    async def rrsp() -> list:
+        return [hit("rrsp", "Limits")]
+
+    async def tfsa() -> list:
+        return [hit("tfsa", "Room")]
+
+    await cache.get_or_compute(("kb", 0, "rrsp", 5, 1000), rrsp)
+    await cache.get_or_compute(("kb", 0, "tfsa", 5, 1000), tfsa)
+
+    dropped = invalidate_search_cache("kb", cache, sections=[("rrsp", "Limits")])
+
+    assert dropped == 1
+    assert ("kb", 0, "tfsa", 5, 1000) in cache
+    assert ("kb", 0, "rrsp", 5, 1000) not in cache
@@ -0,0 +1,103 @@
+"""Unit tests for the in-process LocalVectorKnowledgeBase."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.utils.env_vars import Configs
+from src.utils.tools.embeddings import AsyncBatchEmbedder
+from src.utils.tools.kb_local import (
+    LocalVectorKnowledgeBase,
+    create_knowledge_base,
+    write_snapshot,
+)
+
+
+DOCUMENTS = [
+    {"title": "RRSP Guide", "section": "Limits", "text": "RRSP deduction limit rules"},
+    {"title": "TFSA Guide", "section": "Room", "text": "TFSA contribution room rules"},
+    {"title": "Capital Gains", "section": None, "text": "Inclusion rate on gains"},
+]
+VECTORS = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+QUERY_VECTORS = {
+    "RRSP deduction limit": [0.9, 0.1, 0.0],
+    "capital gains inclusion": [0.0, 0.2, 0.9],
+    "contribution room": [0.1, 0.9, 0.0],
+}
+
+
+class _FakeEmbeddings:
+    async def create(self, input: list[str], model: str) -> SimpleNamespace:  # noqa: A002
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=QUERY_VECTORS[text])
+                for i, text in enumerate(input)
+            ]
+        )
+
+
+@pytest.fixture()
+def local_kb(tmp_path) -> LocalVectorKnowledgeBase:
+    """Local knowledge base over a three-document snapshot."""
+    write_snapshot(
+        str(tmp_path),
+        DOCUMENTS,
+        VECTORS,
+        collection_name="rbc_2_cra_public_documents",
+        embedding_model_name="test-model",
+    )
+    embedder = AsyncBatchEmbedder(
+        SimpleNamespace(embeddings=_FakeEmbeddings()),  # type: ignore
+        model_name="test-model",
+    )
+    return LocalVectorKnowledgeBase(str(tmp_path), num_results=2, embedder=embedder)
+
+
+@pytest.mark.asyncio
+async def test_local_search_ranks_by_fused_score(
+    local_kb: LocalVectorKnowledgeBase,
+) -> None:
+    """The best vector and keyword match is ranked first."""
+    results = await local_kb.search_knowledgebase("RRSP deduction limit")
+
+    assert len(results) == 2
+    assert results[0].source.title == "RRSP Guide"
+    assert results[0].source.section == "Limits"
+    assert results[0].highlight.text == ["RRSP deduction limit rules"]
+
+
+@pytest.mark.asyncio
+async def test_local_search_many_matches_single_queries(
+    local_kb: LocalVectorKnowledgeBase,
+) -> None:
+    """Batched search returns the same per-query hits as single searches."""
+    keywords = ["capital gains inclusion", "contribution room"]
+
+    results = await local_kb.search_knowledgebase_many(keywords)
+
+    for keyword, hits in zip(keywords, results.per_query):
+        assert hits == await local_kb.search_knowledgebase(keyword)
+    assert results.per_query[0][0].source.title == "Capital Gains"
+    assert results.per_query[1][0].source.title == "TFSA Guide"
+    assert len(results.merged) == 3
+
+
+def test_weaviate_backends_share_one_connection(monkeypatch) -> None:
+    """Knowledge bases built for the same instance reuse its connection."""
+    monkeypatch.setenv("EMBEDDING_API_KEY", "test")
+    configs = Configs(
+        embedding_base_url="http://localhost",
+        embedding_api_key="test",
+        weaviate_http_host="weaviate.example",
+        weaviate_grpc_host="grpc.weaviate.example",
+        weaviate_api_key="test",
+        langfuse_public_key="pk-lf-test",
+        langfuse_secret_key="sk-lf-test",
+    )
+
+    first = create_knowledge_base(configs)
+    second = create_knowledge_base(configs, collection_name="other")
+
+    assert second.connection is first.connection
+    assert second.async_client is first.async_client
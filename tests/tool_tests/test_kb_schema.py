@@ -0,0 +1,77 @@
+"""Unit tests for knowledge base tuning profiles and benchmark metrics."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.tools.kb_schema import (
+    TUNING_PROFILES,
+    copy_collection,
+    get_tuning_profile,
+    load_queries,
+    recall_at_k,
+    vector_index_config,
+)
+from src.utils.tools.kb_weaviate import _SearchResult
+
+
+def _hit(title: str, text: str) -> _SearchResult:
+    """Build a search result with a single highlight."""
+    return _SearchResult.model_validate(
+        {"_source": {"title": title, "section": None}, "highlight": {"text": [text]}}
+    )
+
+
+def test_profiles_translate_to_index_configs() -> None:
+    """Every profile maps to a Weaviate index config with its quantizer."""
+    for profile in TUNING_PROFILES.values():
+        config = vector_index_config(profile)
+        assert config.vector_index_type().value == profile.index_type
+        if profile.quantizer is None:
+            assert config.quantizer is None
+        else:
+            assert profile.quantizer in type(config.quantizer).__name__.lower()
+
+    assert vector_index_config(get_tuning_profile("high_recall")).ef == 256
+    with pytest.raises(ValueError, match="Unknown tuning profile"):
+        get_tuning_profile("ivf")
+
+
+def test_recall_at_k_against_reference() -> None:
+    """Recall counts reference hits found in the top-k, ignoring order."""
+    reference = [_hit("RRSP", "limit"), _hit("TFSA", "room"), _hit("FHSA", "buyer")]
+    results = [_hit("TFSA", "room"), _hit("RRIF", "minimum"), _hit("RRSP", "limit")]
+
+    assert recall_at_k(results, reference, k=3) == pytest.approx(2 / 3)
+    assert recall_at_k(results, reference, k=1) == 0.0
+    assert recall_at_k([], [], k=5) == 1.0
+
+
+def test_stored_query_set_loads() -> None:
+    """The benchmark query set shipped with the repo is readable."""
+    queries = load_queries("data/benchmark/kb_queries.jsonl")
+    assert len(queries) >= 20
+    assert all(isinstance(query, str) and query for query in queries)
+
+
+@pytest.mark.asyncio
+async def test_copy_collection_raises_on_insert_errors() -> None:
+    """A copy with rejected objects fails instead of returning a short count."""
+
+    async def iterator(include_vector: bool):
+        """Yield two stored objects."""
+        for i in range(2):
+            yield SimpleNamespace(properties={"i": i}, uuid=None, vector=None)
+
+    async def insert_many(batch) -> SimpleNamespace:
+        """Reject the first object of every batch."""
+        return SimpleNamespace(errors={0: "vector dimensions mismatch"})
+
+    collections = {
+        "kb": SimpleNamespace(iterator=iterator),
+        "kb_copy": SimpleNamespace(data=SimpleNamespace(insert_many=insert_many)),
+    }
+    client = SimpleNamespace(collections=SimpleNamespace(get=collections.get))
+
+    with pytest.raises(RuntimeError, match="1 of 2 objects failed to copy"):
+        await copy_collection(client, "kb", "kb_copy")  # type: ignore
@@ -0,0 +1,192 @@
+"""Unit tests for AsyncWeaviateKnowledgeBase against an in-memory fake client."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from weaviate.exceptions import WeaviateConnectionError
+
+from src.utils.caching import AsyncTTLCache
+from src.utils.tools.kb_weaviate import AsyncWeaviateKnowledgeBase
+
+
+class _FakeEmbeddings:
+    """Stand-in for `AsyncOpenAI().embeddings`."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    async def create(self, input: list[str], model: str) -> SimpleNamespace:  # noqa: A002
+        self.calls.append(list(input))
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=[float(len(text)), 1.0])
+                for i, text in enumerate(input)
+            ]
+        )
+
+
+class _FakeQuery:
+    def __init__(self, documents: dict[str, list[dict]], latency: float) -> None:
+        self.documents = documents
+        self.latency = latency
+        self.calls: list[str] = []
+        self.failures: list[Exception] = []
+
+    async def hybrid(self, keyword: str, vector: list[float], limit: int):
+        self.calls.append(keyword)
+        if self.failures:
+            raise self.failures.pop()
+        await asyncio.sleep(self.latency)
+        objects = [
+            SimpleNamespace(properties=properties)
+            for properties in self.documents.get(keyword, [])[:limit]
+        ]
+        return SimpleNamespace(objects=objects)
+
+
+class FakeWeaviateClient:
+    """Minimal async Weaviate client serving canned hybrid query results."""
+
+    def __init__(self, documents: dict[str, list[dict]], latency: float = 0.01):
+        self.query = _FakeQuery(documents, latency)
+        self.collections = SimpleNamespace(
+            get=lambda name: SimpleNamespace(query=self.query)
+        )
+        self.connected = False
+        self.num_connects = 0
+        self.ready = True
+
+    async def connect(self) -> None:
+        """Open the fake connection."""
+        self.connected = True
+        self.num_connects += 1
+
+    def is_connected(self) -> bool:
+        """Report whether connect() was called."""
+        return self.connected
+
+    async def is_ready(self) -> bool:
+        """Report the configured readiness."""
+        return self.ready
+
+    async def close(self) -> None:
+        """Close the fake connection."""
+        self.connected = False
+
+    async def __aenter__(self) -> "FakeWeaviateClient":
+        """Connect, like the real client's context manager."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close, like the real client's context manager."""
+        await self.close()
+
+
+DOCUMENTS = {
+    "RRSP contribution limits": [
+        {"title": "RRSP Guide", "section": "Limits", "text": "18% of earned income"},
+        {"title": "T4040", "section": None, "text": "Deduction limit details"},
+    ],
+    "TFSA contribution room": [
+        {"title": "TFSA Guide", "section": "Room", "text": "Annual TFSA dollar limit"},
+        {"title": "T4040", "section": None, "text": "Deduction limit details"},
+    ],
+}
+
+
+def make_kb(client: FakeWeaviateClient, **kwargs) -> AsyncWeaviateKnowledgeBase:
+    """Build a knowledge base with fake embedding and a private result cache."""
+    kb = AsyncWeaviateKnowledgeBase(
+        client,  # type: ignore
+        collection_name="rbc_2_cra_public_documents",
+        embedding_api_key="test",
+        result_cache=AsyncTTLCache(max_entries=64, ttl=60.0),
+        **kwargs,
+    )
+    kb._embedder.client = SimpleNamespace(embeddings=_FakeEmbeddings())  # type: ignore
+    return kb
+
+
+@pytest.mark.asyncio
+async def test_search_results_are_cached_and_invalidated() -> None:
+    """Repeated queries are served from the cache until invalidation."""
+    client = FakeWeaviateClient(DOCUMENTS)
+    kb = make_kb(client)
+
+    first = await kb.search_knowledgebase("RRSP contribution limits")
+    second = await kb.search_knowledgebase("  rrsp contribution LIMITS ")
+
+    assert [hit.source.title for hit in first] == ["RRSP Guide", "T4040"]
+    assert second == first
+    assert client.query.calls == ["RRSP contribution limits"]
+
+    assert kb.invalidate_cache() == 1
+    await kb.search_knowledgebase("RRSP contribution limits")
+    assert len(client.query.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_are_coalesced() -> None:
+    """Identical in-flight queries reach Weaviate only once."""
+    client = FakeWeaviateClient(DOCUMENTS, latency=0.05)
+    kb = make_kb(client)
+
+    results = await asyncio.gather(
+        *[kb.search_knowledgebase("TFSA contribution room") for _ in range(4)]
+    )
+
+    assert all(len(result) == 2 for result in results)
+    assert client.query.calls == ["TFSA contribution room"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_share_one_connection() -> None:
+    """Distinct concurrent queries reuse a single connection."""
+    client = FakeWeaviateClient(DOCUMENTS)
+    kb = make_kb(client)
+
+    await asyncio.gather(
+        kb.search_knowledgebase("RRSP contribution limits"),
+        kb.search_knowledgebase("TFSA contribution room"),
+    )
+    await kb.search_knowledgebase("spousal RRSP rules")
+
+    assert client.num_connects == 1
+    assert client.connected
+    await kb.close()
+    assert not client.connected
+
+
+@pytest.mark.asyncio
+async def test_search_reconnects_after_connection_error() -> None:
+    """A dropped connection is re-established and the query retried."""
+    client = FakeWeaviateClient(DOCUMENTS)
+    kb = make_kb(client)
+    await kb.search_knowledgebase("TFSA contribution room")
+
+    client.query.failures.append(WeaviateConnectionError("connection reset"))
+    results = await kb.search_knowledgebase("RRSP contribution limits")
+
+    assert len(results) == 2
+    assert client.num_connects == 2
+    assert kb.connection.stats.reconnects == 1
+    await kb.close()
+
+
+@pytest.mark.asyncio
+async def test_search_many_batches_embeddings_and_deduplicates() -> None:
+    """Keywords share one embedding call and shared chunks are merged once."""
+    client = FakeWeaviateClient(DOCUMENTS)
+    kb = make_kb(client)
+    keywords = ["RRSP contribution limits", "TFSA contribution room", "unknown"]
+
+    results = await kb.search_knowledgebase_many(keywords)
+
+    assert kb._embedder.client.embeddings.calls == [keywords]  # type: ignore
+    assert [len(hits) for hits in results.per_query] == [2, 2, 0]
+    merged_titles = [hit.source.title for hit in results.merged]
+    # T4040 is returned by both queries, so it is fused to the top once.
+    assert merged_titles == ["T4040", "RRSP Guide", "TFSA Guide"]
+    assert results.failed_queries == []
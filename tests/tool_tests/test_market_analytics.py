@@ -0,0 +1,81 @@
+"""Unit tests for the vectorized time-series analytics."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.tools.market_analytics import (
+    TimeSeries,
+    ema,
+    max_drawdown,
+    rolling_std,
+    rsi,
+    sma,
+    summarize,
+)
+
+
+@pytest.fixture
+def prices() -> np.ndarray:
+    """Return a long random walk, to exercise several EMA blocks."""
+    rng = np.random.default_rng(7)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, 3000)))
+
+
+def test_indicators_match_pandas(prices: np.ndarray) -> None:
+    """SMA, rolling std and EMA agree with the pandas reference implementations."""
+    series = pd.Series(prices)
+
+    np.testing.assert_allclose(sma(prices, 20), series.rolling(20).mean(), rtol=1e-9)
+    np.testing.assert_allclose(
+        rolling_std(prices, 20), series.rolling(20).std(), rtol=1e-7
+    )
+    for span in (2, 12, 200):
+        np.testing.assert_allclose(
+            ema(prices, span), series.ewm(span=span, adjust=False).mean(), rtol=1e-9
+        )
+
+
+def test_rsi_matches_wilder_recurrence(prices: np.ndarray) -> None:
+    """RSI equals a step-by-step Wilder smoothing loop."""
+    period = 14
+    changes = np.diff(prices)
+    gains, losses = np.maximum(changes, 0), np.maximum(-changes, 0)
+    avg_gain, avg_loss = gains[:period].mean(), losses[:period].mean()
+    expected = [100 - 100 / (1 + avg_gain / avg_loss)]
+    for gain, loss in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+        expected.append(100 - 100 / (1 + avg_gain / avg_loss))
+
+    result = rsi(prices, period)
+
+    assert np.isnan(result[:period]).all()
+    np.testing.assert_allclose(result[period:], expected, rtol=1e-9)
+
+
+def test_max_drawdown_and_summary() -> None:
+    """Drawdown finds the peak before the trough; the summary is compact."""
+    close = np.array([10.0, 12.0, 9.0, 11.0, 6.0, 8.0])
+    assert max_drawdown(close) == pytest.approx((-0.5, 1, 4))
+
+    bars = [
+        {
+            "datetime": f"2025-07-0{i + 1}",
+            "open": str(c),
+            "high": str(c + 1),
+            "low": str(c - 1),
+            "close": str(c),
+        }
+        for i, c in enumerate(close)
+    ][::-1]
+    series = TimeSeries.from_bars("XIC", "1day", bars)
+    summary = summarize(series, window=3)
+
+    assert series.datetime.dtype == np.dtype("datetime64[s]")
+    assert summary.num_bars == 6
+    assert summary.total_return == pytest.approx(-0.2)
+    assert summary.max_drawdown_peak.startswith("2025-07-02")
+    assert summary.max_drawdown_trough.startswith("2025-07-05")
+    assert summary.sma[20] is None
+    assert summary.period_high == 13.0
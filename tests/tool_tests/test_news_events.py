@@ -0,0 +1,186 @@
+"""Unit tests for the Current Events portal fetcher against a mocked API."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import httpx
+import pytest
+
+from src.utils.tools.news_events import (
+    CurrentEventsFetcher,
+    _parse_current_events,
+    _parse_current_events_lxml,
+    benchmark_parsers,
+    current_events_title,
+    load_cached_pages,
+)
+
+
+def portal_html(day: date, events: dict[str, list[str]]) -> str:
+    """Render a day block the way the portal does."""
+    sections = "".join(
+        f"<p><b>{category}</b></p><ul>"
+        + "".join(f"<li>{text} <a href='#'>(Source)</a></li>" for text in texts)
+        + "</ul>"
+        for category, texts in events.items()
+    )
+    return (
+        '<div class="current-events-main vevent">'
+        f'<span class="bday">{day.isoformat()}</span>'
+        f'<div class="current-events-content">{sections}</div></div>'
+    )
+
+
+class FakeWikipedia:
+    """Serve revision queries and page renders for a few days."""
+
+    def __init__(self, pages: dict[date, str], latency: float = 0.05) -> None:
+        self.pages = {
+            current_events_title(d).replace("_", " "): h for d, h in pages.items()
+        }
+        self.revids = {title: 1000 + i for i, title in enumerate(self.pages)}
+        self.latency = latency
+        self.parsed: list[str] = []
+        self.deleted: set[int] = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        """Handle action=query and action=parse like the MediaWiki API."""
+        params = request.url.params
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+        if params["action"] == "query":
+            titles = params["titles"].split("|")
+            normalized = [{"from": t, "to": t.replace("_", " ")} for t in titles]
+            pages = [
+                {"title": t.replace("_", " "), "missing": True}
+                if t.replace("_", " ") not in self.pages
+                else {
+                    "title": t.replace("_", " "),
+                    "revisions": [{"revid": self.revids[t.replace("_", " ")]}],
+                }
+                for t in titles
+            ]
+            return httpx.Response(
+                200, json={"query": {"normalized": normalized, "pages": pages}}
+            )
+        revid = int(params["oldid"])
+        if revid in self.deleted:
+            error = {"code": "nosuchrevid", "info": f"There is no revision {revid}."}
+            return httpx.Response(200, json={"error": error})
+        self.parsed.append(params["oldid"])
+        title = next(t for t, r in self.revids.items() if r == revid)
+        return httpx.Response(200, json={"parse": {"text": self.pages[title]}})
+
+
+@pytest.mark.asyncio
+async def test_range_is_fetched_concurrently_and_cached(tmp_path) -> None:
+    """Days download in parallel, stream as they finish and hit the cache later."""
+    days = [date(2025, 5, d) for d in range(1, 9)]
+    api = FakeWikipedia(
+        {
+            day: portal_html(day, {"Business and economy": [f"Event on {day}."]})
+            for day in days
+        }
+    )
+    client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+
+    fetcher = CurrentEventsFetcher(
+        cache_dir=str(tmp_path), max_concurrency=4, client=client
+    )
+    streamed = [
+        day async for day, _ in fetcher.stream_events(days[0], date(2025, 5, 9))
+    ]
+
+    assert sorted(streamed) == [*days, date(2025, 5, 9)]
+    assert api.max_in_flight == 4
+    assert fetcher.stats.downloads == 8
+    assert fetcher.stats.missing == 1
+
+    second = CurrentEventsFetcher(cache_dir=str(tmp_path), client=client)
+    events = await second.get_events(days[0], days[-1])
+
+    assert second.stats.cache_hits == 8
+    assert len(api.parsed) == 8
+    business = events.root["Business and economy"]
+    assert [e.date for e in business] == days
+    assert business[0].description == "Event on 2025-05-01. (Source)"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_days_do_not_abort_the_range() -> None:
+    """API errors and unparseable pages are counted and yield no events."""
+    days = [date(2025, 5, d) for d in range(1, 4)]
+    pages = {day: portal_html(day, {"Science": [f"Launch on {day}."]}) for day in days}
+    pages[days[2]] = pages[days[2]].replace(days[2].isoformat(), "")
+    api = FakeWikipedia(pages, latency=0.0)
+    api.deleted.add(api.revids[current_events_title(days[1]).replace("_", " ")])
+    client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+
+    async with CurrentEventsFetcher(client=client) as fetcher:
+        streamed = dict([item async for item in fetcher.stream_events(*days[::2])])
+    await client.aclose()
+
+    assert sorted(streamed) == days
+    assert [e.description for e in streamed[days[0]]] == [
+        "Launch on 2025-05-01. (Source)"
+    ]
+    assert streamed[days[1]] == streamed[days[2]] == []
+    assert fetcher.stats.failed == 2
+
+
+def test_lxml_parser_matches_beautifulsoup() -> None:
+    """Nested lists, markup, hidden text and stray headings parse identically."""
+    items = [
+        "Talks resume in <a href='#'>Geneva</a> &amp; Doha.",
+        "Markets fall.<style>.x{color:red}</style><!-- note -->"
+        "<ul><li>Oil <i>drops</i></li><li>Gold rises</li></ul>",
+        "Tokyo <ruby>東京<rt>Tōkyō</rt></ruby> votes.<sup>[1]</sup>",
+    ]
+    html = portal_html(
+        date(2025, 5, 1), {"Politics and elections": items}
+    ) + portal_html(date(2025, 5, 2), {"Sports": ["Final.\n  Replay set."]}).replace(
+        "<p><b>", "<p>Intro</p><p><b>", 1
+    ).replace("</div></div>", "<p>Trailing note</p></div></div>")
+
+    expected = _parse_current_events(html)
+
+    assert _parse_current_events_lxml(html) == expected
+    assert list(_parse_current_events_lxml(html)) == list(expected)
+    assert [e.description for e in expected["Politics and elections"]] == [
+        "Talks resume in Geneva & Doha. (Source)",
+        "Markets fall. Oil drops Gold rises (Source)",
+        "Tokyo 東京 votes. [1] (Source)",
+    ]
+    assert _parse_current_events_lxml("") == {}
+
+
+@pytest.mark.asyncio
+async def test_parsing_in_executor_and_benchmark(tmp_path) -> None:
+    """Pages parse in the given pool; both parsers agree on the cached pages."""
+    days = [date(2025, 5, d) for d in range(1, 4)]
+    api = FakeWikipedia(
+        {day: portal_html(day, {"Science": [f"Launch on {day}."]}) for day in days},
+        latency=0.0,
+    )
+    client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        async with CurrentEventsFetcher(
+            cache_dir=str(tmp_path), client=client, executor=pool
+        ) as fetcher:
+            events = await fetcher.get_events(days[0], days[-1])
+    await client.aclose()
+
+    assert [e.date for e in events.root["Science"]] == days
+
+    benchmarks = benchmark_parsers(load_cached_pages(str(tmp_path)), repeats=1)
+
+    assert [b.parser for b in benchmarks] == ["bs4", "lxml"]
+    assert all(b.pages == 3 and b.events == 3 for b in benchmarks)
+    assert all(b.matches_reference for b in benchmarks)
@@ -0,0 +1,100 @@
+"""Unit tests for the indexed news event store and the search_news tool."""
+
+from datetime import date
+
+import pytest
+
+from src.utils.data import load_client_profiles
+from src.utils.tools.news_events import NewsEvent
+from src.utils.tools.news_store import (
+    NewsSearchResults,
+    NewsSearchTool,
+    NewsStore,
+    create_news_search_tool,
+)
+
+
+EVENTS = [
+    (date(2025, 5, 1), "Business and economy", "Nvidia shares rise on AI chip demand."),
+    (date(2025, 5, 2), "Business and economy", "The central bank holds rates steady."),
+    (date(2025, 5, 2), "Business and economy", "Steel tariffs take effect."),
+    (date(2025, 5, 3), "Politics and elections", "Parliament debates new tariffs."),
+    (
+        date(2025, 5, 4),
+        "Business and economy",
+        "Mortgage rates fall; housing recovers.",
+    ),
+    (date(2025, 5, 5), "Sports", "The final ends in a draw."),
+]
+
+
+def make_store() -> NewsStore:
+    """Return an in-memory store holding `EVENTS`."""
+    store = NewsStore()
+    store.add_events(
+        NewsEvent(date=d, category=c, description=text) for d, c, text in EVENTS
+    )
+    return store
+
+
+def test_filters_and_deduplication() -> None:
+    """Text, date range and category filters combine; duplicates are skipped."""
+    store = make_store()
+    duplicates = [NewsEvent(date=d, category=c, description=t) for d, c, t in EVENTS]
+    assert store.add_events(duplicates) == 0
+    assert store.count() == len(EVENTS)
+
+    hits = store.search("tariff")
+    assert {h.description for h in hits} == {
+        "Steel tariffs take effect.",
+        "Parliament debates new tariffs.",
+    }
+
+    hits = store.search("tariffs", categories=["business and economy"])
+    assert [h.description for h in hits] == ["Steel tariffs take effect."]
+
+    newest = store.search("", start=date(2025, 5, 2), end=date(2025, 5, 4))
+    assert [h.date for h in newest] == [
+        date(2025, 5, 4),
+        date(2025, 5, 3),
+        date(2025, 5, 2),
+        date(2025, 5, 2),
+    ]
+    # Operators and punctuation in the query are treated as plain words.
+    assert store.search('rates" OR NOT (') != []
+
+
+@pytest.mark.asyncio
+async def test_client_sectors_rank_results() -> None:
+    """Events about a client's preferred sectors come first."""
+    tool = NewsSearchTool(make_store(), profiles=load_client_profiles())
+
+    # Sarah Mitchell prefers technology and growth.
+    ranked = await tool.search_news("rates chip", client_name="Sarah Mitchell")
+    plain = await tool.search_news("", client_name="Sarah Mitchell")
+
+    assert isinstance(ranked, NewsSearchResults)
+    assert ranked.client == "Sarah Mitchell"
+    assert ranked.hits[0].description.startswith("Nvidia")
+    assert ranked.hits[0].matched_sectors == ["technology"]
+    assert [h.description for h in plain.hits] == [EVENTS[0][2]]
+    assert ranked.elapsed_ms < 50
+
+    empty = NewsSearchTool(NewsStore())
+    assert (await empty.search_news("rates")).startswith("No news events")
+    assert (await tool.search_news("rates", client_name="Nobody")).startswith(
+        "No client"
+    )
+
+
+def test_tool_needs_a_configured_or_existing_store(tmp_path, monkeypatch) -> None:
+    """Without NEWS_DB_PATH or a built index, no tool and no file is created."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("NEWS_DB_PATH", raising=False)
+    assert create_news_search_tool() is None
+    assert list(tmp_path.iterdir()) == []
+
+    monkeypatch.setenv("NEWS_DB_PATH", "news.sqlite")
+    tool = create_news_search_tool()
+    assert isinstance(tool, NewsSearchTool)
+    assert create_news_search_tool() is tool
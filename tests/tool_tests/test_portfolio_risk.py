@@ -0,0 +1,123 @@
+"""Unit tests for the portfolio risk tool and client profile loading."""
+
+import numpy as np
+import pytest
+
+from src.utils.data.client_profiles import get_client_profile, load_client_profiles
+from src.utils.tools.market_analytics import TimeSeries
+from src.utils.tools.portfolio_risk import (
+    Holding,
+    PortfolioRiskReport,
+    PortfolioRiskTool,
+    holdings_from_profile,
+    parametric_var_cvar,
+)
+
+
+def _series(symbol: str, returns: np.ndarray, start: str = "2024-01-01") -> TimeSeries:
+    """Build daily closes compounding the given returns from 100."""
+    close = 100.0 * np.cumprod(np.concatenate(([1.0], 1.0 + returns)))
+    dates = np.datetime64(start, "s") + np.arange(len(close)) * np.timedelta64(1, "D")
+    return TimeSeries(
+        symbol=symbol,
+        interval="1day",
+        datetime=dates,
+        open=close,
+        high=close,
+        low=close,
+        close=close,
+    )
+
+
+class FakeHistory:
+    """Serve fixed series in place of AsyncFinancialDataTool."""
+
+    def __init__(self, series: dict[str, TimeSeries]) -> None:
+        self.series = series
+
+    async def get_time_series_columns(
+        self, symbols: list[str], interval: str = "1day"
+    ) -> dict[str, TimeSeries | None]:
+        """Return the stored series, None for unknown symbols."""
+        return {symbol: self.series.get(symbol) for symbol in symbols}
+
+
+@pytest.fixture
+def history() -> FakeHistory:
+    """Return a year of correlated tech, growth and bond returns."""
+    rng = np.random.default_rng(0)
+    market = rng.normal(0.0005, 0.012, 300)
+    return FakeHistory(
+        {
+            "XLK": _series("XLK", market * 1.3 + rng.normal(0, 0.005, 300)),
+            "QQQ": _series("QQQ", market * 1.2 + rng.normal(0, 0.005, 300)),
+            "BND": _series("BND", rng.normal(0.0001, 0.003, 300)),
+        }
+    )
+
+
+def test_profiles_map_to_proxy_holdings() -> None:
+    """A 72/28 tech and growth profile puts 72% of its assets in tech proxies."""
+    profiles = load_client_profiles()
+    sarah = get_client_profile("sarah mitchell", profiles)
+    assert get_client_profile("01", profiles) is sarah
+
+    holdings = holdings_from_profile(sarah)
+
+    assert [h.symbol for h in holdings] == ["XLK", "QQQ", "BND"]
+    assert sum(h.value for h in holdings) == pytest.approx(sarah.investable_assets)
+    assert holdings[2].value / sarah.investable_assets == pytest.approx(0.28)
+
+    # "diversified" maps to the broad market and shares the equity allocation.
+    robert = next(p for p in profiles if p.sector_pref == "diversified,financials")
+    holdings = {h.symbol: h.value for h in holdings_from_profile(robert)}
+    equity = robert.investable_assets * robert.equity_fraction
+    assert holdings["XIC"] == pytest.approx(equity / 2)
+    assert holdings["XFN"] == pytest.approx(equity / 2)
+    with pytest.raises(ValueError, match="More than one"):
+        get_client_profile("Robert Chen", [*profiles, profiles[1]])
+
+
+@pytest.mark.asyncio
+async def test_report_for_client_profile(history: FakeHistory) -> None:
+    """Concentration and stress P&L match the meeting's "down 14-15%" estimate."""
+    tool = PortfolioRiskTool(history, lookback=252)
+
+    report = await tool.analyze_portfolio_risk(client_name="Sarah Mitchell")
+
+    assert isinstance(report, PortfolioRiskReport)
+    assert report.observations == 252
+    assert report.sector_weights["technology"] == pytest.approx(0.72)
+    assert report.largest_sector == "technology"
+    assert report.stress_tests[0].pnl_pct == pytest.approx(-0.144)
+    assert sum(report.risk_contributions.values()) == pytest.approx(1.0, abs=1e-3)
+    assert 0 < report.historical_var <= report.historical_cvar
+    assert 0 < report.parametric_var <= report.parametric_cvar
+
+
+@pytest.mark.asyncio
+async def test_missing_history_is_reported(history: FakeHistory) -> None:
+    """Unpriced holdings are listed and excluded instead of failing the report."""
+    tool = PortfolioRiskTool(history)
+
+    report = await tool.analyze_portfolio_risk(
+        holdings=[
+            Holding(symbol="xlk", value=600.0, sector=" Technology"),
+            Holding(symbol="NOPE", value=100.0),
+            Holding(symbol="XLK", value=400.0),
+        ],
+        horizon_days=10,
+    )
+
+    assert isinstance(report, PortfolioRiskReport)
+    assert report.weights == {"XLK": 1.0}
+    assert report.sector_weights == {"technology": 1.0}
+    assert report.missing_history == ["NOPE"]
+    assert report.effective_holdings == 1.0
+
+
+def test_parametric_var_matches_normal_quantiles() -> None:
+    """VaR and CVaR at 95% are 1.645 and 2.063 standard deviations."""
+    var, cvar = parametric_var_cvar(mean=0.0, std=1000.0, confidence=0.95)
+    assert var == pytest.approx(1644.85, abs=0.01)
+    assert cvar == pytest.approx(2062.71, abs=0.01)
@@ -0,0 +1,76 @@
+"""Unit tests for the Monte Carlo retirement projection."""
+
+import math
+
+import pytest
+
+from src.utils.tools.retirement import (
+    RetirementAssumptions,
+    RetirementProjection,
+    RetirementProjectionTool,
+    simulate_retirement,
+)
+
+
+def test_median_growth_matches_lognormal_median() -> None:
+    """Without cash flows the median balance compounds at exp(mu) per year."""
+    assumptions = RetirementAssumptions(
+        current_age=40,
+        retirement_age=60,
+        end_age=60,
+        current_balance=100_000.0,
+        annual_spending=0.0,
+        equity_fraction=0.6,
+    )
+    sigma2 = math.log(
+        1 + assumptions.volatility**2 / (1 + assumptions.expected_return) ** 2
+    )
+    mu = math.log(1 + assumptions.expected_return) - sigma2 / 2
+
+    projection = simulate_retirement(assumptions, num_paths=200_000, seed=1)
+
+    expected = 100_000.0 * math.exp(20 * mu)
+    assert projection.balance_at_retirement.p50 == pytest.approx(expected, rel=0.01)
+    assert projection.success_probability == 1.0
+    assert [band.age for band in projection.bands] == [40, 45, 50, 55, 60]
+
+
+def test_unaffordable_spending_fails_at_retirement() -> None:
+    """Spending above the whole balance depletes every path in the first year."""
+    projection = simulate_retirement(
+        RetirementAssumptions(
+            current_age=65,
+            retirement_age=65,
+            end_age=90,
+            current_balance=10_000.0,
+            annual_spending=50_000.0,
+        ),
+        num_paths=1_000,
+        seed=0,
+    )
+
+    assert projection.success_probability == 0.0
+    assert projection.median_depletion_age == 65.0
+    assert projection.bands[-1].p90 == 0.0
+
+
+@pytest.mark.asyncio
+async def test_profile_projection_is_fast_and_ordered() -> None:
+    """100k paths for a profile take well under a second; bands are ordered."""
+    tool = RetirementProjectionTool(num_paths=100_000)
+
+    projection = await tool.project_retirement(
+        client_name="Mark Thompson", annual_spending=40_000.0
+    )
+
+    assert isinstance(projection, RetirementProjection)
+    assert projection.client == "Mark Thompson"
+    assert projection.assumptions.retirement_age == 65
+    assert projection.assumptions.annual_spending == 40_000.0
+    assert projection.elapsed_ms < 1000
+    for band in projection.bands:
+        assert band.p10 <= band.p25 <= band.p50 <= band.p75 <= band.p90
+
+    message = await tool.project_retirement(current_age=70, retirement_age=60)
+    assert isinstance(message, str)
+    assert message.startswith("Cannot project retirement")
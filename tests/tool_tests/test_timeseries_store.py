@@ -0,0 +1,132 @@
+"""Unit tests for the Arrow time-series store and incremental history sync."""
+
+import httpx
+import numpy as np
+import pytest
+
+from src.utils.caching import AsyncTTLCache
+from src.utils.tools.timeseries_store import (
+    TimeSeriesStore,
+    bars_to_table,
+    table_to_bars,
+)
+from src.utils.tools.twelve_data import AsyncFinancialDataTool
+
+
+def _bars(dates: list[str], close: float) -> list[dict[str, str]]:
+    """Build newest-first daily bars with a constant close."""
+    return [
+        {"datetime": d, "open": "1.0", "high": "2.0", "low": "0.5", "close": str(close)}
+        for d in sorted(dates, reverse=True)
+    ]
+
+
+def test_append_replaces_overlapping_bars(tmp_path) -> None:
+    """Re-fetched bars overwrite stored ones and the series stays sorted."""
+    store = TimeSeriesStore(str(tmp_path))
+    store.append("aapl", "1day", bars_to_table(_bars(["2025-07-01", "2025-07-02"], 1)))
+    store.append("AAPL", "1day", bars_to_table(_bars(["2025-07-02", "2025-07-03"], 2)))
+
+    table = store.read("AAPL", "1day")
+
+    assert table is not None
+    assert table["close"].to_pylist() == [1.0, 2.0, 2.0]
+    assert store.last_timestamp("AAPL", "1day") == np.datetime64("2025-07-03")
+    assert table_to_bars(table, "1day", limit=2) == [
+        {
+            "datetime": "2025-07-03",
+            "open": "1.0",
+            "high": "2.0",
+            "low": "0.5",
+            "close": "2.0",
+        },
+        {
+            "datetime": "2025-07-02",
+            "open": "1.0",
+            "high": "2.0",
+            "low": "0.5",
+            "close": "2.0",
+        },
+    ]
+
+
+class FakeHistoryAPI:
+    """Serve /time_series from a fixed daily history, honouring start_date."""
+
+    def __init__(self, dates: list[str]) -> None:
+        self.dates = dates
+        self.requests: list[dict[str, str]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        """Return bars on or after start_date, or the provider's no-data error."""
+        params = dict(request.url.params)
+        self.requests.append(params)
+        start = params.get("start_date", "0000")[:10]
+        dates = [d for d in self.dates if d >= start]
+        if not dates:
+            return httpx.Response(
+                200,
+                json={
+                    "code": 400,
+                    "message": "No data is available",
+                    "status": "error",
+                },
+            )
+        return httpx.Response(200, json={"values": _bars(dates, 100.0), "status": "ok"})
+
+
+@pytest.mark.asyncio
+async def test_repeat_requests_fetch_only_the_delta(tmp_path) -> None:
+    """The first call downloads history; later calls ask from the last bar."""
+    api = FakeHistoryAPI(["2025-07-01", "2025-07-02"])
+    tool = AsyncFinancialDataTool(
+        api_key="test",
+        quote_cache=AsyncTTLCache(max_entries=4, ttl=30.0),
+        time_series_store=TimeSeriesStore(str(tmp_path)),
+    )
+    tool._client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+
+    first = await tool.get_time_series("XIC")
+    assert [bar["datetime"] for bar in first] == ["2025-07-02", "2025-07-01"]
+    assert "start_date" not in api.requests[0]
+
+    api.dates.append("2025-07-03")
+    second = await tool.get_time_series("XIC")
+    assert api.requests[1]["start_date"] == "2025-07-02 00:00:00"
+    assert [bar["datetime"] for bar in second][:1] == ["2025-07-03"]
+
+    # Up to date: the provider's "no data" error falls back to stored bars.
+    api.dates.clear()
+    third = await tool.get_time_series("XIC")
+    assert len(third) == 3
+
+    history = await tool.get_history("XIC", offline=True)
+    assert history is not None
+    assert history.num_rows == 3
+    assert len(api.requests) == 3
+    await tool.close()
+
+
+@pytest.mark.asyncio
+async def test_store_errors_return_none(tmp_path) -> None:
+    """Symbols are normalized before the store is used; its errors give None."""
+    store = TimeSeriesStore(str(tmp_path))
+    tool = AsyncFinancialDataTool(
+        api_key="test",
+        quote_cache=AsyncTTLCache(max_entries=4, ttl=30.0),
+        time_series_store=store,
+    )
+    tool._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(FakeHistoryAPI(["2025-07-01"]))
+    )
+
+    assert len(await tool.get_time_series(" xic ")) == 1
+    assert store.last_timestamp("XIC", "1day") is not None
+
+    def unreadable(symbol: str, interval: str) -> None:
+        """Fail like a store on a missing or corrupt volume."""
+        raise OSError("Input/output error")
+
+    store.last_timestamp = unreadable  # type: ignore
+    assert await tool.get_time_series("XIC") is None
+    await tool.close()
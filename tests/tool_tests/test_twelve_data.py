@@ -0,0 +1,160 @@
+"""Unit tests for AsyncFinancialDataTool against a mocked HTTP transport."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.utils.caching import AsyncTTLCache
+from src.utils.tools.credit_bucket import CreditBucket
+from src.utils.tools.twelve_data import AsyncFinancialDataTool
+
+
+class FakeTwelveData:
+    """Serve /price responses and record every upstream request."""
+
+    def __init__(self, prices: dict[str, str], latency: float = 0.01) -> None:
+        self.prices = prices
+        self.latency = latency
+        self.requests: list[str] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        """Handle one request like the Twelve Data API."""
+        symbol_param = request.url.params["symbol"]
+        self.requests.append(symbol_param)
+        await asyncio.sleep(self.latency)
+        results = {
+            symbol: self._result(request.url.path, symbol)
+            for symbol in symbol_param.split(",")
+        }
+        if len(results) == 1:
+            return httpx.Response(200, json=results[symbol_param])
+        return httpx.Response(200, json=results)
+
+    def _result(self, path: str, symbol: str) -> dict:
+        """Build the per-symbol payload of /price or /time_series."""
+        if symbol not in self.prices:
+            return {"code": 404, "message": f"{symbol} not found", "status": "error"}
+        if path == "/time_series":
+            return {
+                "values": [
+                    {
+                        "datetime": "2025-07-04",
+                        "close": self.prices[symbol],
+                        "volume": "0",
+                    }
+                ],
+                "status": "ok",
+            }
+        return {"price": self.prices[symbol]}
+
+
+def make_tool(
+    api: FakeTwelveData, max_symbols_per_request: int = 120, **cache_kwargs
+) -> AsyncFinancialDataTool:
+    """Build a tool with a private quote cache talking to the fake API."""
+    tool = AsyncFinancialDataTool(
+        api_key="test",
+        quote_cache=AsyncTTLCache(max_entries=16, **cache_kwargs),
+        max_symbols_per_request=max_symbols_per_request,
+    )
+    tool._client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+    return tool
+
+
+@pytest.mark.asyncio
+async def test_concurrent_price_requests_share_one_upstream_call() -> None:
+    """50 simultaneous requests for one symbol reach the API once."""
+    api = FakeTwelveData({"AAPL": "227.50"}, latency=0.05)
+    tool = make_tool(api, ttl=30.0)
+
+    prices = await asyncio.gather(*[tool.get_price("aapl") for _ in range(50)])
+
+    assert prices == ["227.50"] * 50
+    assert api.requests == ["AAPL"]
+    assert tool.quote_stats.coalesced == 49
+
+    assert await tool.get_price("AAPL ") == "227.50"
+    assert tool.quote_stats.hits == 1
+    await tool.close()
+
+
+@pytest.mark.asyncio
+async def test_stale_quote_is_served_while_refreshing() -> None:
+    """An expired quote is returned at once and refreshed in the background."""
+    api = FakeTwelveData({"VFV": "140.00"})
+    tool = make_tool(api, ttl=0.02, stale_ttl=60.0)
+    assert await tool.get_price("VFV") == "140.00"
+
+    api.prices["VFV"] = "141.25"
+    await asyncio.sleep(0.03)
+    assert await tool.get_price("VFV") == "140.00"
+    assert tool.quote_stats.stale_hits == 1
+    assert tool.quote_stats.mean_served_age >= 0.02
+
+    await asyncio.sleep(0.05)
+    assert await tool.get_price("VFV") == "141.25"
+    assert api.requests == ["VFV", "VFV"]
+    await tool.close()
+
+
+@pytest.mark.asyncio
+async def test_unknown_symbols_are_not_cached() -> None:
+    """Error responses return None and are retried on the next call."""
+    api = FakeTwelveData({})
+    tool = make_tool(api, ttl=30.0)
+
+    assert await tool.get_price("XIC") is None
+    api.prices["XIC"] = "38.10"
+    assert await tool.get_price("XIC") == "38.10"
+    assert api.requests == ["XIC", "XIC"]
+    await tool.close()
+
+
+@pytest.mark.asyncio
+async def test_get_prices_batches_uncached_symbols() -> None:
+    """Only uncached symbols are requested, chunked to the batch limit."""
+    api = FakeTwelveData({"AAPL": "227.50", "XIC": "38.10", "VFV": "140.00"})
+    tool = make_tool(api, max_symbols_per_request=2, ttl=30.0)
+    assert await tool.get_price("VFV") == "140.00"
+
+    prices = await tool.get_prices(["aapl", "XIC", "VFV", "AAPL", "ZZZZ"])
+
+    assert prices == {"AAPL": "227.50", "XIC": "38.10", "VFV": "140.00", "ZZZZ": None}
+    assert api.requests == ["VFV", "AAPL,XIC", "ZZZZ"]
+    assert await tool.get_price("XIC") == "38.10"
+    assert len(api.requests) == 3
+    await tool.close()
+
+
+@pytest.mark.asyncio
+async def test_get_time_series_many_splits_batch_response() -> None:
+    """One request returns every symbol's series, without the volume field."""
+    api = FakeTwelveData({"AAPL": "227.50", "US2Y": "3.90"})
+    tool = make_tool(api, ttl=30.0)
+
+    series = await tool.get_time_series_many(["AAPL", "US2Y", "NOPE"])
+
+    assert api.requests == ["AAPL,US2Y,NOPE"]
+    assert series["AAPL"] == [{"datetime": "2025-07-04", "close": "227.50"}]
+    assert series["US2Y"] == [{"datetime": "2025-07-04", "close": "3.90"}]
+    assert series["NOPE"] is None
+    await tool.close()
+
+
+@pytest.mark.asyncio
+async def test_batches_pay_one_credit_per_symbol() -> None:
+    """Batches are capped at the credit capacity and charged per symbol."""
+    api = FakeTwelveData({"AAPL": "227.50", "XIC": "38.10", "VFV": "140.00"})
+    tool = make_tool(api, ttl=30.0)
+    tool.credit_bucket = CreditBucket(credits_per_minute=60, capacity=2)
+    tool.credit_timeout = 0.1
+
+    prices = await tool.get_prices(["AAPL", "XIC", "VFV"])
+
+    # The third credit is not earned within the deadline.
+    assert api.requests == ["AAPL,XIC"]
+    assert prices == {"AAPL": "227.50", "XIC": "38.10", "VFV": None}
+    assert tool.credit_bucket.stats.credits == 2
+    assert tool.credit_bucket.stats.deadline_exceeded == 1
+    await tool.close()
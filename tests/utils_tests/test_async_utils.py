@@ -0,0 +1,203 @@
+"""Unit tests for the adaptive concurrency limiter and request hedging."""
+
+import asyncio
+
+import pytest
+
+from src.utils.async_utils import (
+    AdaptiveConcurrencyLimiter,
+    HedgePolicy,
+    hedged,
+    rate_limited,
+)
+
+
+async def _call(limiter: AdaptiveConcurrencyLimiter, latency: float) -> float:
+    """Run a call of the given latency through the limiter."""
+
+    async def work() -> float:
+        await asyncio.sleep(latency)
+        return latency
+
+    return await rate_limited(work, semaphore=limiter)
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_while_saturated_and_fast() -> None:
+    """Calls within the latency target raise the limit while callers queue."""
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=2, max_limit=6, latency_target=1.0
+    )
+
+    await asyncio.gather(*[_call(limiter, 0.005) for _ in range(60)])
+
+    assert limiter.limit == 6
+    assert limiter.stats.max_queue_depth > 0
+    assert limiter.in_flight == 0
+    assert limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_limit_never_exceeded() -> None:
+    """No more than `limit` calls run at once."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=3, max_limit=3)
+    running = peak = 0
+
+    async def work() -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.005)
+        running -= 1
+
+    await asyncio.gather(*[limiter.run(work) for _ in range(20)])
+
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_overload_errors_halve_the_limit_once_per_window() -> None:
+    """Concurrent failures of one window cut the limit only once."""
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=8, is_overload=lambda e: isinstance(e, ConnectionError)
+    )
+
+    async def throttled() -> None:
+        await asyncio.sleep(0.01)
+        raise ConnectionError("429 Too Many Requests")
+
+    results = await asyncio.gather(
+        *[limiter.run(throttled) for _ in range(8)], return_exceptions=True
+    )
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert limiter.limit == 4
+    assert limiter.stats.decreases == 1
+
+    async def invalid() -> None:
+        raise ValueError("bad symbol")
+
+    with pytest.raises(ValueError):
+        await limiter.run(invalid)
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_latency_spike_reduces_limit() -> None:
+    """A call slower than the latency target counts as congestion."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, latency_target=0.05)
+    for _ in range(3):
+        await _call(limiter, 0.001)
+
+    await _call(limiter, 0.1)
+
+    assert limiter.stats.latency_spikes == 1
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_its_place() -> None:
+    """Cancelling a queued call does not leak a slot."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    blocker = asyncio.create_task(_call(limiter, 0.02))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(_call(limiter, 0.0))
+    await asyncio.sleep(0)
+    assert limiter.queue_depth == 1
+
+    waiter.cancel()
+    await blocker
+
+    assert limiter.queue_depth == 0
+    assert limiter.in_flight == 0
+    assert await _call(limiter, 0.0) == 0.0
+
+
+def _warm_policy(**kwargs) -> HedgePolicy:
+    """Build a policy that has seen 20 calls of 10 ms and can hedge."""
+    policy = HedgePolicy(min_samples=20, max_extra_load=1.0, **kwargs)
+    for _ in range(20):
+        policy.record(0.01)
+    return policy
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_loser_cancelled() -> None:
+    """A duplicate sent after the threshold wins and the primary is cancelled."""
+    policy = _warm_policy()
+    latencies = iter([1.0, 0.01])
+    cancelled = []
+
+    async def request() -> str:
+        latency = next(latencies)
+        try:
+            await asyncio.sleep(latency)
+        except asyncio.CancelledError:
+            cancelled.append(latency)
+            raise
+        return f"done in {latency}"
+
+    result = await asyncio.wait_for(hedged(request, policy), timeout=0.5)
+    await asyncio.sleep(0)  # Let the cancelled primary unwind.
+
+    assert result == "done in 0.01"
+    assert cancelled == [1.0]
+    assert (policy.stats.hedged, policy.stats.hedge_wins) == (1, 1)
+    assert policy.stats.threshold == pytest.approx(0.01)
+
+
+@pytest.mark.asyncio
+async def test_fast_calls_and_warm_up_are_not_hedged() -> None:
+    """Calls under the threshold, or before enough samples, run once."""
+    calls = 0
+
+    async def request() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.001)
+        return calls
+
+    cold = HedgePolicy(min_samples=5, max_extra_load=1.0)
+    for _ in range(5):
+        await hedged(request, cold)
+    assert calls == 5
+    assert cold.stats.hedged == 0
+
+    warm = _warm_policy(min_delay=0.05)
+    await hedged(request, warm)
+    assert calls == 6
+    assert warm.stats.hedge_rate == 0.0
+
+
+@pytest.mark.asyncio
+async def test_hedging_respects_extra_load_budget() -> None:
+    """Duplicates never exceed max_extra_load of the calls."""
+    policy = HedgePolicy(
+        percentile=50.0, min_samples=1, max_extra_load=0.25, min_delay=0.001
+    )
+    for _ in range(100):
+        policy.record(0.001)
+
+    async def slow() -> None:
+        await asyncio.sleep(0.01)
+
+    for _ in range(12):
+        await hedged(slow, policy)
+
+    assert policy.stats.hedged == 3
+    assert policy.stats.budget_exhausted == 9
+
+
+@pytest.mark.asyncio
+async def test_hedged_raises_when_both_calls_fail() -> None:
+    """The primary's error surfaces if neither call succeeds."""
+    policy = _warm_policy()
+    attempts = iter(["primary", "hedge"])
+
+    async def failing() -> None:
+        name = next(attempts)
+        await asyncio.sleep(0.05 if name == "primary" else 0.0)
+        raise RuntimeError(name)
+
+    with pytest.raises(RuntimeError, match="primary"):
+        await hedged(failing, policy)
@@ -0,0 +1,176 @@
+"""Unit tests for the in-process caches."""
+
+import asyncio
+
+import pytest
+
+from src.utils.caching import AsyncTTLCache, LRUCache, SemanticCache
+
+
+# Unit vectors with known cosine similarities to "rrsp limit".
+QUERY_VECTORS = {
+    "rrsp limit": [1.0, 0.0, 0.0],
+    "current RRSP limit Canada": [0.96, 0.28, 0.0],
+    "RRSP contribution limits Canada current rates": [0.95, 0.0, 0.312],
+    "RRSP deadline": [0.9, 0.436, 0.0],
+    "tfsa limit": [0.0, 1.0, 0.0],
+    "fhsa limit": [0.0, 0.0, 1.0],
+}
+
+
+async def fake_embed(text: str) -> list[float]:
+    """Look up a fixed vector, scaled to check that vectors are normalized."""
+    return [3.0 * x for x in QUERY_VECTORS[text]]
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    """Reading an entry protects it from the next eviction."""
+    cache: LRUCache[str, int] = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert list(cache) == ["a", "c"]
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_coalesces_concurrent_misses() -> None:
+    """Concurrent callers of a missing key share one computation."""
+    cache: AsyncTTLCache[str, int] = AsyncTTLCache(max_entries=8, ttl=60.0)
+    calls = 0
+
+    async def compute() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(
+        *[cache.get_or_compute("rrsp", compute) for _ in range(5)]
+    )
+
+    assert results == [42] * 5
+    assert calls == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.coalesced == 4
+    assert await cache.get_or_compute("rrsp", compute) == 42
+    assert cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_expires_and_invalidates() -> None:
+    """Entries are recomputed after expiry or explicit invalidation."""
+    cache: AsyncTTLCache[tuple[str, str], int] = AsyncTTLCache(max_entries=8, ttl=0.01)
+    values = iter(range(10))
+
+    async def compute() -> int:
+        return next(values)
+
+    assert await cache.get_or_compute(("kb", "tfsa"), compute) == 0
+    await asyncio.sleep(0.02)
+    assert await cache.get_or_compute(("kb", "tfsa"), compute) == 1
+    assert cache.stats.expirations == 1
+
+    cache.ttl = 60.0
+    assert await cache.get_or_compute(("kb", "rrsp"), compute) == 2
+    assert cache.invalidate(lambda key: key[0] == "kb") == 2
+    assert await cache.get_or_compute(("kb", "rrsp"), compute) == 3
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_does_not_cache_failures() -> None:
+    """A failed computation is reported to every waiter and then retried."""
+    cache: AsyncTTLCache[str, int] = AsyncTTLCache(max_entries=8, ttl=60.0)
+
+    async def fail() -> int:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("weaviate unavailable")
+
+    results = await asyncio.gather(
+        cache.get_or_compute("q", fail),
+        cache.get_or_compute("q", fail),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def succeed() -> int:
+        return 7
+
+    assert await cache.get_or_compute("q", succeed) == 7
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_keeps_stale_value_when_refresh_fails() -> None:
+    """A failed background refresh leaves the stale value in place."""
+    cache: AsyncTTLCache[str, int] = AsyncTTLCache(
+        max_entries=8, ttl=0.01, stale_ttl=60.0
+    )
+
+    async def first() -> int:
+        return 1
+
+    async def fail() -> int:
+        raise RuntimeError("upstream down")
+
+    await cache.get_or_compute("q", first)
+    await asyncio.sleep(0.02)
+
+    assert await cache.get_or_compute("q", fail) == 1
+    await asyncio.sleep(0)
+    assert cache.stats.failed_refreshes == 1
+    assert await cache.get_or_compute("q", fail) == 1
+    assert cache.age("q") >= 0.02
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_serves_paraphrases_and_counts_near_misses() -> None:
+    """Similar phrasings hit; a close but different query is a near miss."""
+    cache: SemanticCache[str] = SemanticCache(fake_embed, threshold=0.92)
+    calls = []
+
+    async def search(query: str) -> str:
+        calls.append(query)
+        return f"answer to {query}"
+
+    await cache.get_or_compute("rrsp limit", lambda: search("rrsp limit"))
+    first = await cache.get_or_compute(
+        "current RRSP limit Canada", lambda: search("paraphrase")
+    )
+    second = await cache.get("RRSP contribution limits Canada current rates")
+    near = await cache.get("RRSP deadline")
+    other = await cache.get("tfsa limit")
+
+    assert first == second == "answer to rrsp limit"
+    assert calls == ["rrsp limit"]
+    assert near is None and other is None
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 3
+    assert cache.stats.near_misses == 1
+    assert cache.stats.similarity_counts == {0.96: 1, 0.95: 1, 0.9: 1, 0.0: 1}
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_expires_and_evicts_least_recently_used() -> None:
+    """Entries expire after the TTL; a full cache drops its oldest entry."""
+    cache: SemanticCache[str] = SemanticCache(
+        fake_embed, max_entries=2, ttl=0.05, should_cache=lambda v: v != "error"
+    )
+    await cache.put("rrsp limit", "rrsp")
+    await cache.put("tfsa limit", "tfsa")
+    assert await cache.get("rrsp limit") == "rrsp"
+
+    await cache.put("fhsa limit", "fhsa")
+    await cache.put("rrsp limit", "error")
+
+    assert await cache.get("tfsa limit") is None
+    assert await cache.get("rrsp limit") == "rrsp"
+    assert cache.stats.evictions == 1
+
+    await asyncio.sleep(0.06)
+    assert await cache.get("fhsa limit") is None
+    assert len(cache) == 0
+    assert cache.stats.expirations == 2